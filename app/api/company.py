@@ -1,62 +1,209 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, Body, Path, Query
-# from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
-from typing import List, Optional, Annotated
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Header, Body, Path, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Annotated, Union
 
-from app.database import get_session
-from app.schemas.company import TagNameIn, CompanyCreateIn, CompanyOut, CompanyNameOut
-from app.crud import company as crud
+from app.config import EXPORT_BATCH_SIZE, SEARCH_MAX_LIMIT
+from app.database import SESSION_TOKEN_HEADER, DbSession, get_db, get_read_db, open_read_session, replicas
+from app.schemas.company import (
+    TagNameIn, CompanyCreateIn, CompanyTagsPatchIn, CompanyOut, CompanyNameOut, CompanyBulkOut, CompanyBulkItemOut,
+    CompanyLookupIn, CompanyLookupOut, CompanyTranslationsOut,
+)
+from app.crud import company as crud_sync
+from app.crud import company_async as crud
+from app.utils.conditional import conditional_response, make_etag
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.language import Languages, preferred_languages
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.replica import format_lsn, parse_lsn
+from app.utils.responses import respond
 
-router = APIRouter(tags=["companies"])
+router = APIRouter(tags=["companies"], route_class=InstrumentedRoute)
+
+
+def set_next_cursor(response: Response, next_after: Optional[int]):
+    # 다음 페이지가 있을 때만 헤더를 내려줌 (응답 본문은 기존 List[CompanyNameOut] 그대로)
+    if next_after is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_after)
+
+
+async def set_session_token(db: DbSession, response: Response):
+    # replica 가 있으면 commit 한 쓰기의 WAL 위치를 내려줌. 다음 읽기 요청이 이 값을 X-Session-Token 으로 보내면
+    # 이 쓰기가 반영된 곳에서 읽는다 (read-your-writes)
+    if replicas.enabled:
+        response.headers[SESSION_TOKEN_HEADER] = format_lsn(await crud.current_write_lsn(db))
+
+
+async def catalog_not_modified(
+    db: DbSession, response: Response, languages: Languages, if_none_match: Optional[str]
+) -> Optional[Response]:
+    # 목록 응답은 같은 URL / 언어에서 카탈로그 버전이 같으면 같은 결과이므로 버전으로 ETag 를 만든다.
+    # in-process 인덱스가 본문을 만들면 인덱스가 반영한 버전도 함께 (replay 전후 본문이 같은 ETag 를 갖지 않도록)
+    etag = make_etag("catalog", await crud.get_catalog_version(db), crud_sync.local_catalog_state(), languages)
+    return conditional_response(response, etag, if_none_match)
 
 
 @router.get("/search", response_model=List[CompanyNameOut])
-def search_company_name(
+async def search_company_name(
     query: Annotated[str, Query(
         min_length=1,
         max_length=20,
         description="회사명 포함 검색어",
         example="크"
     )],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session)
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=SEARCH_MAX_LIMIT, description="한 페이지 최대 건수")] = SEARCH_MAX_LIMIT,
+    cursor: Annotated[Optional[str], Query(description="이전 응답의 X-Next-Cursor 헤더 값")] = None,
+    ranked: Annotated[bool, Query(
+        description="유사도 순 검색 (오타 허용, 완전 일치 / 접두어 우선). 상위 limit 개만 반환하고 cursor 는 없음"
+    )] = False,
+    languages: Languages = Depends(preferred_languages),
+    if_none_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_read_db)
 ):
-    return crud.autocomplete_company_name(db, query, x_wanted_language)
+    if ranked and cursor is not None:
+        raise HTTPException(status_code=400, detail="ranked 검색은 cursor 를 사용할 수 없습니다.")
+    after = decode_cursor(cursor)
+    not_modified = await catalog_not_modified(db, response, languages, if_none_match)
+    if not_modified:
+        return not_modified
+    if ranked:
+        return respond(await crud.rank_company_names(db, query, languages, limit), response)
+    companies, next_after = await crud.autocomplete_company_name(
+        db, query, languages, limit, after
+    )
+    set_next_cursor(response, next_after)
+    return respond(companies, response)
 
 
-@router.get("/companies/{company_name}", response_model=CompanyOut)
-def get_company_by_name(
+@router.get("/companies/{company_name}", response_model=Union[CompanyOut, CompanyTranslationsOut])
+async def get_company_by_name(
     company_name: Annotated[str, Path(
         min_length=1,
         max_length=20,
         description="회사명 검색어",
         example="원티드랩"
     )],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session)
+    response: Response,
+    langs: Annotated[Optional[Literal["all"]], Query(
+        description="all 이면 모든 언어의 회사명 / 태그명을 한번에 (CompanyTranslationsOut)"
+    )] = None,
+    languages: Languages = Depends(preferred_languages),
+    if_none_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_read_db)
 ):
-    company = crud.get_company_by_name(db, company_name, x_wanted_language)
+    # 회사 version 만 먼저 읽어 If-None-Match 가 일치하면 태그 그래프를 읽지 않고 304
+    version = await crud.get_company_version(db, company_name)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    etag = make_etag("company", *version, langs or languages)
+    not_modified = conditional_response(response, etag, if_none_match)
+    if not_modified:
+        return not_modified
+
+    if langs == "all":
+        company = await crud.get_company_translations(db, company_name)
+    else:
+        company = await crud.get_company_by_name(db, company_name, languages)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    return company
+    return respond(company, response)
+
+
+@router.post("/companies/lookup", response_model=CompanyLookupOut)
+async def lookup_companies(
+    body: Annotated[
+        CompanyLookupIn,
+        Body(
+            openapi_examples={
+                "lookup_companies": {
+                    "summary": "여러 회사 한번에 조회 예시",
+                    "description": "회사명 목록을 한번에 조회합니다. 없는 회사는 항목별로 not_found 로 표시됩니다.",
+                    "value": {"names": ["원티드랩", "Wantedlab", "없는회사"]},
+                },
+            }
+        )
+    ],
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_read_db),
+):
+    companies = await crud.get_companies_by_names(db, body.names, languages)
+    # response_model 이 한번 검증하므로 여기서는 CompanyLookupOut 을 만들지 않고 같은 모양의 dict 로 반환
+    return respond({"items": [
+        {
+            "name": name,
+            "status": "found" if companies[name] is not None else "not_found",
+            "company": companies[name],
+        }
+        for name in body.names
+    ]})
 
 
 @router.get("/tags", response_model=List[CompanyNameOut])
-def search_by_tag(
+async def search_by_tag(
     tag_name: Annotated[str, Query(
         min_length=1,
         max_length=20,
         description="태그명 검색어",
         example="태그_1"
     )],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session),
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=SEARCH_MAX_LIMIT, description="한 페이지 최대 건수")] = SEARCH_MAX_LIMIT,
+    cursor: Annotated[Optional[str], Query(description="이전 응답의 X-Next-Cursor 헤더 값")] = None,
+    languages: Languages = Depends(preferred_languages),
+    if_none_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_read_db),
+):
+    after = decode_cursor(cursor)
+    not_modified = await catalog_not_modified(db, response, languages, if_none_match)
+    if not_modified:
+        return not_modified
+    companies, next_after = await crud.search_companies_by_tag_name(
+        db, tag_name, languages, limit, after
+    )
+    set_next_cursor(response, next_after)
+    return respond(companies, response)
+
+
+@router.get("/tags/query", response_model=List[CompanyNameOut])
+async def search_by_tags(
+    response: Response,
+    all_of: Annotated[List[str], Query(
+        alias="all",
+        max_length=50,
+        description="모두 가져야 하는 태그명 (여러 번 지정)",
+    )] = [],
+    any_of: Annotated[List[str], Query(
+        alias="any",
+        max_length=50,
+        description="하나 이상 가져야 하는 태그명 (여러 번 지정)",
+    )] = [],
+    none_of: Annotated[List[str], Query(
+        alias="not",
+        max_length=50,
+        description="가지면 안 되는 태그명 (여러 번 지정)",
+    )] = [],
+    limit: Annotated[int, Query(ge=1, le=SEARCH_MAX_LIMIT, description="한 페이지 최대 건수")] = SEARCH_MAX_LIMIT,
+    cursor: Annotated[Optional[str], Query(description="이전 응답의 X-Next-Cursor 헤더 값")] = None,
+    languages: Languages = Depends(preferred_languages),
+    if_none_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_read_db),
 ):
-    return crud.search_companies_by_tag_name(db, tag_name, x_wanted_language)
+    if not (all_of or any_of):
+        raise HTTPException(status_code=400, detail="all 또는 any 태그가 하나 이상 필요합니다.")
+    after = decode_cursor(cursor)
+    not_modified = await catalog_not_modified(db, response, languages, if_none_match)
+    if not_modified:
+        return not_modified
+    companies, next_after = await crud.search_companies_by_tags(
+        db, all_of, any_of, none_of, languages, limit, after
+    )
+    set_next_cursor(response, next_after)
+    return respond(companies, response)
 
 
 @router.put("/companies/{company_name}/tags", response_model=CompanyOut)
-def add_tag_to_company(
+async def add_tag_to_company(
     company_name: Annotated[str, Path(
         min_length=1,
         max_length=20,
@@ -85,23 +232,64 @@ def add_tag_to_company(
             }
         )
     ],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session),
+    response: Response,
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_db),
 ):
-    company_id = crud.get_company_id_by_name(db, company_name)
+    error = crud.tags_error(tags)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    company_id = await crud.get_company_id_by_name(db, company_name)
     if not company_id:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    for tag_entry in tags:
-        tag_name_dict = tag_entry.tag_name
-        tag_id = crud.get_or_create_tag(db, tag_name_dict)
-        crud.add_company_tag_relation(db, company_id, tag_id)
+    # 태그 조회/생성과 관계 추가를 한 트랜잭션으로 (commit 한 번)
+    await crud.update_company_tags(db, company_id, add=[tag.tag_name for tag in tags])
+    await set_session_token(db, response)
+    return await crud.get_company_name_and_tags(db, company_id, languages)
 
-    return crud.get_company_name_and_tags(db, company_id, x_wanted_language)
+
+@router.patch("/companies/{company_name}/tags", response_model=CompanyOut)
+async def update_company_tags(
+    company_name: Annotated[str, Path(
+        min_length=1,
+        max_length=20,
+        description="대상 회사명",
+        example="원티드랩"
+    )],
+    body: Annotated[
+        CompanyTagsPatchIn,
+        Body(
+            openapi_examples={
+                "add_and_remove_tags": {
+                    "summary": "태그 추가 / 삭제 예시",
+                    "description": "remove 의 태그를 떼고 add 의 태그를 붙입니다. 한 트랜잭션으로 처리됩니다.",
+                    "value": {
+                        "add": [{"tag_name": {"ko": "태그_1", "en": "tag_1", "ja": "タグ_1"}}],
+                        "remove": ["태그_4"],
+                    },
+                },
+            }
+        )
+    ],
+    response: Response,
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_db),
+):
+    error = crud.tags_error(body.add)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    company_id = await crud.get_company_id_by_name(db, company_name)
+    if not company_id:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    await crud.update_company_tags(db, company_id, add=[tag.tag_name for tag in body.add], remove=body.remove)
+    await set_session_token(db, response)
+    return await crud.get_company_name_and_tags(db, company_id, languages)
 
 
 @router.post("/companies", response_model=CompanyOut)
-def create_company(
+async def create_company(
     body: Annotated[
         CompanyCreateIn,
         Body(
@@ -120,15 +308,66 @@ def create_company(
             }
         )
     ],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session),
+    response: Response,
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_db),
 ):
-    company_id = crud.create_company(db, body, x_wanted_language)
-    return crud.get_company_name_and_tags(db, company_id, x_wanted_language)
+    error = crud.company_body_error(body)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    company_id = await crud.create_company(db, body, languages)
+    await set_session_token(db, response)
+    return await crud.get_company_name_and_tags(db, company_id, languages)
+
+
+@router.post("/companies/bulk", response_model=CompanyBulkOut)
+async def create_companies(
+    body: Annotated[
+        List[CompanyCreateIn],
+        Body(
+            max_length=1000,
+            openapi_examples={
+                "create_companies": {
+                    "summary": "여러 회사 일괄 생성 예시",
+                    "description": "여러 회사를 하나의 트랜잭션으로 생성합니다. 항목별 결과가 입력 순서대로 반환됩니다.",
+                    "value": [
+                        {
+                            "company_name": {"ko": "새로운회사_1", "en": "NewCompany_1"},
+                            "tags": [{"tag_name": {"ko": "태그_1", "en": "tag_1", "ja": "タグ_1"}}]
+                        },
+                        {
+                            "company_name": {"ko": "새로운회사_2", "en": "NewCompany_2"},
+                            "tags": [{"tag_name": {"ko": "태그_2", "en": "tag_2", "ja": "タグ_2"}}]
+                        }
+                    ],
+                },
+            }
+        )
+    ],
+    response: Response,
+    include_company: Annotated[bool, Query(description="생성된 회사 정보를 다시 조회해 응답에 포함")] = False,
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_db),
+):
+    company_ids = await crud.create_companies(db, body)
+    await set_session_token(db, response)
+
+    # 생성된 회사는 회사 수와 관계없이 한번에 조회
+    created = [company_id for company_id in company_ids if company_id is not None]
+    outputs = await crud.get_companies_name_and_tags(db, created, languages) if include_company else {}
+    items = []
+    for index, (company, company_id) in enumerate(zip(body, company_ids)):
+        if company_id is None:
+            items.append(CompanyBulkItemOut(index=index, status="invalid", detail=crud.company_body_error(company)))
+            continue
+        output = outputs.get(company_id)
+        items.append(CompanyBulkItemOut(index=index, status="created", company_id=company_id, company=output))
+
+    return CompanyBulkOut(created=len(created), items=items)
 
 
 @router.delete("/companies/{company_name}/tags/{tag_name}", response_model=CompanyOut)
-def remove_tag_from_company(
+async def remove_tag_from_company(
     company_name: Annotated[str, Path(
         min_length=1,
         max_length=20,
@@ -141,12 +380,37 @@ def remove_tag_from_company(
         description="삭제할 태그명",
         example="태그_1"
     )],
-    x_wanted_language: Optional[str] = Header(default="ko"),
-    db: Session = Depends(get_session),
+    response: Response,
+    languages: Languages = Depends(preferred_languages),
+    db: DbSession = Depends(get_db),
 ):
-    company_id = crud.get_company_id_by_name(db, company_name)
+    company_id = await crud.get_company_id_by_name(db, company_name)
     if not company_id:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    crud.delete_company_tag_by_name(db, company_id, tag_name)
-    return crud.get_company_name_and_tags(db, company_id, x_wanted_language)
+    await crud.update_company_tags(db, company_id, remove=[tag_name])
+    await set_session_token(db, response)
+    return await crud.get_company_name_and_tags(db, company_id, languages)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_companies(
+    lang: Annotated[Optional[List[str]], Query(description="내보낼 언어 (여러 번 지정 가능, 없으면 전체)")] = None,
+    tag_name: Annotated[Optional[str], Query(description="이 태그명(어느 언어든)을 가진 회사만")] = None,
+    x_session_token: Optional[str] = Header(default=None, alias=SESSION_TOKEN_HEADER),
+):
+    # 응답을 다 보낼 때까지 server-side cursor 를 열어둬야 하므로 요청 세션(Depends) 대신 제너레이터가 읽기 세션을 소유
+    # (get_read_db 와 같은 replica 선택). 클라이언트가 끊어 제너레이터가 닫혀도 cursor 와 세션을 닫는다
+    async def lines():
+        db = await open_read_session(parse_lsn(x_session_token))
+        chunks = crud.export_companies(db, lang, tag_name, EXPORT_BATCH_SIZE)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            # 연결이 끊기면 이 태스크가 취소된 상태이므로 정리 await 가 다시 취소되지 않도록 shield
+            with anyio.CancelScope(shield=True):
+                await chunks.aclose()
+                await crud.close(db)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
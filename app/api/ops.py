@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import exc, text
+
+from app.crud import company as crud
+from app.database import SessionLocal
+from app.utils.metrics import registry
+from app.utils.pool import all_pool_stats
+from app.utils.startup import startup_profile
+
+router = APIRouter(tags=["ops"])
+
+
+@router.get("/healthz")
+def healthz():
+    # 프로세스가 요청을 처리할 수 있는지만 (DB 를 확인하지 않음)
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz():
+    """startup(warm-up 포함)이 끝났고 primary 에 쿼리할 수 있으면 200, 아니면 503. startup 단계별 소요 시간을 함께 반환"""
+    status = "ready"
+    if not startup_profile.ready:
+        status = "not_ready"
+    else:
+        try:
+            with SessionLocal() as db:
+                db.execute(text("SELECT 1"))
+        except exc.DBAPIError:
+            status = "database_unavailable"
+    return JSONResponse(
+        {"status": status, "startup": startup_profile.stats()},
+        status_code=200 if status == "ready" else 503,
+    )
+
+
+@router.get("/cache/stats")
+def cache_stats(request: Request):
+    listener = request.app.state.change_listener
+    return {
+        "company_detail": crud.company_cache.stats(),
+        # 다른 replica 변경 반영 상태 (CHANGE_LISTENER_ENABLED)
+        "change_feed": {**crud.change_feed_stats, "listener": listener.stats() if listener else None},
+    }
+
+
+@router.get("/pool/stats")
+def pool_stats():
+    return all_pool_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format. 라우트별 SQL 수 / DB 시간 / 직렬화 시간 히스토그램
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
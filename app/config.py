@@ -0,0 +1,74 @@
+import os
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# 회사명 자동완성을 in-process n-gram 인덱스로 처리 (startup 시 전체 company_names 로딩)
+SEARCH_INDEX_ENABLED = env_flag("SEARCH_INDEX_ENABLED")
+
+# /tags/query (태그 AND / OR / NOT) 를 in-process tag -> company 비트맵 인덱스로 처리 (startup 시 company_tags 로딩)
+TAG_INDEX_ENABLED = env_flag("TAG_INDEX_ENABLED")
+
+# GET /companies/{company_name} 응답 캐시 ((name, language) 단위, 0 이면 비활성)
+COMPANY_CACHE_MAX_ENTRIES = int(os.getenv("COMPANY_CACHE_MAX_ENTRIES", "10000"))
+COMPANY_CACHE_MAX_BYTES = int(os.getenv("COMPANY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+COMPANY_CACHE_TTL = float(os.getenv("COMPANY_CACHE_TTL", "60"))
+
+# 동시에 들어온 같은 조회(회사 상세, 검색, 태그 검색, 카탈로그 버전)는 프로세스 안에서 DB 조회 하나의 결과를 같이 받음
+REQUEST_COALESCING = env_flag("REQUEST_COALESCING", True)
+
+# 실행되는 SQL 을 모두 로그로 출력 (디버깅용. 운영에서는 /metrics, Server-Timing 헤더로 확인)
+DB_ECHO = env_flag("DB_ECHO")
+
+# 커넥션 풀. DB_POOL_MODE=null 이면 풀을 두지 않음 (PgBouncer transaction pooling 앞단에서 사용)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING")
+
+# startup 에서 풀 커넥션(DB_POOL_SIZE 개)을 미리 열고 조회 statement 를 한 번씩 실행해 컴파일 캐시를 채움
+STARTUP_WARMUP = env_flag("STARTUP_WARMUP", True)
+
+# 요청 처리 DB 세션을 asyncpg/AsyncSession 으로 (라우트는 항상 async, 0 이면 동기 세션을 threadpool 에서 실행)
+DB_ASYNC = env_flag("DB_ASYNC")
+
+# 읽기 replica (streaming replication standby) 주소 "host[:port],host[:port]". DB 이름/계정은 primary 와 같음.
+# 비어 있으면 모든 요청이 primary 를 사용
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+# replica 가 토큰 LSN 보다 뒤처져 보일 때 replay 위치를 다시 확인하는 최소 간격 (초, replica 마다)
+DB_REPLICA_PROBE_INTERVAL = float(os.getenv("DB_REPLICA_PROBE_INTERVAL", "0.1"))
+
+# 조회 방식: orm (selectinload 객체 그래프) | lean (언어 fallback 을 SQL 에서 처리하는 단일 쿼리)
+# | read_model (company_read_model 테이블 단일 행 조회, READ_MODEL_LANGUAGES 밖의 언어는 lean)
+READ_MODE = os.getenv("READ_MODE", "orm")
+
+# company_read_model 에 행을 만들어 두는 언어
+READ_MODEL_LANGUAGES = [lang.strip().lower() for lang in os.getenv("READ_MODEL_LANGUAGES", "ko,en,ja").split(",") if lang.strip()]
+
+# /search, /tags, /tags/query 한 페이지 최대 건수 (limit 기본값이자 상한)
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+# GET /export 가 server-side cursor 에서 한번에 읽어 내보내는 행 수
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# 응답 직렬화: standard (FastAPI 가 response_model 로 다시 검증 후 JSON 인코딩)
+# | fast (조회 엔드포인트가 pydantic-core 로 바로 JSON bytes 를 만들어 반환, response_model 재검증 생략)
+RESPONSE_MODE = os.getenv("RESPONSE_MODE", "standard")
+
+# ETag 가 붙는 조회 응답(/companies/{company_name}, /search, /tags, /tags/query) 의 Cache-Control.
+# 브라우저는 매번 If-None-Match 로 재검증(304)하고 CDN 은 s-maxage 동안 그대로 응답
+HTTP_CACHE_CONTROL = os.getenv("HTTP_CACHE_CONTROL", "public, max-age=0, s-maxage=10, stale-while-revalidate=30")
+
+# 다른 replica 의 쓰기를 LISTEN/NOTIFY 로 받아 이 프로세스의 캐시 / 인덱스에 반영 (백그라운드 스레드, 별도 커넥션)
+CHANGE_LISTENER_ENABLED = env_flag("CHANGE_LISTENER_ENABLED")
+# NOTIFY 를 놓쳐도 이 주기(초)마다 catalog_changes 를 확인해 따라잡음
+CHANGE_LISTENER_POLL_INTERVAL = float(os.getenv("CHANGE_LISTENER_POLL_INTERVAL", "30"))
+# catalog_changes 에 남겨두는 버전 수. 이보다 오래 끊겨 있던 replica 는 캐시를 비우고 인덱스를 다시 만든다
+CHANGE_LOG_RETENTION = int(os.getenv("CHANGE_LOG_RETENTION", "10000"))
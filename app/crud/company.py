@@ -1,38 +1,485 @@
 # from sqlalchemy.ext.asyncio import AsyncSession
+import json
+import threading
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select, delete, join
+from sqlalchemy import select, insert, update, delete, join, event, func, or_, tuple_, cast, literal_column, text, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
 from sqlalchemy.orm import selectinload, aliased
-from typing import List, Optional
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.config import (
+    CHANGE_LOG_RETENTION, COMPANY_CACHE_MAX_BYTES, COMPANY_CACHE_MAX_ENTRIES, COMPANY_CACHE_TTL, READ_MODE,
+    READ_MODEL_LANGUAGES, SEARCH_MAX_LIMIT,
+)
+from app.crud import company_lean as lean
+from app.database import replicas
+from app.crud import company_read_model as read_model
+from app.models.company import CatalogChange, CatalogVersion, Company, CompanyName, CompanyTag, Tag, TagName
+from app.schemas.company import CompanyCreateIn, TagNameIn
+from app.utils.cache import MISSING, LRUCache
+from app.utils.language import DEFAULT_LANGUAGES, Languages, as_languages, normalize_language
+from app.utils.ngram_index import company_name_index
+from app.utils.replica import parse_lsn
+from app.utils.search_key import fold, search_columns
+from app.utils.single_flight import request_flights
+from app.utils.tag_index import company_tag_index
+from app.utils import trigram
+
+# GET /companies/{company_name} 응답 캐시. key: (name, 언어 선호 순서 tuple), langs=all 은 (name, None),
+# ETag 용 version 은 ("version", name, None)
+# 엔트리 태그: ("company", id), ("name", 조회한 이름), ("tag", tag_id)
+company_cache = LRUCache(COMPANY_CACHE_MAX_ENTRIES, COMPANY_CACHE_MAX_BYTES, COMPANY_CACHE_TTL)
+
+# 쓰기 commit 마다 NOTIFY 하는 채널 (페이로드: {"version", "companies", "tags"})
+CHANGE_CHANNEL = "catalog_changes"
+
+
+def _invalidate_on_commit(db: Session, tags: Iterable[Hashable]):
+    # commit 이 성공한 뒤에만 캐시를 지우도록 세션에 모아둠
+    db.info.setdefault("cache_invalidations", set()).update(tags)
+
+
+def _update_tag_index_on_commit(
+    db: Session,
+    added: Iterable[Tuple[int, int]] = (),
+    removed: Iterable[Tuple[int, int]] = (),
+    names: Iterable[Tuple[int, str]] = (),
+):
+    # (tag_id, company_id) 관계 추가/삭제와 새 (tag_id, 태그명) 을 commit 이후 인덱스에 반영
+    changes = db.info.setdefault("tag_index_changes", [])
+    changes.append((list(added), list(removed), list(names)))
+
+
+def _update_name_index_on_commit(db: Session, rows: Iterable[Tuple[int, int, str, str]]):
+    # 새 company_names 행 (id, company_id, language, name) 을 commit 이후 n-gram 인덱스에 반영
+    db.info.setdefault("name_index_rows", []).extend(tuple(row) for row in rows)
+
+
+def apply_changes(
+    invalidations: Iterable[Hashable],
+    tag_index_changes: Iterable[Tuple[list, list, list]] = (),
+    name_index_rows: Iterable[Tuple[int, int, str, str]] = (),
+):
+    """commit 된 변경을 이 프로세스의 캐시 / 인덱스에 반영 (after_commit 과 다른 replica 변경의 replay 가 공통으로 사용)"""
+    if invalidations:
+        company_cache.invalidate(invalidations)
+        # 이후 요청은 이 변경 전에 시작된 조회 결과를 같이 받지 않음
+        request_flights.invalidate()
+    if company_tag_index.ready:
+        for added, removed, names in tag_index_changes:
+            company_tag_index.add_names(names)
+            company_tag_index.add(added)
+            company_tag_index.remove(removed)
+    if name_index_rows and company_name_index.ready:
+        company_name_index.add(name_index_rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_cache_invalidations(session: Session):
+    version = session.info.pop("catalog_version", None)
+    apply_changes(
+        session.info.pop("cache_invalidations", None),
+        session.info.pop("tag_index_changes", ()),
+        session.info.pop("name_index_rows", ()),
+    )
+    if version is not None:
+        _mark_applied_locally(version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_invalidations(session: Session):
+    session.info.pop("cache_invalidations", None)
+    session.info.pop("catalog_version", None)
+    session.info.pop("changed_companies", None)
+    session.info.pop("tag_index_changes", None)
+    session.info.pop("name_index_rows", None)
+
+
+def _mark_changed_on_commit(db: Session, company_ids: Iterable[int] = (), tag_ids: Iterable[int] = ()):
+    # 응답이 바뀌는 회사(company_ids, tag_ids 태그를 가진 회사)를 모아 commit 직전에 한번에
+    # version 증가 + company_read_model 갱신 (READ_MODE=read_model 일 때) + catalog_version 증가
+    pending = db.info.setdefault("changed_companies", (set(), set()))
+    pending[0].update(company_ids)
+    pending[1].update(tag_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_company_changes(session: Session):
+    pending = session.info.pop("changed_companies", None)
+    changed = bool(pending and (pending[0] or pending[1]))
+    if changed:
+        # commit 의 flush 보다 먼저 호출되므로 아직 flush 되지 않은 관계 행을 먼저 반영
+        session.flush()
+        company_ids, tag_ids = pending
+        conditions = []
+        if company_ids:
+            conditions.append(Company.id.in_(company_ids))
+        if tag_ids:
+            conditions.append(Company.id.in_(select(CompanyTag.company_id).where(CompanyTag.tag_id.in_(tag_ids))))
+        bumped = session.scalars(
+            update(Company)
+            .where(or_(*conditions))
+            .values(version=Company.version + 1)
+            .returning(Company.id)
+            .execution_options(synchronize_session=False)
+        )
+        # 캐시된 version 도 함께 무효화 (태그명 변경으로 바뀐 회사 포함)
+        _invalidate_on_commit(session, [("company", company_id) for company_id in bumped])
+        # read model 을 읽지 않는 모드에서는 쓰기마다 행을 다시 계산하지 않음
+        # (나중에 READ_MODE=read_model 로 바꿀 때는 rebuild_read_model.py 로 재생성)
+        if READ_MODE == "read_model":
+            read_model.refresh(session, company_ids, tag_ids)
+    _publish_changes(session, changed)
+
+
+def _publish_changes(session: Session, changed: bool = False):
+    """
+    이 commit 이 캐시 / 인덱스에 반영할 내용을 catalog_changes 에 버전과 함께 기록하고 NOTIFY (commit 시점에 전달).
+    다른 replica 는 알림을 받으면 replay_changes 로 자신이 반영한 버전 이후의 행을 순서대로 적용한다.
+    카탈로그 버전 행 잠금은 모든 쓰기 트랜잭션이 순서대로 지나가는 구간이므로 before_commit 의 마지막인 여기서 잡아
+    로그 기록과 commit 동안만 유지한다 (회사 version 증가, read model 갱신은 잠금 전에 끝남).
+    """
+    invalidations = session.info.get("cache_invalidations")
+    tag_index_changes = session.info.get("tag_index_changes")
+    name_index_rows = session.info.get("name_index_rows")
+    if not (changed or invalidations or tag_index_changes or name_index_rows):
+        return
+    # commit 의 flush 가 잠금을 잡은 뒤에 실행되지 않도록 남은 변경을 먼저 flush
+    session.flush()
+    # 새 태그명만 생긴 경우처럼 회사 응답은 그대로여도 로그 버전이 빠지지 않도록 항상 올림
+    version = session.info["catalog_version"] = bump_catalog_version(session)
+    invalidations = sorted(invalidations or (), key=repr)
+    session.execute(insert(CatalogChange).values(version=version, changes={
+        "invalidations": invalidations,
+        "tag_index": tag_index_changes or [],
+        "names": name_index_rows or [],
+    }))
+    if version % 100 == 0:
+        session.execute(delete(CatalogChange).where(CatalogChange.version <= version - CHANGE_LOG_RETENTION))
+
+    # 페이로드는 알림용 (변경 내용은 catalog_changes 에서 읽음). NOTIFY 페이로드 상한 8000 bytes 를 넘으면 버전만
+    payload = json.dumps({
+        "version": version,
+        "companies": sorted({key for kind, key in invalidations if kind == "company"}),
+        "tags": sorted({key for kind, key in invalidations if kind == "tag"}),
+    })
+    if len(payload.encode()) > 7900:
+        payload = json.dumps({"version": version})
+    session.execute(select(func.pg_notify(CHANGE_CHANNEL, payload)))
 
-from app.models.company import Company, CompanyName, CompanyTag, Tag, TagName
-from app.schemas.company import CompanyNameOut
+
+def bump_catalog_version(db: Session) -> int:
+    # 행이 없으면 만들고, 있으면 잠그고 +1 (commit 될 때까지 다른 쓰기 트랜잭션은 여기서 대기하므로 commit 직전에 호출)
+    stmt = pg_insert(CatalogVersion).values(id=1, version=1)
+    return db.scalar(
+        stmt.on_conflict_do_update(index_elements=[CatalogVersion.id], set_={"version": CatalogVersion.version + 1})
+        .returning(CatalogVersion.version)
+    )
+
+
+def get_catalog_version(db: Session) -> int:
+    return db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1)) or 0
+
+
+def get_company_version(db: Session, name: str) -> Optional[Tuple[int, int]]:
+    """
+    name 으로 조회되는 회사(get_company_by_name 과 같은 company_id 가 가장 작은 회사)의 (company_id, version).
+    태그 그래프를 읽지 않으므로 If-None-Match 확인용. 회사 캐시에 ("version", name, None) 으로 함께 캐시
+    (세 원소라 (name, langs) 키와 겹치지 않음).
+    """
+    cached = company_cache.get(("version", name, None))
+    if cached is not MISSING:
+        return cached
+    generation = company_cache.generation
+    row = db.execute(
+        select(Company.id, Company.version).where(Company.id == lean.company_id_by_name(name))
+    ).first()
+    if row is None:
+        return None
+    output = (row.id, row.version)
+    if _cacheable(db):
+        company_cache.set(
+            ("version", name, None), output, tags=[("company", row.id), ("name", name)], generation=generation
+        )
+    return output
+
+
+def _row_reader(langs: Languages):
+    """lean / read_model 모드에서 plain row 를 읽는 모듈 (orm 모드면 None)"""
+    # read model 행은 언어 하나 기준의 fallback 이므로 선호 언어가 여러 개면 lean 으로 계산
+    if READ_MODE == "read_model" and len(langs) == 1 and langs[0] in READ_MODEL_LANGUAGES:
+        return read_model
+    if READ_MODE in ("lean", "read_model"):
+        return lean
+    return None
+
+
+def rebuild_read_model(db: Session, batch_size: int = 50_000, progress=None) -> int:
+    return read_model.rebuild(db, batch_size, progress)
+
+
+def build_company_tag_index(db: Session):
+    links = db.execute(
+        select(CompanyTag.tag_id, CompanyTag.company_id)
+        .order_by(CompanyTag.tag_id, CompanyTag.company_id)
+        .execution_options(yield_per=10000)
+    )
+    names = db.execute(select(TagName.tag_id, TagName.name).execution_options(yield_per=10000))
+    company_tag_index.build(links.tuples(), names.tuples())
 
 
-def autocomplete_company_name(db: Session, query: str, lang: str) -> List[CompanyNameOut]:
+def build_company_name_index(db: Session):
     result = db.execute(
-        select(Company)
-        .join(Company.names)
-        .where(CompanyName.name.ilike(f"%{query}%"))
+        select(CompanyName.id, CompanyName.company_id, CompanyName.language, CompanyName.name)
+        .order_by(CompanyName.id)
+        .execution_options(yield_per=10000)
+    )
+    company_name_index.build(result.tuples())
+
+
+def warm_up(db: Session, langs: Languages = DEFAULT_LANGUAGES):
+    """
+    조회 라우트가 실행하는 statement 를 한 번씩 실행해서 세션 엔진의 compiled cache 에 넣어 둔다
+    (첫 요청이 SQL 컴파일 비용을 내지 않도록, startup 에서 호출). 조회 대상은 가장 먼저 만들어진 회사명 / 태그명이라
+    selectinload 체인까지 실행된다. 쓰기 statement 는 실행하지 않는다.
+    """
+    name = db.scalar(select(CompanyName.name).order_by(CompanyName.id).limit(1))
+    tag_name = db.scalar(select(TagName.name).order_by(TagName.id).limit(1))
+    if name is None or tag_name is None:
+        return
+    company_id = get_company_id_by_name(db, name)
+    lookups = [
+        lambda: get_catalog_version(db),
+        lambda: get_company_version(db, name),
+        lambda: get_company_by_name(db, name, langs),
+        lambda: get_company_translations(db, name),
+        lambda: get_companies_by_names(db, [name], langs),
+        lambda: get_company_name_and_tags(db, company_id, langs),
+        lambda: autocomplete_company_name(db, name, langs),
+        lambda: search_companies_by_tag_name(db, tag_name, langs),
+        lambda: search_companies_by_tags(db, [tag_name], [], [], langs),
+    ]
+    # 인덱스도 pg_trgm 도 없으면 ranked 검색은 company_names 전체를 읽으므로 제외
+    if company_name_index.ready or pg_trgm_available(db):
+        lookups.append(lambda: rank_company_names(db, name, langs))
+    for lookup in lookups:
+        lookup()
+    # 조회만 했으므로 트랜잭션을 닫아 커넥션을 풀로 돌려줌
+    db.rollback()
+
+
+# 이 프로세스의 캐시 / 인덱스가 반영한 catalog_version (다른 replica 변경 replay 의 high-water mark)
+_applied_version: Optional[int] = None
+change_feed_stats = {"applied_version": None, "replayed": 0, "resets": 0}
+_replay_lock = threading.Lock()
+# 이 프로세스가 commit 해서 after_commit 에서 먼저 반영했고 아직 replay 로 따라잡지 못한 버전 (목록 응답 ETag 용)
+_local_versions: Tuple[int, ...] = ()
+_local_lock = threading.Lock()
+
+
+def _mark_applied_locally(version: int):
+    global _local_versions
+    with _local_lock:
+        if _applied_version is None or version > _applied_version:
+            _local_versions = _local_versions + (version,)
+
+
+def _prune_local_versions(applied_version: int):
+    global _local_versions
+    with _local_lock:
+        _local_versions = tuple(version for version in _local_versions if version > applied_version)
+
+
+def local_catalog_state() -> Optional[Tuple[Optional[int], Tuple[int, ...]]]:
+    """
+    in-process 인덱스(n-gram / 태그)가 반영한 카탈로그 상태 (_applied_version, 먼저 반영한 이 프로세스의 commit 버전).
+    인덱스가 없으면 목록 응답은 DB 에서 읽으므로 None. 목록 응답 ETag 에 DB 의 catalog_version 과 함께 넣어
+    변경 알림을 받지 못해 replay 가 늦는 동안의 본문과 replay 이후의 본문이 같은 ETag 를 갖지 않게 한다.
+    """
+    if not (company_name_index.ready or company_tag_index.ready):
+        return None
+    return _applied_version, _local_versions
+
+
+def start_change_feed(db: Session) -> int:
+    """high-water mark 를 현재 카탈로그 버전으로. 인덱스를 만들기 전에 호출 (사이에 들어온 변경은 replay 에서 다시 적용)"""
+    global _applied_version
+    with _replay_lock:
+        _applied_version = change_feed_stats["applied_version"] = get_catalog_version(db)
+        _prune_local_versions(_applied_version)
+    return _applied_version
+
+
+def replay_changes(db: Session) -> int:
+    """
+    high-water mark 이후의 catalog_changes 를 버전 순서로 이 프로세스에 반영하고 반영한 행 수를 반환
+    (LISTEN 알림, 재연결, 주기 확인 시 호출). 자기 프로세스의 변경도 다시 적용해서 replica 간 적용 순서를 버전 순으로 맞춘다.
+    중간 버전의 행이 없으면 (보관 기간이 지났거나 bulk_load 처럼 로그 없이 버전만 올린 경우) 캐시를 비우고 인덱스를 다시 만든다.
+    """
+    global _applied_version
+    with _replay_lock:
+        current = get_catalog_version(db)
+        if _applied_version is not None and current <= _applied_version:
+            return 0
+        if replicas.enabled:
+            # 캐시를 비우기 전에 replica 결과를 캐시해도 되는 기준을 이 쓰기들 이후로 올림
+            # (비운 뒤에 올리면 그 사이 뒤처진 replica 에서 읽은 쓰기 이전 결과가 다시 캐시될 수 있음)
+            current_write_lsn(db)
+        if _applied_version is None:
+            # startup 에서 start_change_feed 가 실패했으면 (DB 연결 불가) 처음 연결된 지금부터 시작.
+            # 그 사이의 변경은 알 수 없으므로 캐시를 비우고 인덱스를 다시 만든다
+            _reset_local_state(db)
+            change_feed_stats["resets"] += 1
+            _applied_version = change_feed_stats["applied_version"] = current
+            _prune_local_versions(current)
+            return 0
+        rows = db.execute(
+            select(CatalogChange.version, CatalogChange.changes)
+            .where(CatalogChange.version > _applied_version, CatalogChange.version <= current)
+            .order_by(CatalogChange.version)
+        ).all()
+        if [row.version for row in rows] != list(range(_applied_version + 1, current + 1)):
+            _reset_local_state(db)
+            change_feed_stats["resets"] += 1
+            rows = []
+        for row in rows:
+            apply_changes(
+                [tuple(tag) for tag in row.changes["invalidations"]],
+                row.changes["tag_index"],
+                row.changes["names"],
+            )
+        _applied_version = change_feed_stats["applied_version"] = current
+        _prune_local_versions(current)
+        change_feed_stats["replayed"] += len(rows)
+        return len(rows)
+
+
+def _reset_local_state(db: Session):
+    company_cache.clear()
+    if company_name_index.ready:
+        build_company_name_index(db)
+    if company_tag_index.ready:
+        build_company_tag_index(db)
+
+
+def _localized(names, langs: Languages, default=None) -> Optional[str]:
+    # CompanyName / TagName 목록에서 langs 순서대로 비어있지 않은 이름, 없으면 첫 이름
+    by_language = {}
+    for n in names:
+        if n.name:
+            by_language.setdefault(n.language, n.name)
+    for lang in langs:
+        if lang in by_language:
+            return by_language[lang]
+    return next((n.name for n in names), default)
+
+
+def _display_name(company: Company, langs: Languages) -> Optional[str]:
+    return _localized(company.names, langs)
+
+
+def _page(rows: List[Tuple[int, Optional[str]]], limit: int) -> Tuple[List[dict], Optional[int]]:
+    # rows 는 limit + 1 개까지 조회한 (company_id, 표시 이름). 다음 페이지가 있으면 마지막 company_id 를 커서로
+    # 항목은 CompanyNameOut 모양의 dict. 모델 객체는 response_model 검증에서 한번만 만들어짐 (RESPONSE_MODE=fast 면 생략)
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    return [{"company_name": name} for _, name in rows[:limit] if name], next_after
+
+
+def autocomplete_company_name(
+    db: Session, query: str, lang: Union[str, Languages], limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    langs = as_languages(lang)
+    indexed = company_name_index.search(query, langs, limit + 1, after)
+    if indexed is not None:
+        return _page(indexed, limit)
+    reader = _row_reader(langs)
+    if reader is not None:
+        return _page(reader.autocomplete_company_names(db, query, langs, limit + 1, after), limit)
+
+    stmt = select(Company).where(Company.names.any(lean.name_matches(CompanyName.__table__.c, query)))
+    if after is not None:
+        stmt = stmt.where(Company.id > after)
+    result = db.execute(
+        stmt.order_by(Company.id)
+        .limit(limit + 1)
         .options(selectinload(Company.names))
     )
-    companies = result.scalars().unique().all()
+    return _page([(company.id, _display_name(company, langs)) for company in result.scalars()], limit)
+
+
+def _company_detail(company: Company, langs: Languages) -> dict:
+    rep_name = _localized(company.names, langs, "")
+
+    tag_names = []
+    for ct in company.tags:
+        tag_name = _localized(ct.tag.names, langs)
+        if tag_name:
+            tag_names.append(tag_name)
+
+    # 순서가 특이
+    return {
+        "company_name": rep_name,
+        "tags": sorted(set(tag_names), reverse=True)
+    }
+
+
+def _cacheable(db: Session) -> bool:
+    # replica 에서 읽은 결과는 이 프로세스가 캐시를 무효화한 마지막 쓰기(replicas.last_write_lsn)까지 replay 된
+    # 경우에만 캐시 (무효화 직후 뒤처진 replica 의 이전 값이 다시 캐시되지 않도록)
+    replica_lsn = db.info.get("replica_lsn")
+    return replica_lsn is None or replica_lsn >= replicas.last_write_lsn
+
+
+def current_write_lsn(db: Session) -> int:
+    """
+    primary 의 현재 WAL 위치 (이 세션이 commit 한 쓰기를 포함). 쓰기 응답의 X-Session-Token 으로 내려주고,
+    replica 결과를 캐시해도 되는 기준(replicas.last_write_lsn)도 이 위치로 올린다.
+    """
+    lsn = parse_lsn(db.scalar(text("SELECT pg_current_wal_lsn()::text")))
+    replicas.note_write(lsn)
+    return lsn
+
+
+def _cache_company_detail(
+    db: Session, name: str, langs: Optional[Languages], company_id: int, tag_ids: Iterable[int], output: dict,
+    generation: int,
+):
+    # generation 은 DB 를 읽기 전의 company_cache.generation (그 사이 무효화가 있었으면 저장하지 않음)
+    if not _cacheable(db):
+        return
+    company_cache.set(
+        (name, langs),
+        output,
+        tags=[("company", company_id), ("name", name), *(("tag", tag_id) for tag_id in tag_ids)],
+        generation=generation,
+    )
 
-    name_outputs = []
-    for company in companies:
-        rep_name = next((n.name for n in company.names if n.language == lang), None)
-        if not rep_name:
-            rep_name = next((n.name for n in company.names), None)
-        if rep_name:
-            name_outputs.append(CompanyNameOut(company_name=rep_name))
 
-    return name_outputs
+def get_company_by_name(db: Session, name: str, lang: Union[str, Languages]):
+    langs = as_languages(lang)
+    cached = company_cache.get((name, langs))
+    if cached is not MISSING:
+        return cached
+    generation = company_cache.generation
 
+    reader = _row_reader(langs)
+    if reader is not None:
+        row = reader.company_detail(db, langs, name=name)
+        if not row:
+            return None
+        output = {
+            "company_name": row.company_name or "",
+            "tags": sorted({t for t in row.tags or () if t}, reverse=True),
+        }
+        _cache_company_detail(db, name, langs, row.id, row.tag_ids or (), output, generation)
+        return output
 
-def get_company_by_name(db: Session, name: str, lang: str):
     result = db.execute(
         select(Company)
         .join(Company.names)
         .where(CompanyName.name == name)
+        .order_by(Company.id)
         .options(
             selectinload(Company.names),
             selectinload(Company.tags)
@@ -44,51 +491,197 @@ def get_company_by_name(db: Session, name: str, lang: str):
     if not company:
         return None
 
-    rep_name = next((n.name for n in company.names if n.language == lang), None)
-    if not rep_name:
-        rep_name = next((n.name for n in company.names), "")
+    output = _company_detail(company, langs)
+    _cache_company_detail(db, name, langs, company.id, (ct.tag_id for ct in company.tags), output, generation)
+    return output
 
-    tag_names = []
-    for ct in company.tags:
-        tag_name = next((tn.name for tn in ct.tag.names if tn.language == lang), None)
-        if not tag_name:
-            tag_name = next((tn.name for tn in ct.tag.names), None)
-        if tag_name:
-            tag_names.append(tag_name)
-    
-    # 순서가 특이
-    return {
-        "company_name": rep_name,
-        "tags": sorted(set(tag_names), reverse=True)
-    }
 
+def get_companies_by_names(
+    db: Session, names: List[str], lang: Union[str, Languages],
+) -> Dict[str, Optional[dict]]:
+    """
+    여러 회사명을 한번에 조회 (get_company_by_name 과 같은 응답). 없는 이름은 None.
+    캐시에 없는 이름들은 이름 수와 관계없이 한번의 select + selectinload 체인으로 읽는다.
+    """
+    langs = as_languages(lang)
+    outputs: Dict[str, Optional[dict]] = {}
+    missing = []
+    for name in dict.fromkeys(names):
+        cached = company_cache.get((name, langs))
+        if cached is MISSING:
+            missing.append(name)
+        else:
+            outputs[name] = cached
 
-def search_companies_by_tag_name(db: Session, tag_name: str, lang: str) -> List[CompanyNameOut]:
-    result = db.execute(
-        select(Tag)
-        .join(Tag.names)
+    if missing:
+        generation = company_cache.generation
+        result = db.execute(
+            select(Company)
+            .join(Company.names)
+            .where(CompanyName.name.in_(missing))
+            .order_by(Company.id)
+            .options(
+                selectinload(Company.names),
+                selectinload(Company.tags)
+                .selectinload(CompanyTag.tag)
+                .selectinload(Tag.names)
+            )
+        )
+        companies_by_name: Dict[str, Company] = {}
+        for company in result.scalars().unique():
+            for n in company.names:
+                companies_by_name.setdefault(n.name, company)
+
+        for name in missing:
+            company = companies_by_name.get(name)
+            if company is None:
+                outputs[name] = None
+                continue
+            outputs[name] = _company_detail(company, langs)
+            _cache_company_detail(
+                db, name, langs, company.id, (ct.tag_id for ct in company.tags), outputs[name], generation
+            )
+
+    return outputs
+
+
+def search_companies_by_tag_name(
+    db: Session, tag_name: str, lang: Union[str, Languages],
+    limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    langs = as_languages(lang)
+    reader = _row_reader(langs)
+    if reader is not None:
+        return _page(reader.company_names_by_tag_name(db, tag_name, langs, limit + 1, after), limit)
+
+    tag_id = (
+        select(TagName.tag_id)
         .where(TagName.name == tag_name)
-        .options(
-            selectinload(Tag.companies)
-            .selectinload(CompanyTag.company)
-            .selectinload(Company.names)
+        .order_by(TagName.tag_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = select(Company).join(Company.tags).where(CompanyTag.tag_id == tag_id)
+    if after is not None:
+        stmt = stmt.where(CompanyTag.company_id > after)
+    result = db.execute(
+        stmt.order_by(CompanyTag.company_id)
+        .limit(limit + 1)
+        .options(selectinload(Company.names))
+    )
+    return _page([(company.id, _display_name(company, langs)) for company in result.scalars()], limit)
+
+
+def _tag_id_by_name(name: str):
+    return (
+        select(TagName.tag_id)
+        .where(TagName.name == name)
+        .order_by(TagName.tag_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _company_ids_by_tags(
+    db: Session, all_of: List[str], any_of: List[str], none_of: List[str], limit: int, after: Optional[int],
+) -> List[int]:
+    # 태그 인덱스를 쓰지 않을 때의 SQL 경로 (company_tags (tag_id, company_id) 인덱스)
+    def has_tag(tag_id):
+        return select(CompanyTag.company_id).where(
+            CompanyTag.company_id == Company.id, CompanyTag.tag_id == tag_id
+        ).exists()
+
+    stmt = select(Company.id)
+    for name in all_of:
+        stmt = stmt.where(has_tag(_tag_id_by_name(name)))
+    if any_of:
+        stmt = stmt.where(
+            select(CompanyTag.company_id).where(
+                CompanyTag.company_id == Company.id,
+                CompanyTag.tag_id.in_([_tag_id_by_name(name) for name in any_of]),
+            ).exists()
         )
+    for name in none_of:
+        stmt = stmt.where(~has_tag(_tag_id_by_name(name)))
+    if after is not None:
+        stmt = stmt.where(Company.id > after)
+    return list(db.scalars(stmt.order_by(Company.id).limit(limit)))
+
+
+def search_companies_by_tags(
+    db: Session, all_of: List[str], any_of: List[str], none_of: List[str], lang: Union[str, Languages],
+    limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    all_of 태그를 모두 갖고, any_of 중 하나 이상을 갖고, none_of 는 갖지 않는 회사 (company_id 순).
+    태그 인덱스가 있으면 집합 연산은 메모리에서 하고 DB 는 결과 페이지의 표시 이름만 조회한다.
+    """
+    company_ids = company_tag_index.query(all_of, any_of, none_of, limit + 1, after)
+    if company_ids is None:
+        company_ids = _company_ids_by_tags(db, all_of, any_of, none_of, limit + 1, after)
+    if not company_ids:
+        return [], None
+
+    names = _display_names_by_ids(db, company_ids, as_languages(lang))
+    return _page([(company_id, names.get(company_id)) for company_id in company_ids], limit)
+
+
+def _display_names_by_ids(db: Session, company_ids: List[int], langs: Languages) -> Dict[int, Optional[str]]:
+    reader = _row_reader(langs)
+    if reader is not None:
+        return dict(reader.company_names_by_ids(db, company_ids, langs))
+    result = db.execute(
+        select(Company).where(Company.id.in_(company_ids)).options(selectinload(Company.names))
     )
-    tag = result.scalars().first()
-    if not tag:
-        return []
+    return {company.id: _display_name(company, langs) for company in result.scalars()}
+
+
+_pg_trgm_available: Optional[bool] = None
 
-    companies = []
-    for ct in tag.companies:
-        company = ct.company
-        rep_name = next((n.name for n in company.names if n.language == lang), None)
-        if not rep_name:
-            rep_name = next((n.name for n in company.names), None)
-        if rep_name:
-            companies.append(CompanyNameOut(company_name=rep_name))
 
-    return companies
+def pg_trgm_available(db: Session) -> bool:
+    # pg_trgm 확장 설치 여부 (init_db.py 가 가능하면 설치). 프로세스당 한 번만 확인
+    global _pg_trgm_available
+    if _pg_trgm_available is None:
+        _pg_trgm_available = bool(
+            db.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar()
+        )
+    return _pg_trgm_available
+
 
+def rank_company_names(
+    db: Session, query: str, lang: Union[str, Languages], limit: int = SEARCH_MAX_LIMIT,
+) -> List[dict]:
+    """
+    /search?ranked=true: trigram 유사도 + 완전 일치 / 접두어 / 부분 문자열 보너스로 점수를 매긴 상위 limit 개 (점수 순).
+    n-gram 인덱스가 있으면 인덱스 후보를 메모리에서, 없으면 pg_trgm 으로 SQL 에서 계산하고,
+    둘 다 없으면 company_names 를 순차로 읽으며 메모리에서 점수를 매긴다 (회사 수에 비례하므로 소규모 DB 용).
+    """
+    langs = as_languages(lang)
+    candidates = company_name_index.candidates(query)
+    if candidates is not None:
+        ranked = [company_id for company_id, _ in trigram.top_k(candidates, query, limit)]
+        names = company_name_index.display_names(ranked, langs)
+        return _page([(company_id, names.get(company_id)) for company_id in ranked], limit)[0]
+
+    if pg_trgm_available(db):
+        return _page(lean.ranked_company_names(db, query, langs, limit), limit)[0]
+
+    # 검색어 bigram 을 하나도 포함하지 않는 이름은 후보가 될 수 없으므로 DB 에서 먼저 거름 (seq scan).
+    # 점수도 정규화 검색 키로 매김 (trigram.RankedQuery 가 이름을 fold 하는 것과 같은 값)
+    folded = fold(query)
+    stmt = select(CompanyName.company_id, CompanyName.search_key)
+    if len(folded) > 1:
+        stmt = stmt.where(or_(*(
+            CompanyName.search_key.like(f"%{lean.like_escape(folded[i:i + 2])}%", escape="\\")
+            for i in range(len(folded) - 1)
+        )))
+    result = db.execute(stmt.execution_options(yield_per=10000))
+    ranked = [company_id for company_id, _ in trigram.top_k(result.tuples(), query, limit)]
+    if not ranked:
+        return []
+    names = _display_names_by_ids(db, ranked, langs)
+    return _page([(company_id, names.get(company_id)) for company_id in ranked], limit)[0]
 
 
 def get_company_id_by_name(db: Session, name: str) -> Optional[int]:
@@ -99,114 +692,399 @@ def get_company_id_by_name(db: Session, name: str) -> Optional[int]:
     return company.id if company else None
 
 
-def get_or_create_tag(db: Session, tag_name_dict: dict, commit: bool = True) -> Optional[int]:
-    existing_tag = None
-    for lang_code, name in tag_name_dict.items():
+def _insert_serial_rows(db: Session, model, count: int) -> List[int]:
+    # id 컬럼만 있는 테이블(companies, tags)에 count 개의 행을 한 statement 로 생성
+    table = model.__table__
+    result = db.execute(
+        insert(model)
+        .from_select(
+            [table.c.id],
+            select(func.nextval(func.pg_get_serial_sequence(table.name, "id")))
+            .select_from(func.generate_series(1, count)),
+        )
+        .returning(table.c.id)
+    )
+    return sorted(result.scalars())
+
+
+def get_or_create_tags(db: Session, tag_name_dicts: List[Dict[str, str]]) -> List[int]:
+    """
+    태그 dict 목록을 tag_id 목록으로 변환 (입력 순서 유지, commit 하지 않음).
+    (language, name) 중 하나라도 일치하는 태그가 있으면 그 태그를 사용하고, 없던 언어의 이름은 추가한다.
+    tag_names(language, name) 유니크 인덱스 + ON CONFLICT DO NOTHING 으로 동시 생성 시에도 중복 태그가 생기지 않음.
+    이름이 없는 dict 는 찾을 태그도 만들 이름도 없으므로 ValueError (라우트는 tags_error 로 먼저 400 을 반환).
+    언어 코드는 소문자로 저장하며, 소문자로 바꿨을 때 겹치는 언어가 있어도 ValueError.
+    """
+    if any(not tag_name_dict for tag_name_dict in tag_name_dicts):
+        raise ValueError("tag_name 에 이름이 하나 이상 필요합니다.")
+    if any(_duplicate_languages(tag_name_dict) for tag_name_dict in tag_name_dicts):
+        raise ValueError("tag_name 에 같은 언어가 두 번 있습니다.")
+    tag_name_dicts = [_by_language(tag_name_dict) for tag_name_dict in tag_name_dicts]
+    pairs = {(lang_code, name) for tag_name_dict in tag_name_dicts for lang_code, name in tag_name_dict.items()}
+    if not pairs:
+        return []
+
+    result = db.execute(
+        select(TagName.language, TagName.name, TagName.tag_id)
+        .where(tuple_(TagName.language, TagName.name).in_(pairs))
+    )
+    tag_ids = {(language, name): tag_id for language, name, tag_id in result}
+
+    # 새 태그는 음수 slot 으로 먼저 식별 (같은 요청 안에서 (language, name) 을 공유하면 같은 태그)
+    slot_count = 0
+    pending: Dict[tuple, int] = {}
+    resolved = []
+    for tag_name_dict in tag_name_dicts:
+        tag_id = next((tag_ids[p] for p in tag_name_dict.items() if p in tag_ids), None)
+        if tag_id is None:
+            slot_count += 1
+            tag_id = -slot_count
+        for pair in tag_name_dict.items():
+            if pair not in tag_ids:
+                tag_ids[pair] = tag_id
+                pending[pair] = tag_id
+        resolved.append(tag_id)
+
+    new_ids: Dict[int, int] = {}
+    if slot_count:
+        new_ids = dict(zip(range(-1, -slot_count - 1, -1), _insert_serial_rows(db, Tag, slot_count)))
+
+    inserted = set()
+    if pending:
+        # (tag_id, language) 가 이미 있거나 (language, name) 을 다른 요청이 먼저 넣은 경우는 건너뜀
         result = db.execute(
-            select(Tag)
-            .join(Tag.names)
-            .where(TagName.name == name, TagName.language == lang_code)
-            .options(selectinload(Tag.names))
+            pg_insert(TagName)
+            .values([
+                {"tag_id": new_ids.get(tag_id, tag_id), "language": language, "name": name}
+                for (language, name), tag_id in pending.items()
+            ])
+            .on_conflict_do_nothing()
+            .returning(TagName.tag_id, TagName.language, TagName.name)
         )
-        existing_tag = result.scalars().first()
-        if existing_tag:
-            break
-
-    if not existing_tag:
-        new_tag = Tag()
-        db.add(new_tag)
-        db.flush()
-        for lang_code, name in tag_name_dict.items():
-            db.add(TagName(tag_id=new_tag.id, name=name, language=lang_code))
-        if commit:
-            db.commit()
-        return new_tag.id
-
-    existing_langs = {tn.language for tn in existing_tag.names}
-    added = False
-    for lang_code, name in tag_name_dict.items():
-        if lang_code not in existing_langs:
-            db.add(TagName(tag_id=existing_tag.id, name=name, language=lang_code))
-            added = True
-
-    if added and commit:
-        db.commit()
+        inserted = {(language, name) for _, language, name in result}
 
-    return existing_tag.id
-    
+    # 기존 태그에 새 언어의 이름이 생기면 이 태그를 가진 회사들의 해당 언어 응답이 바뀜
+    renamed_tag_ids = {pending[pair] for pair in inserted if pending[pair] > 0}
+    _invalidate_on_commit(db, {("tag", tag_id) for tag_id in renamed_tag_ids})
+    _mark_changed_on_commit(db, tag_ids=renamed_tag_ids)
 
+    # 동시에 같은 태그를 만든 다른 요청이 이긴 경우: 그 태그를 사용하고 이름이 하나도 없는 새 태그는 삭제
+    lost_pairs = {
+        slot: [pair for pair, tag_id in pending.items() if tag_id == slot]
+        for slot in new_ids
+    }
+    lost_pairs = {
+        slot: slot_pairs for slot, slot_pairs in lost_pairs.items()
+        if not any(pair in inserted for pair in slot_pairs)
+    }
+    if lost_pairs:
+        result = db.execute(
+            select(TagName.language, TagName.name, TagName.tag_id)
+            .where(tuple_(TagName.language, TagName.name).in_({p for ps in lost_pairs.values() for p in ps}))
+        )
+        winners = {(language, name): tag_id for language, name, tag_id in result}
+        db.execute(delete(Tag).where(Tag.id.in_([new_ids[slot] for slot in lost_pairs])))
+        for slot, slot_pairs in lost_pairs.items():
+            new_ids[slot] = next(winners[p] for p in slot_pairs if p in winners)
+
+    _update_tag_index_on_commit(
+        db, names=[(new_ids.get(pending[pair], pending[pair]), pair[1]) for pair in inserted]
+    )
+    return [new_ids.get(tag_id, tag_id) for tag_id in resolved]
 
-def create_company(db: Session, body: dict, lang: str) -> Optional[int]:
-    company_name_data = body["company_name"]
-    tag_list = body["tags"]
 
+def get_or_create_tag(db: Session, tag_name_dict: dict, commit: bool = True) -> Optional[int]:
+    tag_id = get_or_create_tags(db, [tag_name_dict])[0]
+    if commit:
+        db.commit()
+    return tag_id
+
+
+def create_company(db: Session, body: CompanyCreateIn, lang: str) -> Optional[int]:
     company = Company()
     db.add(company)
     db.flush()
 
-    for lang, name in company_name_data.items():
-        db.add(CompanyName(name=name, language=lang, company_id=company.id))
+    company_names = [
+        CompanyName(name=name, language=lang, company_id=company.id, **search_columns(name))
+        for lang, name in _by_language(body.company_name).items()
+    ]
+    db.add_all(company_names)
 
-    for tag_dict in tag_list:
-        tag_name_data = tag_dict["tag_name"]
-        tag_id = get_or_create_tag(db, tag_name_data, commit=False)
-        db.add(CompanyTag(company_id=company.id, tag_id=tag_id))
+    tag_ids = list(dict.fromkeys(get_or_create_tags(db, [tag.tag_name for tag in body.tags])))
+    db.add_all(CompanyTag(company_id=company.id, tag_id=tag_id) for tag_id in tag_ids)
 
+    db.flush()
+    company_id = company.id
+    # 같은 이름으로 캐시된 다른 회사 응답이 있을 수 있음
+    _invalidate_on_commit(db, [("name", n.name) for n in company_names])
+    _mark_changed_on_commit(db, [company_id])
+    _update_tag_index_on_commit(db, added=[(tag_id, company_id) for tag_id in tag_ids])
+
+    _update_name_index_on_commit(db, [(n.id, company_id, n.language, n.name) for n in company_names])
     db.commit()
-    return company.id
+    return company_id
+
+def _by_language(names: Dict[str, str]) -> Dict[str, str]:
+    # {언어: 이름} 의 언어 코드를 저장 형태(소문자)로
+    return {normalize_language(lang): name for lang, name in names.items()}
+
+
+def _duplicate_languages(names: Dict[str, str]) -> bool:
+    return len(_by_language(names)) != len(names)
+
+
+def tags_error(tags: List[TagNameIn]) -> Optional[str]:
+    if any(not tag.tag_name or not all(name.strip() for name in tag.tag_name.values()) for tag in tags):
+        return "tag_name 은 비어있지 않은 이름만 가질 수 있습니다."
+    if any(_duplicate_languages(tag.tag_name) for tag in tags):
+        return "tag_name 에 같은 언어가 두 번 있습니다 (언어 코드는 대소문자를 구분하지 않음)."
+    return None
+
+
+def company_body_error(body: CompanyCreateIn) -> Optional[str]:
+    if not any(name.strip() for name in body.company_name.values()):
+        return "company_name 에 비어있지 않은 이름이 하나 이상 필요합니다."
+    if _duplicate_languages(body.company_name):
+        return "company_name 에 같은 언어가 두 번 있습니다 (언어 코드는 대소문자를 구분하지 않음)."
+    return tags_error(body.tags)
+
 
-def add_company_tag_relation(db: Session, company_id: int, tag_id: int):
+def _tag_key(tag_name: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(_by_language(tag_name).items()))
+
+
+def create_companies(db: Session, bodies: List[CompanyCreateIn]) -> List[Optional[int]]:
+    """
+    여러 회사를 하나의 트랜잭션으로 생성. 입력 순서대로 company_id 를 반환하고, 유효하지 않은 항목은 None.
+    태그는 배치 전체에서 중복을 제거해 한번에 조회/생성하고, 이름/태그 관계는 multi-row INSERT 로 넣는다.
+    """
+    valid = [i for i, body in enumerate(bodies) if company_body_error(body) is None]
+    company_ids: List[Optional[int]] = [None] * len(bodies)
+    if not valid:
+        return company_ids
+
+    for i, company_id in zip(valid, _insert_serial_rows(db, Company, len(valid))):
+        company_ids[i] = company_id
+
+    name_rows = [
+        {"company_id": company_ids[i], "language": language, "name": name, **search_columns(name)}
+        for i in valid
+        for language, name in _by_language(bodies[i].company_name).items()
+        if name.strip()
+    ]
     result = db.execute(
-        select(CompanyTag).where(CompanyTag.company_id == company_id, CompanyTag.tag_id == tag_id)
+        insert(CompanyName).returning(
+            CompanyName.id, CompanyName.company_id, CompanyName.language, CompanyName.name,
+            sort_by_parameter_order=True,
+        ),
+        name_rows,
     )
-    if not result.scalar():
-        db.add(CompanyTag(company_id=company_id, tag_id=tag_id))
-        db.commit()
+    indexed_names = [tuple(row) for row in result]
 
+    # 같은 태그라도 언어 순서가 다를 수 있으므로 정렬한 (언어, 이름) 으로 중복 제거
+    tag_dicts = list({
+        _tag_key(tag.tag_name): tag.tag_name for i in valid for tag in bodies[i].tags
+    }.values())
+    tag_ids = dict(zip(map(_tag_key, tag_dicts), get_or_create_tags(db, tag_dicts)))
+    link_rows = list({
+        (company_ids[i], tag_ids[_tag_key(tag.tag_name)]): None
+        for i in valid
+        for tag in bodies[i].tags
+    })
+    if link_rows:
+        db.execute(
+            insert(CompanyTag),
+            [{"company_id": company_id, "tag_id": tag_id} for company_id, tag_id in link_rows],
+        )
 
-def delete_company_tag_by_name(db: Session, company_id: int, tag_name: str):
-    tag_result = db.execute(
-        select(Tag).join(Tag.names).where(TagName.name == tag_name)
-    )
-    tag = tag_result.scalars().first()
-    if not tag:
-        return
+    _invalidate_on_commit(db, [("name", row["name"]) for row in name_rows])
+    _mark_changed_on_commit(db, [company_ids[i] for i in valid])
+    _update_tag_index_on_commit(db, added=[(tag_id, company_id) for company_id, tag_id in link_rows])
+    _update_name_index_on_commit(db, indexed_names)
+    db.commit()
+    return company_ids
 
-    db.execute(
-        delete(CompanyTag)
-        .where(CompanyTag.company_id == company_id)
-        .where(CompanyTag.tag_id == tag.id)
-    )
+
+def update_company_tags(
+    db: Session, company_id: int, add: List[Dict[str, str]] = (), remove: List[str] = (),
+) -> Tuple[List[int], List[int]]:
+    """
+    회사의 태그를 한 트랜잭션으로 변경하고 commit 한 번. (붙인 tag_id, 뗀 tag_id) 를 반환 (원래 상태와 같았던 태그는 제외).
+    remove 의 태그명(어느 언어든, 같은 이름의 태그가 여럿이면 /tags 와 같이 가장 작은 tag_id)을 먼저 떼고,
+    add 의 태그를 get_or_create_tags 로 찾거나 만들어 붙인다. 관계 변경은 DELETE / INSERT ... ON CONFLICT DO NOTHING 한 번씩.
+    """
+    removed: List[int] = []
+    if remove:
+        remove_ids = select(func.min(TagName.tag_id)).where(TagName.name.in_(set(remove))).group_by(TagName.name)
+        removed = list(db.scalars(
+            delete(CompanyTag)
+            .where(CompanyTag.company_id == company_id, CompanyTag.tag_id.in_(remove_ids))
+            .returning(CompanyTag.tag_id)
+        ))
+        _update_tag_index_on_commit(db, removed=[(tag_id, company_id) for tag_id in removed])
+
+    added: List[int] = []
+    tag_ids = list(dict.fromkeys(get_or_create_tags(db, list(add)))) if add else []
+    if tag_ids:
+        added = list(db.scalars(
+            pg_insert(CompanyTag)
+            .values([{"company_id": company_id, "tag_id": tag_id} for tag_id in tag_ids])
+            .on_conflict_do_nothing()
+            .returning(CompanyTag.tag_id)
+        ))
+        _update_tag_index_on_commit(db, added=[(tag_id, company_id) for tag_id in added])
+
+    if added or removed:
+        _invalidate_on_commit(db, [("company", company_id)])
+        _mark_changed_on_commit(db, [company_id])
     db.commit()
+    return added, removed
 
 
-def get_company_name_and_tags(db: Session, company_id: int, lang: str):
+def get_company_name_and_tags(db: Session, company_id: int, lang: Union[str, Languages]):
+    langs = as_languages(lang)
+    reader = _row_reader(langs)
+    if reader is not None:
+        row = reader.company_detail(db, langs, company_id=company_id)
+        if not row:
+            return None
+        return {
+            "company_name": row.company_name or "",
+            "tags": sorted({t for t in row.tags or () if t}, key=lambda x: int(x.split("_")[-1])),
+        }
+
     result = db.execute(
         select(Company)
         .where(Company.id == company_id)
-        .options(
-            selectinload(Company.names),
-            selectinload(Company.tags).selectinload(CompanyTag.tag).selectinload(Tag.names)
-        )
+        .options(*_company_graph())
     )
     company = result.scalars().first()
     if not company:
         return None
+    return _name_and_tags(company, langs)
 
-    name = next((n.name for n in company.names if n.language == lang), None)
-    if not name:
-        name = next((n.name for n in company.names), "")
+
+def get_companies_name_and_tags(
+    db: Session, company_ids: List[int], lang: Union[str, Languages],
+) -> Dict[int, dict]:
+    """
+    get_company_name_and_tags 를 여러 회사에 대해 한번에 (company_id -> 응답, 없는 회사는 빠짐).
+    회사 수와 관계없이 회사 / 이름 / 관계 / 태그 / 태그명을 IN 조회 한 번씩으로 읽는다
+    """
+    if not company_ids:
+        return {}
+    langs = as_languages(lang)
+    companies = db.scalars(select(Company).where(Company.id.in_(company_ids)).options(*_company_graph()))
+    return {company.id: _name_and_tags(company, langs) for company in companies}
+
+
+def _company_graph():
+    return (
+        selectinload(Company.names),
+        selectinload(Company.tags).selectinload(CompanyTag.tag).selectinload(Tag.names),
+    )
+
+
+def _name_and_tags(company: Company, langs: Languages) -> dict:
+    name = _localized(company.names, langs, "")
 
     tag_names = []
     for ct in company.tags:
-        tag_name = next((n.name for n in ct.tag.names if n.language == lang), None)
-        if not tag_name:
-            tag_name = next((n.name for n in ct.tag.names), None)
+        tag_name = _localized(ct.tag.names, langs)
         if tag_name:
             tag_names.append(tag_name)
 
-
     return {
         "company_name": name,
         "tags": sorted(set(tag_names), key=lambda x: int(x.split("_")[-1]))
     }
+
+
+def _export_translations(model, owner_column, owner_id, langs: Optional[List[str]]):
+    # {"ko": "...", "en": "..."} (이름 id 순). langs 가 주어지면 해당 언어만
+    stmt = (
+        select(func.coalesce(
+            func.json_object_agg(model.language, aggregate_order_by(model.name, model.id)),
+            literal_column("'{}'::json"),
+        ))
+        .where(owner_column == owner_id)
+    )
+    if langs:
+        stmt = stmt.where(model.language.in_(langs))
+    return stmt.scalar_subquery()
+
+
+def _company_translations(langs: Optional[List[str]]):
+    # {"id": .., "company_name": {lang: name}, "tags": [{"tag_name": {lang: name}}]} (POST /companies 본문과 같은 모양)
+    ct = aliased(CompanyTag)
+    tags = (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(
+                func.json_build_object(
+                    "tag_name", _export_translations(TagName, TagName.tag_id, ct.tag_id, langs),
+                ),
+                ct.tag_id,
+            )),
+            literal_column("'[]'::json"),
+        ))
+        .where(ct.company_id == Company.id)
+        .scalar_subquery()
+    )
+    return cast(func.json_build_object(
+        "id", Company.id,
+        "company_name", _export_translations(CompanyName, CompanyName.company_id, Company.id, langs),
+        "tags", tags,
+    ), Text)
+
+
+def get_company_translations(db: Session, name: str) -> Optional[dict]:
+    """
+    name 으로 조회되는 회사의 모든 언어 이름 / 태그명 (GET /companies/{company_name}?langs=all).
+    JSON 은 export 와 같은 방식으로 Postgres 에서 쿼리 한 번에 만든다.
+    """
+    cached = company_cache.get((name, None))
+    if cached is not MISSING:
+        return cached
+    generation = company_cache.generation
+    row = db.execute(
+        select(_company_translations(None), lean.tag_ids(Company.id))
+        .where(Company.id == lean.company_id_by_name(name))
+    ).first()
+    if row is None:
+        return None
+    output = json.loads(row[0])
+    company_id = output.pop("id")
+    _cache_company_detail(db, name, None, company_id, row[1] or (), output, generation)
+    return output
+
+
+def export_statement(langs: Optional[List[str]] = None, tag_name: Optional[str] = None):
+    """/export 의 회사 한 줄 JSON 조회 (company_id 순). 한 줄은 _company_translations 의 JSON"""
+    if langs:
+        langs = [normalize_language(lang) for lang in langs]
+    stmt = select(_company_translations(langs)).select_from(Company)
+    if tag_name is not None:
+        stmt = stmt.where(
+            select(CompanyTag.company_id)
+            .join(TagName, TagName.tag_id == CompanyTag.tag_id)
+            .where(CompanyTag.company_id == Company.id, TagName.name == tag_name)
+            .exists()
+        )
+    return stmt.order_by(Company.id)
+
+
+def export_companies(
+    db: Session, langs: Optional[List[str]] = None, tag_name: Optional[str] = None, batch_size: int = 1000,
+) -> Iterator[str]:
+    """
+    회사 전체를 company_id 순 NDJSON 으로 (export_statement).
+    JSON 은 Postgres 에서 만들어 server-side cursor 로 batch_size 행씩 읽으므로 메모리 사용량은 테이블 크기와 무관.
+    """
+    result = db.execute(export_statement(langs, tag_name).execution_options(yield_per=batch_size))
+    try:
+        for partition in result.scalars().partitions():
+            yield "".join(line + "\n" for line in partition)
+    finally:
+        # 클라이언트가 끊어 중간에 닫혀도 server-side cursor 를 바로 닫음
+        result.close()
@@ -0,0 +1,157 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config import SEARCH_MAX_LIMIT
+from app.crud import company as crud
+from app.database import DbSession
+from app.schemas.company import CompanyCreateIn
+from app.utils.language import Languages
+from app.utils.single_flight import request_flights
+
+# app/crud/company.py 함수들의 async 버전.
+# AsyncSession 이면 run_sync 로 (asyncpg I/O 는 greenlet 을 통해 이벤트 루프에서 대기),
+# 동기 Session 이면 threadpool 에서 실행하므로 쿼리 코드는 crud/company.py 한 곳에만 둔다.
+
+
+async def run(db: DbSession, fn: Callable, *args, **kwargs):
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def coalesce(db: DbSession, fn: Callable, *args):
+    """
+    run() 과 같지만 (조회 이름, 인자, 언어)가 같은 조회가 진행 중이면 그 결과를 같이 받는다 (결과는 공유되므로 수정하지 않음).
+    replica 세션은 확인된 replay 위치까지 같아야 합친다 (토큰을 보낸 요청이 더 뒤처진 결과를 받지 않도록).
+    """
+    key = (fn.__name__, *args, db.info.get("replica_lsn"))
+    return await request_flights.do(key, lambda: run(db, fn, *args))
+
+
+async def build_company_name_index(db: DbSession):
+    return await run(db, crud.build_company_name_index)
+
+
+async def build_company_tag_index(db: DbSession):
+    return await run(db, crud.build_company_tag_index)
+
+
+async def autocomplete_company_name(
+    db: DbSession, query: str, lang: Languages, limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    return await coalesce(db, crud.autocomplete_company_name, query, lang, limit, after)
+
+
+async def rank_company_names(
+    db: DbSession, query: str, lang: Languages, limit: int = SEARCH_MAX_LIMIT,
+) -> List[dict]:
+    return await coalesce(db, crud.rank_company_names, query, lang, limit)
+
+
+async def get_company_by_name(db: DbSession, name: str, lang: Languages):
+    return await coalesce(db, crud.get_company_by_name, name, lang)
+
+
+async def get_company_translations(db: DbSession, name: str) -> Optional[dict]:
+    return await coalesce(db, crud.get_company_translations, name)
+
+
+async def get_company_version(db: DbSession, name: str) -> Optional[Tuple[int, int]]:
+    return await coalesce(db, crud.get_company_version, name)
+
+
+async def get_catalog_version(db: DbSession) -> int:
+    return await coalesce(db, crud.get_catalog_version)
+
+
+async def get_companies_by_names(db: DbSession, names: List[str], lang: Languages) -> Dict[str, Optional[dict]]:
+    return await run(db, crud.get_companies_by_names, names, lang)
+
+
+async def search_companies_by_tag_name(
+    db: DbSession, tag_name: str, lang: Languages, limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    return await coalesce(db, crud.search_companies_by_tag_name, tag_name, lang, limit, after)
+
+
+async def search_companies_by_tags(
+    db: DbSession, all_of: List[str], any_of: List[str], none_of: List[str], lang: Languages,
+    limit: int = SEARCH_MAX_LIMIT, after: Optional[int] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    return await run(db, crud.search_companies_by_tags, all_of, any_of, none_of, lang, limit, after)
+
+
+async def get_company_id_by_name(db: DbSession, name: str) -> Optional[int]:
+    return await run(db, crud.get_company_id_by_name, name)
+
+
+async def get_or_create_tags(db: DbSession, tag_name_dicts: List[Dict[str, str]]) -> List[int]:
+    return await run(db, crud.get_or_create_tags, tag_name_dicts)
+
+
+async def get_or_create_tag(db: DbSession, tag_name_dict: dict, commit: bool = True) -> Optional[int]:
+    return await run(db, crud.get_or_create_tag, tag_name_dict, commit)
+
+
+async def create_company(db: DbSession, body: CompanyCreateIn, lang: str) -> Optional[int]:
+    return await run(db, crud.create_company, body, lang)
+
+
+company_body_error = crud.company_body_error
+tags_error = crud.tags_error
+
+
+async def create_companies(db: DbSession, bodies: List[CompanyCreateIn]) -> List[Optional[int]]:
+    return await run(db, crud.create_companies, bodies)
+
+
+async def update_company_tags(
+    db: DbSession, company_id: int, add: List[Dict[str, str]] = (), remove: List[str] = (),
+) -> Tuple[List[int], List[int]]:
+    return await run(db, crud.update_company_tags, company_id, add, remove)
+
+
+async def current_write_lsn(db: DbSession) -> int:
+    return await run(db, crud.current_write_lsn)
+
+
+async def get_company_name_and_tags(db: DbSession, company_id: int, lang: Languages):
+    return await run(db, crud.get_company_name_and_tags, company_id, lang)
+
+
+async def get_companies_name_and_tags(db: DbSession, company_ids: List[int], lang: Languages) -> Dict[int, dict]:
+    return await run(db, crud.get_companies_name_and_tags, company_ids, lang)
+
+
+async def export_companies(
+    db: DbSession, langs: Optional[List[str]] = None, tag_name: Optional[str] = None, batch_size: int = 1000,
+) -> AsyncIterator[str]:
+    """
+    crud.export_companies 의 async 버전. AsyncSession 이면 stream() 의 server-side cursor 로,
+    동기 Session 이면 동기 제너레이터를 batch 단위로 threadpool 에서 실행. 중간에 닫혀도 cursor 를 닫는다.
+    """
+    if isinstance(db, AsyncSession):
+        result = await db.stream(crud.export_statement(langs, tag_name).execution_options(yield_per=batch_size))
+        try:
+            async for partition in result.scalars().partitions():
+                yield "".join(line + "\n" for line in partition)
+        finally:
+            await result.close()
+            # asyncpg 의 portal 은 트랜잭션이 끝날 때 닫히므로 읽기 전용 export 트랜잭션을 바로 끝냄
+            await db.rollback()
+        return
+    chunks = crud.export_companies(db, langs, tag_name, batch_size)
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        await run_in_threadpool(chunks.close)
+
+
+async def close(db: DbSession):
+    # 요청 의존성 밖에서 연 세션 (open_read_session) 을 닫음
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
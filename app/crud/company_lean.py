@@ -0,0 +1,174 @@
+from sqlalchemy import and_, case, or_, select, exists, func
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+
+from app.models.company import Company, CompanyName, CompanyTag, TagName
+from app.utils.language import Languages
+from app.utils.search_key import fold, query_key
+from app.utils.trigram import CONTAINS_BONUS, EXACT_BONUS, PREFIX_BONUS
+
+# READ_MODE=lean: ORM 객체 그래프 없이 언어 fallback 까지 SQL 한 번으로 처리하고 plain row 를 반환
+# 회사명/태그명은 langs 순서대로 그 언어의 비어있지 않은 이름을 우선, 없으면 id 가 가장 작은 이름
+
+companies = Company.__table__
+company_names = CompanyName.__table__
+company_tags = CompanyTag.__table__
+tag_names = TagName.__table__
+
+
+def language_rank(language_column, name_column, langs: Languages):
+    # langs 안의 순서 (0, 1, ..), 목록에 없는 언어나 빈 이름은 len(langs). langs 원소는 컬럼이어도 됨
+    return case(
+        *((and_(language_column == lang, name_column != ""), rank) for rank, lang in enumerate(langs)),
+        else_=len(langs),
+    )
+
+
+def display_name(company_id, langs: Languages):
+    cn = company_names.alias("cn")
+    return (
+        select(cn.c.name)
+        .where(cn.c.company_id == company_id)
+        .order_by(language_rank(cn.c.language, cn.c.name, langs), cn.c.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def display_tag_name(tag_id, langs: Languages):
+    tn = tag_names.alias("tn")
+    return (
+        select(tn.c.name)
+        .where(tn.c.tag_id == tag_id)
+        .order_by(language_rank(tn.c.language, tn.c.name, langs), tn.c.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def display_tags(company_id, langs: Languages):
+    ct = company_tags.alias("ct")
+    return (
+        select(func.array_agg(display_tag_name(ct.c.tag_id, langs)))
+        .where(ct.c.company_id == company_id)
+        .scalar_subquery()
+    )
+
+
+def tag_ids(company_id):
+    ct = company_tags.alias("ct_ids")
+    return select(func.array_agg(ct.c.tag_id)).where(ct.c.company_id == company_id).scalar_subquery()
+
+
+def company_id_by_name(name: str):
+    return (
+        select(company_names.c.company_id)
+        .where(company_names.c.name == name)
+        .order_by(company_names.c.company_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def name_matches(names, query: str):
+    """
+    /search 조건. names 는 company_names (별칭) 의 컬럼 모음 (.c). 검색어를 정규화해서
+    초성 검색어면 search_chosung, 아니면 search_key 를 LIKE '%key%' 로 비교 (둘 다 쓰기 시점에 계산된 컬럼)
+    """
+    column, key = query_key(query)
+    return names[column].like(f"%{key}%")
+
+
+def company_detail(db: Session, langs: Languages, *, name: Optional[str] = None, company_id: Optional[int] = None):
+    """(id, company_name, tags, tag_ids) 한 행. tags 는 언어 fallback 이 적용된 태그명 배열 (정렬 전)"""
+    target = company_id_by_name(name) if name is not None else company_id
+    return db.execute(
+        select(
+            companies.c.id,
+            display_name(companies.c.id, langs).label("company_name"),
+            display_tags(companies.c.id, langs).label("tags"),
+            tag_ids(companies.c.id).label("tag_ids"),
+        )
+        .select_from(companies)
+        .where(companies.c.id == target)
+    ).first()
+
+
+def autocomplete_company_names(
+    db: Session, query: str, langs: Languages, limit: int, after: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    cn = company_names.alias("match")
+    stmt = (
+        select(companies.c.id, display_name(companies.c.id, langs))
+        .select_from(companies)
+        .where(exists().where(cn.c.company_id == companies.c.id, name_matches(cn.c, query)))
+    )
+    if after is not None:
+        stmt = stmt.where(companies.c.id > after)
+    return [tuple(row) for row in db.execute(stmt.order_by(companies.c.id).limit(limit))]
+
+
+def company_names_by_tag_name(
+    db: Session, tag_name: str, langs: Languages, limit: int, after: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    tag_id = (
+        select(tag_names.c.tag_id)
+        .where(tag_names.c.name == tag_name)
+        .order_by(tag_names.c.tag_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(company_tags.c.company_id, display_name(company_tags.c.company_id, langs))
+        .select_from(company_tags)
+        .where(company_tags.c.tag_id == tag_id)
+    )
+    if after is not None:
+        stmt = stmt.where(company_tags.c.company_id > after)
+    return [tuple(row) for row in db.execute(stmt.order_by(company_tags.c.company_id).limit(limit))]
+
+
+def company_names_by_ids(db: Session, company_ids: List[int], langs: Languages) -> List[Tuple[int, str]]:
+    stmt = (
+        select(companies.c.id, display_name(companies.c.id, langs))
+        .select_from(companies)
+        .where(companies.c.id.in_(company_ids))
+    )
+    return [tuple(row) for row in db.execute(stmt.order_by(companies.c.id))]
+
+
+def like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def ranked_company_names(db: Session, query: str, langs: Languages, limit: int) -> List[Tuple[int, str]]:
+    """
+    pg_trgm 이 설치된 DB 의 /search?ranked=true. 정규화 검색 키(search_key)와 fold 한 검색어로 비교하며,
+    후보는 search_key % key (trigram 유사도 >= pg_trgm.similarity_threshold) 또는 부분 문자열 일치이고
+    (둘 다 idx_company_search_key_trgm 사용), 회사별 최고 점수 상위 limit 개를 점수 순으로.
+    점수 계산은 app/utils/trigram.py 의 in-process fallback 과 같다.
+    """
+    cn = company_names.alias("ranked")
+    key = fold(query)
+    escaped = like_escape(key)
+    contains = cn.c.search_key.like(f"%{escaped}%", escape="\\")
+    score = func.max(
+        func.similarity(cn.c.search_key, key)
+        + case((cn.c.search_key == key, EXACT_BONUS), else_=0.0)
+        + case((cn.c.search_key.like(f"{escaped}%", escape="\\"), PREFIX_BONUS), else_=0.0)
+        + case((contains, CONTAINS_BONUS), else_=0.0)
+    )
+    # ORDER BY .. LIMIT 은 Postgres 가 top-N heapsort 로 처리 (후보 전체를 정렬하지 않음)
+    matches = (
+        select(cn.c.company_id, score.label("score"))
+        .where(or_(cn.c.search_key.op("%")(key), contains))
+        .group_by(cn.c.company_id)
+        .order_by(score.desc(), cn.c.company_id)
+        .limit(limit)
+        .subquery()
+    )
+    stmt = (
+        select(matches.c.company_id, display_name(matches.c.company_id, langs))
+        .order_by(matches.c.score.desc(), matches.c.company_id)
+    )
+    return [tuple(row) for row in db.execute(stmt)]
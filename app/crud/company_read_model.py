@@ -0,0 +1,160 @@
+from sqlalchemy import select, func, literal, column, values, String, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array, insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Tuple
+
+from app.config import READ_MODEL_LANGUAGES
+from app.crud.company_lean import (
+    companies, company_names, company_tags, tag_names, company_id_by_name, display_name, display_tag_name,
+    name_matches,
+)
+from app.models.company import CompanyReadModel
+from app.utils.language import Languages
+from app.utils.search_key import query_key
+
+# READ_MODE=read_model: company_read_model 의 (company_id, language) 한 행으로 응답을 만든다.
+# 반환 모양은 company_lean 과 같으므로 crud/company.py 에서 같은 방식으로 사용.
+# 행은 언어 하나의 fallback 으로 계산되어 있으므로 langs 가 언어 하나일 때만 사용 (crud._row_reader)
+
+read_model = CompanyReadModel.__table__
+
+
+def _rows_select(company_filter):
+    """company_filter 에 해당하는 회사들의 (회사, 언어) 행을 계산하는 SELECT"""
+    langs = values(column("language", String), name="langs").data([(lang,) for lang in READ_MODEL_LANGUAGES])
+    ct = company_tags.alias("rm_ct")
+    cn = company_names.alias("rm_cn")
+    tags = (
+        select(func.array_agg(aggregate_order_by(display_tag_name(ct.c.tag_id, (langs.c.language,)), ct.c.tag_id)))
+        .where(ct.c.company_id == companies.c.id)
+        .scalar_subquery()
+    )
+    tag_ids = (
+        select(func.array_agg(aggregate_order_by(ct.c.tag_id, ct.c.tag_id)))
+        .where(ct.c.company_id == companies.c.id)
+        .scalar_subquery()
+    )
+    search_key = (
+        select(func.string_agg(cn.c.search_key, literal("\n")))
+        .where(cn.c.company_id == companies.c.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            companies.c.id,
+            langs.c.language,
+            func.coalesce(display_name(companies.c.id, (langs.c.language,)), ""),
+            func.coalesce(tags, array([], type_=String)),
+            func.coalesce(tag_ids, array([], type_=read_model.c.tag_ids.type.item_type)),
+            func.coalesce(search_key, ""),
+        )
+        .select_from(companies)
+        .join(langs, true())
+        .where(company_filter)
+    )
+
+
+def refresh(db: Session, company_ids: Iterable[int] = (), tag_ids: Iterable[int] = ()):
+    """
+    company_ids 의 회사와 tag_ids 태그를 가진 회사들의 행을 현재 데이터로 다시 계산 (upsert, commit 하지 않음).
+    """
+    company_ids, tag_ids = list(company_ids), list(tag_ids)
+    conditions = []
+    if company_ids:
+        conditions.append(companies.c.id.in_(company_ids))
+    if tag_ids:
+        conditions.append(companies.c.id.in_(
+            select(company_tags.c.company_id).where(company_tags.c.tag_id.in_(tag_ids))
+        ))
+    if conditions:
+        _upsert(db, conditions[0] if len(conditions) == 1 else conditions[0] | conditions[1])
+
+
+def _upsert(db: Session, company_filter):
+    stmt = pg_insert(read_model).from_select(
+        ["company_id", "language", "company_name", "tags", "tag_ids", "search_key"],
+        _rows_select(company_filter),
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["company_id", "language"],
+        set_={
+            "company_name": stmt.excluded.company_name,
+            "tags": stmt.excluded.tags,
+            "tag_ids": stmt.excluded.tag_ids,
+            "search_key": stmt.excluded.search_key,
+        },
+    ))
+
+
+def rebuild(db: Session, batch_size: int = 50_000, progress=None) -> int:
+    """전체 행을 company_id 구간 단위로 다시 계산하고 구간마다 commit. 설정에서 빠진 언어의 행은 삭제"""
+    db.execute(read_model.delete().where(read_model.c.language.not_in(READ_MODEL_LANGUAGES)))
+    max_id = db.execute(select(func.max(companies.c.id))).scalar() or 0
+    for start in range(0, max_id, batch_size):
+        _upsert(db, companies.c.id.between(start + 1, start + batch_size))
+        db.commit()
+        if progress:
+            progress(min(start + batch_size, max_id), max_id)
+    db.commit()
+    return max_id
+
+
+def company_detail(db: Session, langs: Languages, *, name: Optional[str] = None, company_id: Optional[int] = None):
+    """(id, company_name, tags, tag_ids) 한 행. tags 는 tag_id 순"""
+    target = company_id_by_name(name) if name is not None else company_id
+    return db.execute(
+        select(
+            read_model.c.company_id.label("id"),
+            read_model.c.company_name,
+            read_model.c.tags,
+            read_model.c.tag_ids,
+        )
+        .where(read_model.c.company_id == target, read_model.c.language == langs[0])
+    ).first()
+
+
+def autocomplete_company_names(
+    db: Session, query: str, langs: Languages, limit: int, after: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    column, key = query_key(query)
+    if column == "search_key":
+        matches = read_model.c.search_key.like(f"%{key}%")
+    else:
+        # 초성은 read model 에 없으므로 company_names.search_chosung 인덱스로 회사를 찾음
+        matches = read_model.c.company_id.in_(
+            select(company_names.c.company_id).where(name_matches(company_names.c, query))
+        )
+    stmt = (
+        select(read_model.c.company_id, read_model.c.company_name)
+        .where(read_model.c.language == langs[0], matches)
+    )
+    if after is not None:
+        stmt = stmt.where(read_model.c.company_id > after)
+    return [tuple(row) for row in db.execute(stmt.order_by(read_model.c.company_id).limit(limit))]
+
+
+def company_names_by_tag_name(
+    db: Session, tag_name: str, langs: Languages, limit: int, after: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    tag_id = (
+        select(tag_names.c.tag_id)
+        .where(tag_names.c.name == tag_name)
+        .order_by(tag_names.c.tag_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(read_model.c.company_id, read_model.c.company_name)
+        .where(read_model.c.language == langs[0], read_model.c.tag_ids.contains(array([tag_id])))
+    )
+    if after is not None:
+        stmt = stmt.where(read_model.c.company_id > after)
+    return [tuple(row) for row in db.execute(stmt.order_by(read_model.c.company_id).limit(limit))]
+
+
+def company_names_by_ids(db: Session, company_ids: List[int], langs: Languages) -> List[Tuple[int, str]]:
+    stmt = (
+        select(read_model.c.company_id, read_model.c.company_name)
+        .where(read_model.c.language == langs[0], read_model.c.company_id.in_(company_ids))
+    )
+    return [tuple(row) for row in db.execute(stmt.order_by(read_model.c.company_id))]
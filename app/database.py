@@ -1,8 +1,22 @@
+import logging
 import os
-# from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy import create_engine
+from typing import Optional, Union
+from fastapi import Header
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+
+from app.config import (
+    DB_ASYNC, DB_ECHO, DB_MAX_OVERFLOW, DB_POOL_MODE, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE,
+    DB_POOL_TIMEOUT, DB_REPLICA_HOSTS, DB_REPLICA_PROBE_INTERVAL,
+)
+from app.utils.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.utils.replica import ReplicaSet, parse_lsn, read_routes
+
+logger = logging.getLogger(__name__)
 
 DB_USER = os.getenv("POSTGRES_USER", "postgres")
 DB_PASS = os.getenv("POSTGRES_PASSWORD", "postgres")
@@ -10,21 +24,108 @@ DB_NAME = os.getenv("POSTGRES_DB", "company_db")
 DB_HOST = os.getenv("POSTGRES_HOST", "db")
 DB_PORT = os.getenv("POSTGRES_PORT", "5432")
 
-# DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# engine = create_async_engine(DATABASE_URL, echo=True)
-# async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def database_url(host: str, port: str, is_async: bool = False) -> str:
+    if not is_async:
+        return f"postgresql://{DB_USER}:{DB_PASS}@{host}:{port}/{DB_NAME}"
+    url = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{host}:{port}/{DB_NAME}"
+    if DB_POOL_MODE == "null":
+        # SQLAlchemy asyncpg dialect 의 prepared statement 캐시도 끔 (PgBouncer transaction pooling)
+        url += "?prepared_statement_cache_size=0"
+    return url
+
+
+DATABASE_URL = database_url(DB_HOST, DB_PORT)
+ASYNC_DATABASE_URL = database_url(DB_HOST, DB_PORT, is_async=True)
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=True)
+def engine_options(is_async: bool, name: Optional[str] = None) -> dict:
+    if DB_POOL_MODE == "null":
+        # PgBouncer 가 커넥션을 재사용하므로 요청마다 연결/해제. transaction pooling 에서는 서버 쪽
+        # prepared statement 가 다른 클라이언트 커넥션에 섞이므로 asyncpg 의 statement cache 를 끔
+        options = {"poolclass": NullPool}
+        if is_async:
+            options["connect_args"] = {"statement_cache_size": 0}
+        return options
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_logging_name": name or ("async" if is_async else "sync"),
+    }
+
+
+# 스크립트(init_db 등)와 startup 작업은 항상 동기 엔진을 사용
+engine = create_engine(DATABASE_URL, echo=DB_ECHO, **engine_options(is_async=False))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# DB_ASYNC=1 이면 요청 처리는 asyncpg + AsyncSession 으로
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, echo=DB_ECHO, **engine_options(is_async=True)) if DB_ASYNC else None
+)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if DB_ASYNC else None
+)
+
+
+def _replica_engine(index: int, address: str):
+    host, _, port = address.partition(":")
+    url = database_url(host, port or DB_PORT, is_async=DB_ASYNC)
+    options = engine_options(is_async=DB_ASYNC, name=f"replica-{index}")
+    if DB_ASYNC:
+        replica = create_async_engine(url, echo=DB_ECHO, **options)
+    else:
+        replica = create_engine(url, echo=DB_ECHO, **options)
+
+    @event.listens_for(replica.sync_engine if DB_ASYNC else replica, "handle_error")
+    def mark_down(context):
+        # 연결이 끊기면 다음 확인(probe)에 성공할 때까지 이 replica 로 보내지 않음
+        if context.is_disconnect:
+            replicas.mark_down(index)
+
+    return replica
+
+
+def _replica_session_factory(replica):
+    if DB_ASYNC:
+        return async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+    return sessionmaker(bind=replica, autoflush=False, autocommit=False)
+
+
+# 읽기 전용 라우트의 세션은 DB_REPLICA_HOSTS 의 replica 에서 (get_read_db). DB_ASYNC 면 async 엔진
+replicas = ReplicaSet(DB_REPLICA_PROBE_INTERVAL)
+replica_engines = [_replica_engine(index, address) for index, address in enumerate(DB_REPLICA_HOSTS)]
+replicas.configure([_replica_session_factory(replica) for replica in replica_engines])
+
+# standby 에서는 replay 된 WAL 위치, standby 가 아니면 NULL
+REPLAY_LSN = text("SELECT pg_last_wal_replay_lsn()::text")
+
 Base = declarative_base()
 
-# def get_session() -> AsyncSession:
-#     with async_session() as session:
-#         yield session
+
+def warm_pool(engine) -> int:
+    """풀이 유지하는 커넥션(DB_POOL_SIZE 개)을 미리 연결. DB_POOL_MODE=null 이면 풀이 없으므로 0"""
+    if DB_POOL_MODE == "null":
+        return 0
+    connections = [engine.connect() for _ in range(DB_POOL_SIZE)]
+    for connection in connections:
+        connection.close()
+    return len(connections)
+
+
+async def warm_async_pool(engine) -> int:
+    if DB_POOL_MODE == "null":
+        return 0
+    connections = [await engine.connect() for _ in range(DB_POOL_SIZE)]
+    for connection in connections:
+        await connection.close()
+    return len(connections)
+
+DbSession = Union[Session, AsyncSession]
+
 
 def get_session():
     db: Session = SessionLocal()
@@ -33,6 +134,115 @@ def get_session():
     finally:
         db.close()
 
+
+async def get_async_session():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# 라우트에서 사용하는 세션 의존성 (설정에 따라 동기/비동기)
+get_db = get_async_session if DB_ASYNC else get_session
+
+SESSION_TOKEN_HEADER = "X-Session-Token"
+_session_token = Header(
+    default=None,
+    alias=SESSION_TOKEN_HEADER,
+    description="쓰기 응답의 X-Session-Token. 보내면 그 쓰기가 반영된 replica(또는 primary)에서 읽음",
+)
+
+
+def _replay_lsn(db: Session) -> Optional[int]:
+    return parse_lsn(db.scalar(REPLAY_LSN))
+
+
+async def _async_replay_lsn(db: AsyncSession) -> Optional[int]:
+    return parse_lsn(await db.scalar(REPLAY_LSN))
+
+
+def _needed_lsn(token_lsn: Optional[int]) -> int:
+    # 토큰 LSN 과, 캐시를 채워도 되는 기준(last_write_lsn) 중 큰 값까지 replay 했는지 확인
+    return max(token_lsn or 0, replicas.last_write_lsn)
+
+
+def _replica_unavailable(index: int, e: Exception):
+    # replica 에 연결할 수 없으면 이번 요청은 primary 로
+    logger.warning("read replica %d unavailable, using primary: %r", index, e)
+    replicas.mark_down(index)
+    read_routes.inc(target="primary", reason="unavailable")
+
+
+def _read_session(token_lsn: Optional[int]) -> Session:
+    """
+    replica 세션 (토큰 LSN 까지 replay 했으면) 또는 primary 세션. replica 세션은 info["replica_lsn"] 에
+    확인된 replay 위치를 기록 (crud 가 캐시를 채울지 판단)
+    """
+    if not replicas.enabled:
+        return SessionLocal()
+    index = replicas.pick()
+    db: Session = replicas.session(index)
+    try:
+        if replicas.needs_probe(index, _needed_lsn(token_lsn)):
+            replicas.observe(index, _replay_lsn(db))
+    except exc.DBAPIError as e:
+        db.close()
+        _replica_unavailable(index, e)
+        return SessionLocal()
+    if not replicas.route(index, token_lsn):
+        db.close()
+        return SessionLocal()
+    db.info["replica_lsn"] = replicas.observed[index]
+    return db
+
+
+async def _async_read_session(token_lsn: Optional[int]) -> AsyncSession:
+    if not replicas.enabled:
+        return AsyncSessionLocal()
+    index = replicas.pick()
+    db: AsyncSession = replicas.session(index)
+    try:
+        if replicas.needs_probe(index, _needed_lsn(token_lsn)):
+            replicas.observe(index, await _async_replay_lsn(db))
+    except (exc.DBAPIError, OSError) as e:
+        # asyncpg 는 연결 실패를 OSError 그대로 올림
+        await db.close()
+        _replica_unavailable(index, e)
+        return AsyncSessionLocal()
+    if not replicas.route(index, token_lsn):
+        await db.close()
+        return AsyncSessionLocal()
+    db.info["replica_lsn"] = replicas.observed[index]
+    return db
+
+
+def get_read_session(x_session_token: Optional[str] = _session_token):
+    db = _read_session(parse_lsn(x_session_token))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_session(x_session_token: Optional[str] = _session_token):
+    db = await _async_read_session(parse_lsn(x_session_token))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# 읽기 전용 라우트의 세션 의존성. replica 가 없으면 get_db 와 같음
+get_read_db = get_async_read_session if DB_ASYNC else get_read_session
+
+
+async def open_read_session(token_lsn: Optional[int] = None) -> DbSession:
+    """
+    get_read_db 와 같은 방식으로 고른 읽기 세션을 요청 의존성 밖에서 연다 (응답을 스트리밍하는 동안 소유할 때).
+    닫는 것은 호출한 쪽 (crud.company_async.close)
+    """
+    if DB_ASYNC:
+        return await _async_read_session(token_lsn)
+    return await run_in_threadpool(_read_session, token_lsn)
+
 # def get_session():
 #     db: Session = SessionLocal()
 #     try:
@@ -1,5 +1,136 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
-from app.api import company
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import configure_mappers
+from app.api import company, ops
+from app.config import (
+    CHANGE_LISTENER_ENABLED, CHANGE_LISTENER_POLL_INTERVAL, DB_ASYNC, SEARCH_INDEX_ENABLED, STARTUP_WARMUP,
+    TAG_INDEX_ENABLED,
+)
+from app.crud import company as crud
+from app.crud import company_async as crud_async
+from app.database import (
+    DATABASE_URL, AsyncSessionLocal, SessionLocal, async_engine, engine, replica_engines, replicas,
+    warm_async_pool, warm_pool,
+)
+from app.utils.change_listener import ChangeListener
+from app.utils.startup import startup_profile
+
+logger = logging.getLogger(__name__)
+
+
+def replay_changes():
+    with SessionLocal() as db:
+        crud.replay_changes(db)
+
+
+async def warm_pool_of(pool_engine):
+    if DB_ASYNC:
+        await warm_async_pool(pool_engine)
+    else:
+        # 요청을 처리하는 이벤트 루프를 막지 않도록 threadpool 에서 연결
+        await run_in_threadpool(warm_pool, pool_engine)
+
+
+async def warm_pools():
+    # 요청을 처리하는 엔진의 풀. replica 는 연결되지 않아도 다른 단계를 막지 않음 (요청 시 primary 로 대신)
+    await warm_pool_of(async_engine if DB_ASYNC else engine)
+    for index, replica_engine in enumerate(replica_engines):
+        try:
+            await warm_pool_of(replica_engine)
+        except Exception as e:
+            logger.warning("read replica %d warm-up failed: %r", index, e)
+
+
+async def warm_up(db):
+    try:
+        await crud_async.run(db, crud.warm_up)
+    finally:
+        if DB_ASYNC:
+            await db.close()
+        else:
+            db.close()
+
+
+async def warm_statements():
+    # 엔진마다 compiled cache 가 따로 있으므로 요청을 처리하는 엔진과 replica 엔진 각각에서 실행
+    await warm_up(AsyncSessionLocal() if DB_ASYNC else SessionLocal())
+    for index in range(len(replica_engines)):
+        try:
+            await warm_up(replicas.session(index))
+        except Exception as e:
+            logger.warning("read replica %d warm-up failed: %r", index, e)
+
+
+async def warm_up_in_background():
+    """
+    pool / statements warm-up 을 요청 처리와 함께 백그라운드에서 실행하고 끝나면 ready (/readyz 200).
+    DB 에 연결할 수 없어도 기동은 막지 않는다 (요청 시점에 연결, /readyz 는 DB 확인에서 503).
+    """
+    try:
+        with startup_profile.phase("pool"):
+            await warm_pools()
+        # 인덱스 사용 여부에 따라 실행되는 statement 가 달라지므로 인덱스를 만든 뒤에 (lifespan 에서 먼저 만듦)
+        with startup_profile.phase("statements"):
+            await warm_statements()
+    except Exception as e:
+        logger.warning("startup warm-up failed: %r", e)
+    startup_profile.ready = True
+
+
+def run_startup_phase(name: str, fn):
+    # change feed / 인덱스 준비. DB 에 연결할 수 없으면 건너뛰고 기동 (인덱스가 없으면 SQL 경로로 처리,
+    # change feed 는 listener 가 처음 연결될 때 시작)
+    with startup_profile.phase(name):
+        try:
+            with SessionLocal() as db:
+                fn(db)
+        except Exception as e:
+            logger.warning("startup %s failed: %r", name, e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 단계별 소요 시간은 /readyz, startup_phase_seconds metric, 로그로 확인
+    startup_profile.reset()
+    app.state.change_listener = None
+    app.state.warm_up = None
+    with startup_profile.phase("mappers"):
+        configure_mappers()
+    if CHANGE_LISTENER_ENABLED:
+        # 인덱스를 만드는 동안 다른 replica 가 쓴 변경은 listener 의 첫 replay 에서 다시 적용
+        run_startup_phase("change_feed", crud.start_change_feed)
+    if SEARCH_INDEX_ENABLED:
+        run_startup_phase("name_index", crud.build_company_name_index)
+    if TAG_INDEX_ENABLED:
+        run_startup_phase("tag_index", crud.build_company_tag_index)
+    if CHANGE_LISTENER_ENABLED:
+        app.state.change_listener = ChangeListener(
+            DATABASE_URL, crud.CHANGE_CHANNEL, replay_changes, poll_interval=CHANGE_LISTENER_POLL_INTERVAL
+        )
+        app.state.change_listener.start()
+    if STARTUP_WARMUP:
+        app.state.warm_up = asyncio.create_task(warm_up_in_background())
+    else:
+        startup_profile.ready = True
+    yield
+    startup_profile.ready = False
+    if app.state.warm_up is not None and not app.state.warm_up.done():
+        app.state.warm_up.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.warm_up
+    if app.state.change_listener is not None:
+        app.state.change_listener.stop()
+    # asyncpg 커넥션은 생성된 이벤트 루프에 묶여 있으므로 루프 종료 전에 정리
+    if async_engine is not None:
+        await async_engine.dispose()
+        for replica_engine in replica_engines:
+            await replica_engine.dispose()
+
 
-app = FastAPI()
-app.include_router(company.router)
\ No newline at end of file
+app = FastAPI(lifespan=lifespan)
+app.include_router(company.router)
+app.include_router(ops.router)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,7 +7,12 @@ class Company(Base):
     __tablename__ = "companies"
 
     id = Column(Integer, primary_key=True)
-    names = relationship("CompanyName", back_populates="company", cascade="all, delete-orphan")
+    # 이 회사의 응답(이름 / 태그 / 태그명)이 바뀌는 commit 마다 +1. GET /companies/{company_name} 의 ETag
+    version = Column(BigInteger, nullable=False, default=1, server_default="1")
+    # 언어 fallback 의 마지막 후보가 "첫 이름" 이므로 id 순
+    names = relationship(
+        "CompanyName", back_populates="company", cascade="all, delete-orphan", order_by="CompanyName.id"
+    )
     tags = relationship("CompanyTag", back_populates="company", cascade="all, delete-orphan")
 
 
@@ -17,9 +23,14 @@ class CompanyName(Base):
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
     language = Column(String, nullable=False)
     name = Column(String, nullable=False, index=True)
+    # 정규화한 검색 키 (app/utils/search_key.py, 쓰기 시점에 계산). /search 는 name 대신 이 컬럼을 LIKE 로 비교
+    search_key = Column(String, nullable=False, server_default="")
+    search_chosung = Column(String, nullable=False, server_default="")
 
     company = relationship("Company", back_populates="names")
 
+    # /search 는 LIKE '%key%' (앞 와일드카드) 라 btree 로는 찾을 수 없으므로, 두 컬럼의 인덱스는 pg_trgm 이 있을 때
+    # init_db.py 가 만드는 trigram GIN 인덱스뿐이다 (없으면 seq scan, SEARCH_INDEX_ENABLED=1 이면 DB 를 읽지 않음)
     __table_args__ = (UniqueConstraint("company_id", "language", name="uix_company_lang"),)
 
 
@@ -27,7 +38,7 @@ class Tag(Base):
     __tablename__ = "tags"
 
     id = Column(Integer, primary_key=True)
-    names = relationship("TagName", back_populates="tag", cascade="all, delete-orphan")
+    names = relationship("TagName", back_populates="tag", cascade="all, delete-orphan", order_by="TagName.id")
     companies = relationship("CompanyTag", back_populates="tag", cascade="all, delete-orphan")
 
 
@@ -41,7 +52,11 @@ class TagName(Base):
 
     tag = relationship("Tag", back_populates="names")
 
-    __table_args__ = (UniqueConstraint("tag_id", "language", name="uix_tag_lang"),)
+    __table_args__ = (
+        UniqueConstraint("tag_id", "language", name="uix_tag_lang"),
+        # get_or_create_tags 의 INSERT ... ON CONFLICT 대상
+        Index("uix_tag_name_lang_name", "language", "name", unique=True),
+    )
 
 
 class CompanyTag(Base):
@@ -52,3 +67,49 @@ class CompanyTag(Base):
 
     company = relationship("Company", back_populates="tags")
     tag = relationship("Tag", back_populates="companies")
+
+    # /tags 의 tag_id 별 company_id 순 keyset 페이지네이션
+    __table_args__ = (Index("ix_company_tags_tag_company", "tag_id", "company_id"),)
+
+
+class CompanyReadModel(Base):
+    """
+    (company, language) 별 조회용 비정규화 행. 언어 fallback 이 적용된 회사명 / 태그명을 미리 계산해 둔다.
+    READ_MODE=read_model 일 때 crud 의 쓰기 함수들이 같은 트랜잭션 안에서 갱신하며, 전체 재생성은 app/scripts/rebuild_read_model.py
+    """
+    __tablename__ = "company_read_model"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    language = Column(String, primary_key=True)
+    company_name = Column(String, nullable=False)
+    # tag_id 순 표시 태그명과 tag_id
+    tags = Column(ARRAY(String), nullable=False)
+    tag_ids = Column(ARRAY(Integer), nullable=False)
+    # 회사의 모든 언어 이름의 company_names.search_key 를 이어 붙인 값
+    # (/search 부분 문자열 검색. pg_trgm 이 있으면 init_db.py 가 trigram 인덱스 생성)
+    search_key = Column(String, nullable=False)
+
+    __table_args__ = (Index("ix_company_read_model_tag_ids", "tag_ids", postgresql_using="gin"),)
+
+
+class CatalogVersion(Base):
+    """
+    카탈로그 전체 버전 (id=1 한 행). 회사/태그가 바뀌는 commit 마다 +1 되고 목록 응답(/search, /tags) 의 ETag 로 사용.
+    행 잠금으로 commit 순서대로 증가하므로 버전이 같으면 같은 데이터가 보인다.
+    """
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+
+class CatalogChange(Base):
+    """
+    catalog_version 별 변경 로그 (commit 마다 한 행, 버전이 올라간 트랜잭션 안에서 기록).
+    changes 는 그 commit 이 각 프로세스의 캐시 / 인덱스에 반영해야 할 내용이며, 다른 replica 는 NOTIFY 를 받거나
+    재연결했을 때 자신이 반영한 버전 이후의 행을 순서대로 replay 한다. CHANGE_LOG_RETENTION 버전보다 오래된 행은 삭제
+    """
+    __tablename__ = "catalog_changes"
+
+    version = Column(BigInteger, primary_key=True, autoincrement=False)
+    changes = Column(JSONB, nullable=False)
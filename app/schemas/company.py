@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class TagNameIn(BaseModel):
     tag_name: Dict[str, str]
@@ -10,6 +10,12 @@ class CompanyCreateIn(BaseModel):
     tags: List[TagNameIn]
 
 
+class CompanyTagsPatchIn(BaseModel):
+    """PATCH /companies/{company_name}/tags: remove 를 먼저 떼고 add 를 붙임 (한 트랜잭션)"""
+    add: List[TagNameIn] = Field(default=[], max_length=100)
+    remove: List[str] = Field(default=[], max_length=100)
+
+
 class CompanyNameOut(BaseModel):
     company_name: str
 
@@ -25,3 +31,40 @@ class CompanyOut(BaseModel):
     model_config = {
         "from_attributes": True,
     }
+
+
+class TagTranslationsOut(BaseModel):
+    tag_name: Dict[str, str]
+
+
+class CompanyTranslationsOut(BaseModel):
+    """?langs=all: 언어별 회사명 / 태그명 (POST /companies 본문과 같은 모양)"""
+    company_name: Dict[str, str]
+    tags: List[TagTranslationsOut]
+
+
+class CompanyBulkItemOut(BaseModel):
+    index: int
+    status: str
+    company_id: Optional[int] = None
+    company: Optional[CompanyOut] = None
+    detail: Optional[str] = None
+
+
+class CompanyBulkOut(BaseModel):
+    created: int
+    items: List[CompanyBulkItemOut]
+
+
+class CompanyLookupIn(BaseModel):
+    names: List[str] = Field(min_length=1, max_length=100)
+
+
+class CompanyLookupItemOut(BaseModel):
+    name: str
+    status: str
+    company: Optional[CompanyOut] = None
+
+
+class CompanyLookupOut(BaseModel):
+    items: List[CompanyLookupItemOut]
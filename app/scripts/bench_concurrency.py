@@ -0,0 +1,83 @@
+"""
+동시 요청 수에 따른 처리량 / tail latency 측정 (동기 세션 모드 vs DB_ASYNC=1 비교용)
+
+    uvicorn app.main:app --port 8000                # 동기 세션 (threadpool)
+    DB_ASYNC=1 uvicorn app.main:app --port 8001     # asyncpg + AsyncSession
+    python app/scripts/bench_concurrency.py --url http://localhost:8000 --concurrency 10 50 200
+    python app/scripts/bench_concurrency.py --url http://localhost:8001 --concurrency 10 50 200
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+PATHS = [
+    ("/search?query=링크", "ko"),
+    ("/search?query=크", "en"),
+    ("/companies/원티드랩", "ko"),
+    ("/companies/Wantedlab", "en"),
+    ("/tags?tag_name=태그_22", "ko"),
+    ("/tags?tag_name=tag_4", "ja"),
+]
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def run_level(url: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    paths = itertools.cycle(PATHS)
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                path, lang = next(paths)
+                started = time.perf_counter()
+                try:
+                    resp = await client.get(path, headers={"x-wanted-language": lang})
+                    if resp.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    print(f"{args.url}")
+    print(f"{'conc':>6} {'reqs':>8} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        r = await run_level(args.url, concurrency, args.duration)
+        print(f"{r['concurrency']:>6} {r['requests']:>8} {r['rps']:>9.1f} "
+              f"{r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,261 @@
+"""
+엔드포인트 혼합 부하 테스트. 실행 중인 서버에 읽기/쓰기 요청을 섞어 보내고 엔드포인트별 p50/p95/p99, 처리량을 기록한다.
+
+    # 1) 카탈로그 준비 (10k / 100k / 1M)
+    python app/scripts/init_db.py
+    python app/scripts/generate_catalog.py --companies 100000 --out /tmp/catalog_100k.csv --load
+    # 2) 서버 실행 후 부하
+    uvicorn app.main:app --port 8000
+    python app/scripts/bench_load.py --url http://localhost:8000 --concurrency 32 --duration 30 --out bench/main.json
+    # 3) 다른 커밋에서 같은 명령 실행 후 비교
+    python app/scripts/bench_load.py ... --out bench/feature.json --compare bench/main.json
+
+- 검색어/회사명/태그명은 DB(POSTGRES_* 환경변수)에서 --seed 로 고정된 표본을 뽑으므로 같은 카탈로그면 같은 요청열
+- 쓰기: put_tag 는 벤치 전용 태그(벤치태그_N)를 붙이고, delete_tag 는 그렇게 붙인 태그를 뗀다. post_company 는 실행마다 새 회사명
+- --warmup 초 동안의 요청은 집계에서 제외
+- 결과 JSON 에는 git 커밋, 회사 수, 동시성, 요청 비율이 함께 기록됨
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import quote
+
+import httpx
+
+from app.scripts.bulk_load import connect
+
+DEFAULT_MIX = "search=30,company=30,tags=20,put_tag=7,delete_tag=7,post_company=6"
+LANGS = ["ko", "en", "ja"]
+
+
+def percentile(samples: List[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"unknown operations: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def load_samples(seed: int, size: int = 2000) -> dict:
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT setseed(%s)", (1 / (seed + 1),))
+            cur.execute(
+                "SELECT name FROM company_names WHERE char_length(name) <= 20 ORDER BY random() LIMIT %s", (size,)
+            )
+            names = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT name FROM tag_names WHERE char_length(name) <= 20 ORDER BY random() LIMIT %s", (size,))
+            tags = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT count(*) FROM companies")
+            companies = cur.fetchone()[0]
+    finally:
+        conn.close()
+    if not names or not tags:
+        raise SystemExit("empty catalog: run generate_catalog.py --load first")
+    return {"names": names, "tags": tags, "companies": companies}
+
+
+def catalog_tag(tag_name: str) -> Dict[str, str]:
+    # 카탈로그 태그(태그_N / tag_N / タグ_N) 중 하나로 3개 언어 이름을 복원. 다른 형식이면 그 이름 하나만
+    _, _, number = tag_name.rpartition("_")
+    if not number.isdigit():
+        return {"ko": tag_name}
+    return {"ko": f"태그_{number}", "en": f"tag_{number}", "ja": f"タグ_{number}"}
+
+
+class Workload:
+    def __init__(self, samples: dict, seed: int):
+        self.rnd = random.Random(seed)
+        self.names = samples["names"]
+        self.tag_names = samples["tags"]
+        self.run_id = f"{int(time.time()) % 100000:05d}"
+        self.created = 0
+        # put_tag 로 붙인 (회사명, 태그명). delete_tag 가 꺼내 씀
+        self.attached = deque()
+
+    def search(self):
+        name = self.rnd.choice(self.names)
+        length = self.rnd.choice([1, 2, 3])
+        start = self.rnd.randint(0, max(0, len(name) - length))
+        return "GET", f"/search?query={quote(name[start:start + length])}", None
+
+    def company(self):
+        return "GET", f"/companies/{quote(self.rnd.choice(self.names), safe='')}", None
+
+    def tags(self):
+        return "GET", f"/tags?tag_name={quote(self.rnd.choice(self.tag_names))}", None
+
+    def put_tag(self):
+        name = self.rnd.choice(self.names)
+        n = self.rnd.randint(1, 100)
+        self.attached.append((name, f"벤치태그_{n}"))
+        body = [{"tag_name": {"ko": f"벤치태그_{n}", "en": f"bench_tag_{n}", "ja": f"ベンチタグ_{n}"}}]
+        return "PUT", f"/companies/{quote(name, safe='')}/tags", body
+
+    def delete_tag(self):
+        if not self.attached:
+            return self.put_tag()
+        name, tag = self.attached.popleft()
+        return "DELETE", f"/companies/{quote(name, safe='')}/tags/{quote(tag, safe='')}", None
+
+    def post_company(self):
+        self.created += 1
+        suffix = f"{self.run_id}_{self.created}"
+        body = {
+            "company_name": {"ko": f"벤치회사_{suffix}", "en": f"BenchCo_{suffix}"},
+            "tags": [
+                {"tag_name": catalog_tag(tag)}
+                for tag in self.rnd.sample(self.tag_names, min(3, len(self.tag_names)))
+            ],
+        }
+        return "POST", "/companies", body
+
+
+OPERATIONS = {
+    "search": Workload.search,
+    "company": Workload.company,
+    "tags": Workload.tags,
+    "put_tag": Workload.put_tag,
+    "delete_tag": Workload.delete_tag,
+    "post_company": Workload.post_company,
+}
+
+
+async def run(url: str, workload: Workload, mix: Dict[str, int], concurrency: int, duration: float, warmup: float):
+    ops = list(mix)
+    weights = [mix[op] for op in ops]
+    latencies: Dict[str, List[float]] = {op: [] for op in ops}
+    errors: Dict[str, int] = {op: 0 for op in ops}
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker():
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                op = workload.rnd.choices(ops, weights)[0]
+                method, path, body = OPERATIONS[op](workload)
+                lang = workload.rnd.choice(LANGS)
+                request_started = time.perf_counter()
+                failed = False
+                try:
+                    resp = await client.request(method, path, json=body, headers={"x-wanted-language": lang})
+                    failed = resp.status_code >= 500
+                except httpx.HTTPError:
+                    failed = True
+                if request_started >= measure_from:
+                    latencies[op].append(time.perf_counter() - request_started)
+                    errors[op] += failed
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    report = {}
+    for op in ops:
+        samples = sorted(latencies[op])
+        if not samples:
+            continue
+        report[op] = {
+            "requests": len(samples),
+            "rps": len(samples) / duration,
+            "p50": percentile(samples, 0.50) * 1000,
+            "p95": percentile(samples, 0.95) * 1000,
+            "p99": percentile(samples, 0.99) * 1000,
+            "errors": errors[op],
+        }
+    total = sorted(s for op in ops for s in latencies[op])
+    if total:
+        report["total"] = {
+            "requests": len(total),
+            "rps": len(total) / duration,
+            "p50": percentile(total, 0.50) * 1000,
+            "p95": percentile(total, 0.95) * 1000,
+            "p99": percentile(total, 0.99) * 1000,
+            "errors": sum(errors.values()),
+        }
+    return report
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: dict, baseline: dict = None):
+    print(f"{'endpoint':<13} {'reqs':>7} {'req/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'errors':>6}")
+    for op, r in report.items():
+        line = (f"{op:<13} {r['requests']:>7} {r['rps']:>8.1f} "
+                f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>6}")
+        base = (baseline or {}).get(op)
+        if base:
+            delta = lambda key: (r[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+            line += (f"   vs base: req/s {delta('rps'):+.0f}%  p50 {delta('p50'):+.0f}%  "
+                     f"p95 {delta('p95'):+.0f}%  p99 {delta('p99'):+.0f}%")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,... (search, company, tags, put_tag, "
+                                                           "delete_tag, post_company)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    samples = load_samples(args.seed)
+    workload = Workload(samples, args.seed)
+    report = asyncio.run(run(args.url, workload, mix, args.concurrency, args.duration, args.warmup))
+
+    meta = {
+        "commit": git_commit(),
+        "url": args.url,
+        "companies": samples["companies"],
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": mix,
+        "seed": args.seed,
+    }
+    print(f"{meta['commit']} | {meta['companies']:,} companies | concurrency {args.concurrency} | {args.duration:.0f}s")
+
+    baseline = None
+    if args.compare:
+        previous = json.loads(args.compare.read_text())
+        baseline = previous["endpoints"]
+        print(f"baseline: {previous['meta']['commit']} ({previous['meta']['companies']:,} companies)")
+    print_report(report, baseline)
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps({"meta": meta, "endpoints": report}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
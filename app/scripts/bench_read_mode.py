@@ -0,0 +1,94 @@
+"""
+조회 경로 비교: READ_MODE=orm (selectinload 객체 그래프) vs lean (SQL 단일 쿼리) vs read_model (비정규화 테이블 단일 행)
+현재 DB(POSTGRES_* 환경변수)의 회사명/태그명으로 4개 조회 함수를 호출해 latency 와 Python 할당량을 측정한다.
+
+    python app/scripts/bench_read_mode.py --samples 300
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from app.crud import company as crud
+from app.database import SessionLocal, engine
+from app.models.company import CompanyName, TagName
+
+
+def measure(fn, args_list):
+    # 요청마다 새 세션을 쓰는 것과 같도록 호출 사이에 identity map 을 비움
+    timings = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+        args[0].expunge_all()
+
+    # 호출 1회 동안 늘어난 Python 메모리의 최대치 (ORM identity map / 객체 생성 비용)
+    peaks = []
+    tracemalloc.start()
+    for args in args_list:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        args[0].expunge_all()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "p50": timings[len(timings) // 2] * 1000,
+        "p95": timings[int(len(timings) * 0.95)] * 1000,
+        "mean": statistics.fmean(timings) * 1000,
+        "peak_kb": statistics.fmean(peaks) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=300)
+    args = parser.parse_args()
+
+    engine.echo = False
+    crud.company_cache.max_entries = 0
+    rnd = random.Random(0)
+
+    with SessionLocal() as db:
+        names = list(db.scalars(select(CompanyName.name).limit(50_000)))
+        tags = list(db.scalars(select(TagName.name).limit(50_000)))
+        company_ids = list(db.scalars(select(CompanyName.company_id).limit(50_000)))
+        langs = ["ko", "en", "ja"]
+
+        cases = {
+            "get_company_by_name": (
+                crud.get_company_by_name,
+                [(db, rnd.choice(names), rnd.choice(langs)) for _ in range(args.samples)],
+            ),
+            "get_company_name_and_tags": (
+                crud.get_company_name_and_tags,
+                [(db, rnd.choice(company_ids), rnd.choice(langs)) for _ in range(args.samples)],
+            ),
+            "search_companies_by_tag_name": (
+                crud.search_companies_by_tag_name,
+                [(db, rnd.choice(tags), rnd.choice(langs)) for _ in range(args.samples)],
+            ),
+            "autocomplete_company_name": (
+                crud.autocomplete_company_name,
+                [(db, rnd.choice(names)[:2], rnd.choice(langs)) for _ in range(args.samples)],
+            ),
+        }
+
+        print(f"{'function':<30} {'mode':<10} {'p50(ms)':>8} {'p95(ms)':>8} {'mean(ms)':>9} {'alloc(KB)/call':>15}")
+        for label, (fn, args_list) in cases.items():
+            for mode in ("orm", "lean", "read_model"):
+                crud.READ_MODE = mode
+                db.rollback()
+                r = measure(fn, args_list)
+                print(f"{label:<30} {mode:<10} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['mean']:>9.2f} "
+                      f"{r['peak_kb']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+/search 자동완성: in-process n-gram 인덱스 vs ILIKE 벤치마크
+
+    python app/scripts/bench_search_index.py --sizes 100000 1000000
+    python app/scripts/bench_search_index.py --sizes 100000 --db   # ILIKE 경로도 같이 측정 (POSTGRES_* 환경변수)
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.utils.ngram_index import NgramIndex
+
+SYLLABLES = "가나다라마바사아자차카타파하원티드랩크링스피제약앱스마케팅코리아"
+WORDS = ["lab", "soft", "corp", "tech", "data", "cloud", "line", "fresh", "mobile", "ai"]
+LANGS = ["ko", "en", "ja"]
+
+
+def synthetic_names(size: int, seed: int = 42):
+    """(name_id, company_id, language, name) 를 size 개 생성. 회사당 이름 1~3개."""
+    rnd = random.Random(seed)
+    name_id = 0
+    company_id = 0
+    while name_id < size:
+        company_id += 1
+        for lang in LANGS[:rnd.randint(1, 3)]:
+            if name_id >= size:
+                break
+            name_id += 1
+            if lang == "en":
+                name = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 3))).title()
+            else:
+                name = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 8)))
+            yield name_id, company_id, lang, f"{name} {company_id}"
+
+
+def sample_queries(rows, count: int = 200, seed: int = 7):
+    rnd = random.Random(seed)
+    picked = rnd.sample(rows, count)
+    queries = []
+    for _, _, _, name in picked:
+        length = rnd.choice([1, 2, 3, 4])
+        start = rnd.randint(0, max(0, len(name) - length))
+        queries.append(name[start:start + length])
+    return queries
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))]
+    return {
+        "p50": pick(0.50) * 1000,
+        "p95": pick(0.95) * 1000,
+        "p99": pick(0.99) * 1000,
+        "mean": statistics.fmean(samples) * 1000,
+    }
+
+
+def bench_index(rows, queries):
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = NgramIndex()
+    index.build(rows)
+    build_seconds = time.perf_counter() - started
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    timings = []
+    hits = 0
+    for query in queries:
+        started = time.perf_counter()
+        result = index.search(query, "ko")
+        timings.append(time.perf_counter() - started)
+        hits += len(result)
+    return build_seconds, memory_mb, percentiles(timings), hits
+
+
+def bench_ilike(rows, queries):
+    import psycopg2
+
+    conn = psycopg2.connect(
+        dbname=os.getenv("POSTGRES_DB"), user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"), host=os.getenv("POSTGRES_HOST", "db"),
+        port=os.getenv("POSTGRES_PORT", 5432),
+    )
+    cur = conn.cursor()
+    cur.execute(
+        "CREATE TEMP TABLE bench_company_names "
+        "(id integer PRIMARY KEY, company_id integer, language varchar, name varchar)"
+    )
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(str(v) for v in row) + "\n")
+    buf.seek(0)
+    cur.copy_expert("COPY bench_company_names FROM STDIN", buf)
+
+    cur.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if cur.fetchone():
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cur.execute("CREATE INDEX ON bench_company_names USING gin (name gin_trgm_ops)")
+        label = "ILIKE + pg_trgm GIN"
+    else:
+        label = "ILIKE (pg_trgm 없음, seq scan)"
+    cur.execute("ANALYZE bench_company_names")
+
+    timings = []
+    hits = 0
+    for query in queries:
+        started = time.perf_counter()
+        cur.execute(
+            "SELECT DISTINCT company_id FROM bench_company_names WHERE name ILIKE %s ORDER BY company_id",
+            (f"%{query}%",),
+        )
+        hits += len(cur.fetchall())
+        timings.append(time.perf_counter() - started)
+    conn.rollback()
+    conn.close()
+    return label, percentiles(timings), hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", action="store_true", help="ILIKE 경로도 측정")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = list(synthetic_names(size))
+        queries = sample_queries(rows, args.queries)
+        build_seconds, memory_mb, stats, hits = bench_index(rows, queries)
+        print(f"[{size:,} names]")
+        print(f"  n-gram index  build {build_seconds:.2f}s, {memory_mb:.0f} MB, "
+              f"p50 {stats['p50']:.3f}ms p95 {stats['p95']:.3f}ms p99 {stats['p99']:.3f}ms (hits {hits:,})")
+        if args.db:
+            label, stats, db_hits = bench_ilike(rows, queries)
+            print(f"  {label}  p50 {stats['p50']:.3f}ms p95 {stats['p95']:.3f}ms p99 {stats['p99']:.3f}ms "
+                  f"(hits {db_hits:,})")
+
+
+if __name__ == "__main__":
+    main()
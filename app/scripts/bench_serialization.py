@@ -0,0 +1,73 @@
+"""
+응답 직렬화 비교: /search 응답(List[CompanyNameOut]) 을 만드는 요청당 CPU 시간
+    before   : CompanyNameOut(...) 생성(검증) + FastAPI response_model 재검증 + JSONResponse (이전 구현)
+    standard : dict 항목 + FastAPI response_model 검증 한번 + JSONResponse (RESPONSE_MODE=standard)
+    fast     : dict 항목 + FastJSONResponse (pydantic-core 직접 직렬화, RESPONSE_MODE=fast)
+DB 는 사용하지 않고 조회 결과 행에서 응답 bytes 를 만들기까지의 비용만 측정한다.
+
+    python app/scripts/bench_serialization.py --items 1000 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.main import app
+from app.schemas.company import CompanyNameOut
+from app.utils.responses import FastJSONResponse
+
+
+def search_route():
+    return next(route for route in app.routes if getattr(route, "path", None) == "/search")
+
+
+async def before(rows, field):
+    content = [CompanyNameOut(company_name=name) for _, name in rows]
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def standard(rows, field):
+    content = [{"company_name": name} for _, name in rows]
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def fast(rows, field):
+    content = [{"company_name": name} for _, name in rows]
+    return FastJSONResponse(content).body
+
+
+async def measure(fn, rows, field, requests: int) -> float:
+    for _ in range(10):
+        await fn(rows, field)
+    started = time.process_time()
+    for _ in range(requests):
+        await fn(rows, field)
+    return (time.process_time() - started) / requests * 1000
+
+
+async def run(items: int, requests: int):
+    field = search_route().response_field
+    rows = [(i, f"회사_{i} Company {i}") for i in range(1, items + 1)]
+
+    bodies = {fn.__name__: await fn(rows, field) for fn in (before, standard, fast)}
+    assert len(set(bodies.values())) == 1, "모드별 응답 본문이 다릅니다"
+
+    results = {fn.__name__: await measure(fn, rows, field, requests) for fn in (before, standard, fast)}
+    for name, cpu_ms in results.items():
+        print(f"{name:<9} {cpu_ms:8.3f} ms CPU/request  (x{results['before'] / cpu_ms:.1f})")
+    print(json.dumps({"items": items, "bytes": len(bodies["fast"]), "cpu_ms": results}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.requests))
+
+
+if __name__ == "__main__":
+    main()
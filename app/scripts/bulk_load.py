@@ -0,0 +1,256 @@
+"""
+회사/태그 CSV 대량 적재 (COPY FROM STDIN)
+
+CSV 형식은 company_tag_sample.csv 와 같음:
+    company_ko,company_en,company_ja,tag_ko,tag_en,tag_ja   (태그는 '|' 로 구분)
+
+    python app/scripts/bulk_load.py catalog.csv --chunk-size 50000 --workers 4
+
+- CSV 를 chunk 단위로 읽고, chunk 마다 5개 테이블을 COPY 로 적재 후 commit (메모리는 chunk + 태그 사전 크기로 제한)
+- 태그는 (language, name) 기준으로 메모리에서 식별 (기존 DB 태그도 시작 시 로딩)
+- 회사명 행의 search_key / search_chosung 은 crud 와 같은 app/utils/search_key.py 로 계산해 같이 적재
+- companies.id / tags.id 는 시퀀스에서 배치로 미리 받아 클라이언트에서 부여
+- --workers > 1 이면 회사 chunk 를 별도 커넥션에서 병렬 적재 (태그는 메인 커넥션에서 먼저 commit)
+- 적재가 끝나면 company_read_model 을 재생성 (--skip-read-model 로 생략하고 나중에 rebuild_read_model.py 실행 가능)
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+import psycopg2
+
+from app.utils.search_key import chosung, fold
+
+LANGS = ("ko", "en", "ja")
+# 회사명 행은 정규화 검색 키(app/utils/search_key.py)를 같이 적재
+COMPANY_NAME_COLUMNS = ("company_id", "language", "name", "search_key", "search_chosung")
+TAG_NAME_COLUMNS = ("tag_id", "language", "name")
+
+
+def connect():
+    return psycopg2.connect(
+        dbname=os.getenv("POSTGRES_DB"),
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+        host=os.getenv("POSTGRES_HOST", "db"),
+        port=os.getenv("POSTGRES_PORT", 5432),
+    )
+
+
+def read_chunks(csv_path: Path, chunk_size: int) -> Iterator[List[dict]]:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        chunk = []
+        for row in csv.DictReader(f):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def reserve_ids(cur, table: str, count: int) -> List[int]:
+    if count == 0:
+        return []
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        (table, count),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def copy_rows(cur, table: str, columns: Tuple[str, ...], rows: List[tuple]):
+    if not rows:
+        return
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+class TagResolver:
+    """(language, name) -> tag_id. crud.get_or_create_tag 와 같은 규칙으로 기존 태그를 찾음."""
+
+    def __init__(self, cur):
+        self.tag_ids: Dict[Tuple[str, str], int] = {}
+        self.tag_langs: Dict[int, Set[str]] = {}
+        cur.execute("SELECT tag_id, language, name FROM tag_names")
+        for tag_id, language, name in cur:
+            self.tag_ids[(language, name)] = tag_id
+            self.tag_langs.setdefault(tag_id, set()).add(language)
+
+    def resolve(self, cur, chunk: List[dict]) -> Tuple[List[List[int]], List[tuple], List[tuple]]:
+        """chunk 의 행별 tag_id 목록과, 새로 넣어야 할 tags / tag_names 행을 반환"""
+        new_tag_count = 0
+        new_tag_names = []
+        row_tag_ids = []
+        for row in chunk:
+            tag_ids = []
+            for pairs in parse_tags(row):
+                tag_id = next((self.tag_ids[p] for p in pairs if p in self.tag_ids), None)
+                if tag_id is None:
+                    # 음수 id: 이번 chunk 에서 새로 만드는 태그 (아래에서 시퀀스 id 로 치환)
+                    new_tag_count += 1
+                    tag_id = -new_tag_count
+                    self.tag_langs[tag_id] = set()
+                for language, name in pairs:
+                    if (language, name) not in self.tag_ids and language not in self.tag_langs[tag_id]:
+                        self.tag_ids[(language, name)] = tag_id
+                        self.tag_langs[tag_id].add(language)
+                        new_tag_names.append((tag_id, language, name))
+                tag_ids.append(tag_id)
+            row_tag_ids.append(tag_ids)
+
+        reserved = reserve_ids(cur, "tags", new_tag_count)
+        real_id = lambda tag_id: reserved[-tag_id - 1] if tag_id < 0 else tag_id
+        for tag_id in range(-1, -new_tag_count - 1, -1):
+            self.tag_langs[real_id(tag_id)] = self.tag_langs.pop(tag_id)
+        new_tag_names = [(real_id(tag_id), language, name) for tag_id, language, name in new_tag_names]
+        for tag_id, language, name in new_tag_names:
+            self.tag_ids[(language, name)] = tag_id
+
+        row_tag_ids = [[real_id(tag_id) for tag_id in tag_ids] for tag_ids in row_tag_ids]
+        return row_tag_ids, [(tag_id,) for tag_id in reserved], new_tag_names
+
+
+def parse_tags(row: dict) -> List[Tuple[Tuple[str, str], ...]]:
+    columns = [row[f"tag_{lang}"].split("|") for lang in LANGS]
+    tags = []
+    for names in zip(*columns):
+        pairs = tuple((lang, name.strip()) for lang, name in zip(LANGS, names) if name.strip())
+        if pairs:
+            tags.append(pairs)
+    return tags
+
+
+def load_companies(conn, company_ids: List[int], chunk: List[dict], row_tag_ids: List[List[int]]):
+    companies = []
+    company_names = []
+    company_tags = []
+    for company_id, row, tag_ids in zip(company_ids, chunk, row_tag_ids):
+        companies.append((company_id,))
+        for lang in LANGS:
+            name = row[f"company_{lang}"].strip()
+            if name:
+                company_names.append((company_id, lang, name, fold(name), chosung(name)))
+        for tag_id in dict.fromkeys(tag_ids):
+            company_tags.append((company_id, tag_id))
+
+    with conn.cursor() as cur:
+        copy_rows(cur, "companies", ("id",), companies)
+        copy_rows(cur, "company_names", COMPANY_NAME_COLUMNS, company_names)
+        copy_rows(cur, "company_tags", ("company_id", "tag_id"), company_tags)
+    conn.commit()
+
+
+class Progress:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.companies = 0
+        self.chunks = 0
+        self._lock = threading.Lock()
+
+    def chunk_done(self, companies: int):
+        with self._lock:
+            self.companies += companies
+            self.chunks += 1
+            elapsed = time.perf_counter() - self.started
+            print(
+                f"chunk {self.chunks}: {self.companies:,} companies, "
+                f"{self.companies / elapsed:,.0f} rows/s, {elapsed:.1f}s",
+                file=sys.stderr,
+                flush=True,
+            )
+
+
+def load(csv_path: Path, chunk_size: int = 50_000, workers: int = 1, rebuild_read_model: bool = True) -> int:
+    conn = connect()
+    progress = Progress()
+    with conn.cursor() as cur:
+        tags = TagResolver(cur)
+
+    local = threading.local()
+    worker_conns = []
+
+    def worker_conn():
+        if not hasattr(local, "conn"):
+            local.conn = connect()
+            worker_conns.append(local.conn)
+        return local.conn
+
+    def load_chunk(company_ids, chunk, row_tag_ids):
+        load_companies(worker_conn(), company_ids, chunk, row_tag_ids)
+        progress.chunk_done(len(chunk))
+
+    # 동시에 메모리에 올라가는 chunk 수를 workers * 2 로 제한
+    in_flight = threading.BoundedSemaphore(workers * 2)
+    futures = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in read_chunks(csv_path, chunk_size):
+                with conn.cursor() as cur:
+                    row_tag_ids, new_tags, new_tag_names = tags.resolve(cur, chunk)
+                    copy_rows(cur, "tags", ("id",), new_tags)
+                    copy_rows(cur, "tag_names", TAG_NAME_COLUMNS, new_tag_names)
+                    company_ids = reserve_ids(cur, "companies", len(chunk))
+                conn.commit()
+
+                if workers == 1:
+                    load_companies(conn, company_ids, chunk, row_tag_ids)
+                    progress.chunk_done(len(chunk))
+                    continue
+
+                in_flight.acquire()
+                future = executor.submit(load_chunk, company_ids, chunk, row_tag_ids)
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+                # 실패한 chunk 가 있으면 바로 중단
+                for done in [f for f in futures if f.done()]:
+                    done.result()
+                futures = [f for f in futures if not f.done()]
+        for future in futures:
+            future.result()
+        # 새 회사가 생겼으므로 목록 응답 ETag 가 바뀌도록 카탈로그 버전 증가 (crud.bump_catalog_version 과 같은 SQL).
+        # catalog_changes 에는 기록하지 않으므로 알림을 받은 replica 는 버전 공백을 보고 캐시 / 인덱스를 다시 만든다
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO catalog_version (id, version) VALUES (1, 1) "
+                "ON CONFLICT (id) DO UPDATE SET version = catalog_version.version + 1 RETURNING version"
+            )
+            version = cur.fetchone()[0]
+            cur.execute("SELECT pg_notify('catalog_changes', %s)", (json.dumps({"version": version}),))
+        conn.commit()
+    finally:
+        conn.close()
+        for worker in worker_conns:
+            worker.close()
+
+    if rebuild_read_model:
+        from app.scripts.rebuild_read_model import rebuild
+
+        rebuild()
+    return progress.companies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--skip-read-model", action="store_true", help="company_read_model 재생성 생략")
+    args = parser.parse_args()
+
+    total = load(args.csv_path, args.chunk_size, args.workers, rebuild_read_model=not args.skip_read_model)
+    print(f"{total:,} companies loaded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+벤치마크용 합성 카탈로그 CSV 생성 (company_tag_sample.csv 와 같은 형식)
+
+    python app/scripts/generate_catalog.py --companies 10000 --out /tmp/catalog_10k.csv
+    python app/scripts/generate_catalog.py --companies 1000000 --out /tmp/catalog_1m.csv --load
+
+- 같은 --companies / --seed 면 항상 같은 CSV 가 나오므로 커밋 간 결과 비교가 가능
+- 회사명은 ko 는 항상, en / ja 는 일부만 (샘플과 같이 빈 칸 허용). 모든 이름은 API path 제한(20자) 이내
+- 태그는 태그_N / tag_N / タグ_N 형태로 회사 수 / 100 개 (최소 50), 회사당 1~5개이며 앞 번호일수록 자주 쓰임 (1/N 분포)
+- --load 는 생성 후 bulk_load.load 로 현재 DB(POSTGRES_* 환경변수)에 적재
+"""
+import argparse
+import csv
+import itertools
+import random
+import sys
+from pathlib import Path
+
+KO_SYLLABLES = "가나다라마바사아자차카타파하원티드랩크링스피제약앱스마케팅코리아"
+JA_SYLLABLES = "アイウエオカキクケコサシスセソタチツテトナニヌネノマミムメモラリルレロ"
+EN_WORDS = ["lab", "soft", "corp", "tech", "data", "cloud", "line", "fresh", "mobile", "ai"]
+
+FIELDS = ["company_ko", "company_en", "company_ja", "tag_ko", "tag_en", "tag_ja"]
+
+
+def generate_rows(companies: int, seed: int = 42):
+    rnd = random.Random(seed)
+    tag_count = max(50, companies // 100)
+    tag_weights = list(itertools.accumulate(1 / n for n in range(1, tag_count + 1)))
+
+    for company_id in range(1, companies + 1):
+        ko = "".join(rnd.choice(KO_SYLLABLES) for _ in range(rnd.randint(2, 6)))
+        en = " ".join(rnd.choice(EN_WORDS) for _ in range(rnd.randint(1, 2))).title()[:12]
+        ja = "".join(rnd.choice(JA_SYLLABLES) for _ in range(rnd.randint(2, 6)))
+        tags = sorted(set(rnd.choices(range(1, tag_count + 1), cum_weights=tag_weights, k=rnd.randint(1, 5))))
+        yield {
+            "company_ko": f"{ko} {company_id}",
+            "company_en": f"{en} {company_id}" if rnd.random() < 0.7 else "",
+            "company_ja": f"{ja} {company_id}" if rnd.random() < 0.3 else "",
+            "tag_ko": "|".join(f"태그_{n}" for n in tags),
+            "tag_en": "|".join(f"tag_{n}" for n in tags),
+            "tag_ja": "|".join(f"タグ_{n}" for n in tags),
+        }
+
+
+def write_catalog(path: Path, companies: int, seed: int = 42):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(generate_rows(companies, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--load", action="store_true", help="생성 후 현재 DB 에 COPY 로 적재")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    write_catalog(args.out, args.companies, args.seed)
+    print(f"{args.companies:,} companies -> {args.out}", file=sys.stderr)
+
+    if args.load:
+        from app.scripts.bulk_load import load
+
+        total = load(args.out, workers=args.workers)
+        print(f"{total:,} companies loaded")
+
+
+if __name__ == "__main__":
+    main()
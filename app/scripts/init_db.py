@@ -1,12 +1,186 @@
 # import asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
 from app.database import Base, engine
 from app.models import company
 from app.database import Base
+from app.utils.search_key import search_columns
+
+SEARCH_KEY_TABLES = ("company_names",)
+# 이전 버전이 만들었지만 쓰는 조회가 없는 인덱스 / 컬럼 (/search 는 LIKE '%key%' 라 btree text_pattern_ops 를 못 씀,
+# tag_names 의 검색 키는 조회하지 않음). 쓰기마다 갱신 비용만 들므로 기존 DB 에서 삭제
+UNUSED_INDEXES = (
+    "ix_company_names_search_key", "ix_company_names_search_chosung",
+    "ix_tag_names_search_key", "ix_tag_names_search_chosung",
+)
+UNUSED_COLUMNS = (("tag_names", "search_key"), ("tag_names", "search_chosung"))
+
+def create_trigram_index(conn) -> bool:
+    """
+    pg_trgm 확장과 회사명 trigram GIN 인덱스 생성 (/search 의 ILIKE 와 ranked=true 유사도 검색이 사용).
+    서버에 pg_trgm 이 없거나 권한이 없으면 건너뛰고, 앱은 in-process trigram 점수 계산으로 동작한다.
+    """
+    if not conn.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first():
+        print("pg_trgm 확장을 사용할 수 없어 trigram 인덱스를 건너뜁니다.")
+        return False
+    try:
+        with conn.begin_nested():
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_company_name_trgm ON company_names USING gin (name gin_trgm_ops)"
+            ))
+            # /search 의 LIKE '%key%' (정규화 검색 키 / 초성)
+            for column in ("search_key", "search_chosung"):
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS idx_company_{column}_trgm "
+                    f"ON company_names USING gin ({column} gin_trgm_ops)"
+                ))
+            # READ_MODE=read_model 의 /search 는 company_read_model.search_key 를 LIKE '%key%' 로 비교
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_company_read_model_search_key_trgm "
+                "ON company_read_model USING gin (search_key gin_trgm_ops)"
+            ))
+    except DBAPIError as e:
+        print(f"trigram 인덱스를 만들지 못했습니다: {e.orig}")
+        return False
+    return True
+
+
+def backfill_search_keys(conn, batch_size: int = 10_000) -> int:
+    """검색 키 컬럼이 추가되기 전에 들어간 이름 행의 search_key / search_chosung 을 채움 (이미 채워진 행은 건너뜀)"""
+    updated = 0
+    for table in SEARCH_KEY_TABLES:
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    f"SELECT id, name FROM {table} WHERE id > :last_id AND search_key = '' AND name <> '' "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                text(f"UPDATE {table} SET search_key = :search_key, search_chosung = :search_chosung WHERE id = :id"),
+                [{"id": row_id, **search_columns(name)} for row_id, name in rows],
+            )
+            updated += len(rows)
+            last_id = rows[-1][0]
+    return updated
+
+
+def lowercase_languages(conn) -> int:
+    """
+    대소문자가 섞인 언어 코드 ("zh-TW") 를 저장 형태인 소문자로 바꿈 (이전 버전은 요청 본문의 키를 그대로 저장).
+    같은 회사 / 태그에 소문자로 겹치는 언어가 이미 있으면 소문자 행(없으면 id 가 가장 작은 행)만 남긴다.
+    태그는 소문자로 바꾸면서 다른 태그와 (language, name) 이 겹칠 수 있으므로 uix_tag_name_lang_name 을 잠시 지우고,
+    뒤이은 dedupe_tag_names 가 그런 태그를 합친 뒤 인덱스를 다시 만든다. 영향받는 회사의 version 을 올리고 바꾼 행 수를 반환
+    """
+    changed = 0
+    for table, owner in (("company_names", "company_id"), ("tag_names", "tag_id")):
+        if not conn.execute(text(f"SELECT 1 FROM {table} WHERE language <> lower(language) LIMIT 1")).first():
+            continue
+        if table == "company_names":
+            conn.execute(text(
+                "UPDATE companies SET version = version + 1 "
+                "WHERE id IN (SELECT company_id FROM company_names WHERE language <> lower(language))"
+            ))
+        else:
+            conn.execute(text(
+                "UPDATE companies SET version = version + 1 WHERE id IN ("
+                "SELECT company_id FROM company_tags WHERE tag_id IN "
+                "(SELECT tag_id FROM tag_names WHERE language <> lower(language)))"
+            ))
+            conn.execute(text("DROP INDEX IF EXISTS uix_tag_name_lang_name"))
+        conn.execute(text(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.{owner} = b.{owner} AND a.id <> b.id AND a.language <> lower(a.language) "
+            "AND lower(a.language) = lower(b.language) AND (b.language = lower(b.language) OR b.id < a.id)"
+        ))
+        changed += conn.execute(text(
+            f"UPDATE {table} SET language = lower(language) WHERE language <> lower(language)"
+        )).rowcount
+    return changed
+
+
+def dedupe_tag_names(conn) -> int:
+    """
+    uix_tag_name_lang_name (language, name) 유니크 인덱스를 만들기 전에 같은 (language, name) 을 가진 태그들을 합침.
+    (language, name) 을 공유하는 태그끼리 묶어 가장 작은 tag_id 로 company_tags 를 옮기고, 남는 태그가 없는 언어의
+    이름은 옮기며 나머지 태그는 삭제한다. 영향받는 회사의 version 을 올리고 합친 태그 수를 반환
+    """
+    groups = conn.execute(text(
+        "SELECT array_agg(tag_id ORDER BY tag_id) FROM tag_names GROUP BY language, name HAVING count(*) > 1"
+    )).scalars().all()
+    if not groups:
+        return 0
+
+    # 여러 (language, name) 으로 이어진 태그도 한 태그로 모이도록 union-find
+    survivor_of = {}
+
+    def find(tag_id):
+        while survivor_of.get(tag_id, tag_id) != tag_id:
+            tag_id = survivor_of[tag_id]
+        return tag_id
+
+    for tag_ids in groups:
+        roots = sorted({find(tag_id) for tag_id in tag_ids})
+        for root in roots[1:]:
+            survivor_of[root] = roots[0]
+
+    merged = 0
+    for tag_id in sorted(survivor_of):
+        survivor = find(tag_id)
+        params = {"tag_id": tag_id, "survivor": survivor}
+        conn.execute(text(
+            "UPDATE companies SET version = version + 1 "
+            "WHERE id IN (SELECT company_id FROM company_tags WHERE tag_id = :tag_id)"
+        ), params)
+        conn.execute(text(
+            "INSERT INTO company_tags (company_id, tag_id) "
+            "SELECT company_id, :survivor FROM company_tags WHERE tag_id = :tag_id ON CONFLICT DO NOTHING"
+        ), params)
+        conn.execute(text(
+            "UPDATE tag_names SET tag_id = :survivor WHERE tag_id = :tag_id "
+            "AND language NOT IN (SELECT language FROM tag_names WHERE tag_id = :survivor)"
+        ), params)
+        # 남은 tag_names / company_tags 는 FK ON DELETE CASCADE 로 삭제
+        conn.execute(text("DELETE FROM tags WHERE id = :tag_id"), params)
+        merged += 1
+    return merged
+
 
 def init_models():
     with engine.begin() as conn:
         # conn.run_sync(Base.metadata.create_all)
         Base.metadata.create_all(bind=conn)
+        # 기존 companies 테이블에 ETag 용 version 컬럼 추가
+        conn.execute(text("ALTER TABLE companies ADD COLUMN IF NOT EXISTS version bigint NOT NULL DEFAULT 1"))
+        # 기존 이름 테이블에 정규화 검색 키 컬럼 추가
+        for table in SEARCH_KEY_TABLES:
+            for column in ("search_key", "search_chosung"):
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} varchar NOT NULL DEFAULT ''"))
+        for index_name in UNUSED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        for table, column in UNUSED_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {column}"))
+        lowered = lowercase_languages(conn)
+        if lowered:
+            print(f"언어 코드 {lowered:,} 행을 소문자로 바꿨습니다. READ_MODE=read_model 이면 rebuild_read_model.py 를 실행하세요.")
+        # 이미 있던 tag_names 에 중복 (language, name) 이 있으면 유니크 인덱스 생성이 실패하므로 먼저 합침
+        merged = dedupe_tag_names(conn)
+        if merged:
+            print(f"이름이 중복된 태그 {merged:,} 개를 합쳤습니다. READ_MODE=read_model 이면 rebuild_read_model.py 를 실행하세요.")
+        # 이미 있던 테이블에는 create_all 이 인덱스를 만들지 않으므로 모델에 추가된 인덱스를 따로 생성
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        create_trigram_index(conn)
+        backfilled = backfill_search_keys(conn)
+        if backfilled:
+            print(f"검색 키 {backfilled:,} 행을 채웠습니다. READ_MODE=read_model 이면 rebuild_read_model.py 를 실행하세요.")
 
 if __name__ == "__main__":
     # asyncio.run(init_models())
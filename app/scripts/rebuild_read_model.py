@@ -0,0 +1,37 @@
+"""
+company_read_model 전체 재생성 (백필 / READ_MODEL_LANGUAGES 변경 후)
+
+    python app/scripts/rebuild_read_model.py --batch-size 50000
+
+company_id 구간마다 upsert 후 commit 하므로 실행 중에도 API 는 기존 행으로 응답한다.
+"""
+import argparse
+import sys
+import time
+
+from app.crud import company as crud
+from app.database import SessionLocal
+
+
+def rebuild(batch_size: int = 50_000) -> int:
+    started = time.perf_counter()
+
+    def progress(done: int, total: int):
+        print(f"read model: {done:,}/{total:,} companies, {time.perf_counter() - started:.1f}s",
+              file=sys.stderr, flush=True)
+
+    with SessionLocal() as db:
+        return crud.rebuild_read_model(db, batch_size, progress)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    total = rebuild(args.batch_size)
+    print(f"{total:,} companies rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import time
+
+from app.utils.cache import MISSING, LRUCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(max_entries=2, max_bytes=1024 * 1024, ttl=60)
+    cache.set(("a", "ko"), {"company_name": "a"})
+    cache.set(("b", "ko"), {"company_name": "b"})
+    assert cache.get(("a", "ko")) == {"company_name": "a"}
+
+    cache.set(("c", "ko"), {"company_name": "c"})
+
+    assert cache.get(("b", "ko")) is MISSING
+    assert cache.get(("a", "ko")) == {"company_name": "a"}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_memory_limit_and_ttl():
+    cache = LRUCache(max_entries=100, max_bytes=1024, ttl=0.01)
+    cache.set("big", "x" * 2048)
+    assert cache.get("big") is MISSING
+
+    cache.set("small", "x")
+    time.sleep(0.02)
+    assert cache.get("small") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_removes_only_tagged_entries():
+    cache = LRUCache(max_entries=100, max_bytes=1024 * 1024, ttl=60)
+    cache.set(("원티드랩", "ko"), 1, tags=[("company", 1), ("tag", 4)])
+    cache.set(("Wantedlab", "en"), 1, tags=[("company", 1), ("tag", 4)])
+    cache.set(("code post", "ko"), 2, tags=[("company", 2), ("tag", 4)])
+
+    assert cache.invalidate([("company", 1)]) == 2
+    assert cache.get(("code post", "ko")) == 2
+    assert cache.invalidate([("tag", 4)]) == 1
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_set_skipped_when_invalidated_after_read_started():
+    cache = LRUCache(max_entries=100, max_bytes=1024 * 1024, ttl=60)
+    # 읽기 시작 -> (다른 요청의 쓰기 commit) 무효화 -> 이전 값으로 set
+    generation = cache.generation
+    cache.invalidate([("company", 1)])
+    cache.set(("원티드랩", "ko"), {"tags": ["old"]}, tags=[("company", 1)], generation=generation)
+    assert cache.get(("원티드랩", "ko")) is MISSING
+    assert cache.stats()["stale_sets"] == 1
+
+    generation = cache.generation
+    cache.set(("원티드랩", "ko"), {"tags": ["new"]}, tags=[("company", 1)], generation=generation)
+    assert cache.get(("원티드랩", "ko")) == {"tags": ["new"]}
+
+    generation = cache.generation
+    cache.clear()
+    cache.set(("원티드랩", "ko"), {"tags": ["old"]}, generation=generation)
+    assert len(cache) == 0
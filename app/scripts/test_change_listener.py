@@ -0,0 +1,44 @@
+import threading
+import time
+
+import psycopg2
+
+from app.database import DATABASE_URL
+from app.utils.change_listener import ChangeListener
+
+
+def test_listener_calls_on_change_for_notify_and_reconnect():
+    calls = []
+    changed = threading.Event()
+
+    def on_change():
+        calls.append(1)
+        changed.set()
+
+    listener = ChangeListener(DATABASE_URL, "test_change_listener", on_change, poll_interval=60, retry_interval=0.05)
+    listener.start()
+    try:
+        # 연결 직후 한 번 (놓친 변경 따라잡기)
+        assert changed.wait(5)
+        changed.clear()
+
+        conn = psycopg2.connect(DATABASE_URL)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("NOTIFY test_change_listener, '{\"version\": 1}'")
+            assert changed.wait(5)
+            assert listener.notifications == 1
+            changed.clear()
+
+            # 커넥션이 끊기면 다시 연결하고 replay
+            calls.clear()
+            cur.execute("SELECT pg_terminate_backend(%s)", (listener.backend_pid,))
+        conn.close()
+        deadline = time.monotonic() + 5
+        while listener.connects < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert listener.connects == 2 and listener.errors == 1
+        assert changed.wait(5) and calls
+    finally:
+        listener.stop()
+    assert not listener.connected.is_set()
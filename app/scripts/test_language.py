@@ -0,0 +1,28 @@
+from app.utils.language import DEFAULT_LANGUAGES, as_languages, parse_languages, preferred_languages
+
+
+def test_parse_orders_by_q_value():
+    assert parse_languages("en;q=0.5, ja, ko;q=0.8") == ("ja", "ko", "en")
+    # q 가 같으면 입력 순서
+    assert parse_languages("en;q=0.5, ja;q=0.5") == ("en", "ja")
+
+
+def test_parse_adds_primary_language_and_skips_unusable_ranges():
+    assert parse_languages("ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7") == ("ko-kr", "ko", "en-us", "en")
+    assert parse_languages("ja;q=0, *;q=0.1, en;q=abc, tw") == ("tw",)
+    assert parse_languages(" , ;q=1") == ()
+
+
+def test_parse_is_memoized():
+    parse_languages.cache_clear()
+    parse_languages("ja, en;q=0.8")
+    parse_languages("ja, en;q=0.8")
+    assert parse_languages.cache_info().hits == 1
+
+
+def test_preferred_languages_header_precedence():
+    assert preferred_languages("en", "ja") == ("en",)
+    assert preferred_languages(None, "ja-JP") == ("ja-jp", "ja")
+    assert preferred_languages(None, None) == DEFAULT_LANGUAGES
+    assert preferred_languages("*", None) == DEFAULT_LANGUAGES
+    assert as_languages("ko") == ("ko",)
@@ -0,0 +1,41 @@
+from app.utils.metrics import Histogram
+
+
+def test_histogram_renders_cumulative_buckets_per_label_set():
+    histogram = Histogram("db_queries", "queries per request", (1, 5))
+    histogram.observe(1, route="/search")
+    histogram.observe(3, route="/search")
+    histogram.observe(8, route="/search")
+    histogram.observe(2, route="/tags")
+
+    lines = histogram.render()
+
+    assert lines[:2] == ["# HELP db_queries queries per request", "# TYPE db_queries histogram"]
+    assert 'db_queries_bucket{route="/search",le="1"} 1' in lines
+    assert 'db_queries_bucket{route="/search",le="5"} 2' in lines
+    assert 'db_queries_bucket{route="/search",le="+Inf"} 3' in lines
+    assert 'db_queries_sum{route="/search"} 12.000000' in lines
+    assert 'db_queries_count{route="/search"} 3' in lines
+    assert 'db_queries_count{route="/tags"} 1' in lines
+
+
+def test_pool_checkout_wait_and_saturation():
+    import pytest
+    from sqlalchemy import create_engine, exc
+
+    from app.database import DATABASE_URL
+    from app.utils.pool import InstrumentedQueuePool, checkout_timeouts, pool_stats
+
+    engine = create_engine(
+        DATABASE_URL, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+        pool_logging_name="test_pool",
+    )
+    try:
+        with engine.connect():
+            assert pool_stats(engine.pool)["saturation"] == 1.0
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        assert checkout_timeouts.value(pool="test_pool") == 1
+        assert pool_stats(engine.pool)["checked_out"] == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,48 @@
+from app.utils.ngram_index import NgramIndex
+
+
+def build_index():
+    index = NgramIndex()
+    index.build([
+        (1, 1, "ko", "원티드랩"),
+        (2, 1, "en", "Wantedlab"),
+        (3, 2, "ko", "주식회사 링크드코리아"),
+        (4, 3, "en", "OKAY.com"),
+        (5, 4, "ko", "스피링크"),
+    ])
+    return index
+
+
+def test_search_matches_substring_with_language_fallback():
+    index = build_index()
+
+    assert index.search("링크", "ko") == [(2, "주식회사 링크드코리아"), (4, "스피링크")]
+    assert index.search("want", "en") == [(1, "Wantedlab")]
+    assert index.search("want", "ja") == [(1, "원티드랩")]
+    assert index.search("okay", "ko") == [(3, "OKAY.com")]
+    assert index.search("크", "ko") == [(2, "주식회사 링크드코리아"), (4, "스피링크")]
+    assert index.search("없는회사", "ko") == []
+
+
+def test_search_pages_by_company_id():
+    index = build_index()
+
+    assert index.search("크", "ko", limit=1) == [(2, "주식회사 링크드코리아")]
+    assert index.search("크", "ko", limit=1, after=2) == [(4, "스피링크")]
+    assert index.search("크", "ko", after=4) == []
+
+
+def test_search_defers_like_wildcards_to_database():
+    index = build_index()
+
+    assert index.search("태그_1", "ko") is None
+    assert NgramIndex().search("링크", "ko") is None
+
+
+def test_add_updates_index_incrementally():
+    index = build_index()
+    index.add([(6, 5, "ko", "라인 프레쉬"), (7, 5, "tw", "LINE FRESH")])
+
+    assert index.search("fresh", "tw") == [(5, "LINE FRESH")]
+    assert index.search("프레", "tw") == [(5, "LINE FRESH")]
+    assert index.search("프레", "en") == [(5, "라인 프레쉬")]
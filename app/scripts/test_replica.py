@@ -0,0 +1,46 @@
+from app.utils.replica import CAUGHT_UP, UNKNOWN, ReplicaSet, format_lsn, parse_lsn, read_routes
+
+
+def test_lsn_round_trip():
+    assert parse_lsn("16/B374D848") == (0x16 << 32) + 0xB374D848
+    assert format_lsn(parse_lsn("16/B374D848")) == "16/B374D848"
+    assert parse_lsn(None) is None
+    assert parse_lsn("") is None
+    assert parse_lsn("B374D848") is None
+    assert parse_lsn("zz/1") is None
+
+
+def test_route_follows_token_and_probe_interval():
+    replicas = ReplicaSet(probe_interval=60)
+    assert not replicas.enabled
+    replicas.configure([object, object])
+    assert [replicas.pick() for _ in range(3)] == [0, 1, 0]
+
+    # 확인 전에는 primary 로
+    assert replicas.observed[0] == UNKNOWN
+    assert not replicas.route(0, None)
+    assert replicas.needs_probe(1, 0)
+
+    before = read_routes.value(target="primary", reason="lagging")
+    replicas.observe(0, 100)
+    assert replicas.route(0, None)
+    assert replicas.route(0, 100)
+    assert not replicas.route(0, 101)
+    assert read_routes.value(target="primary", reason="lagging") == before + 1
+
+    # 뒤처져 보일 때만, probe_interval 에 한 번 확인
+    assert not replicas.needs_probe(0, 100)
+    assert replicas.needs_probe(0, 101)
+    assert not replicas.needs_probe(0, 101)
+    # 확인한 위치는 줄어들지 않음. standby 가 아니면 (NULL) 항상 최신
+    replicas.observe(0, 50)
+    assert replicas.observed[0] == 100
+    replicas.observe(1, None)
+    assert replicas.observed[1] == CAUGHT_UP
+    # 연결이 끊기면 다시 확인될 때까지 사용하지 않음
+    replicas.mark_down(1)
+    assert not replicas.route(1, None)
+
+    replicas.note_write(200)
+    replicas.note_write(150)
+    assert replicas.last_write_lsn == 200
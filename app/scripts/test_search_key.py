@@ -0,0 +1,21 @@
+from app.utils.search_key import chosung, fold, is_chosung_query, query_key, search_columns
+
+
+def test_fold_normalizes_width_case_and_kana():
+    assert fold("ＷａｎｔｅｄＬａｂ") == "wantedlab"
+    assert fold("ｳｫﾝﾃｯﾄﾞ") == fold("ウォンテッド") == "うぉんてっど"
+    assert fold("원티드랩") == "원티드랩"
+
+
+def test_chosung_maps_hangul_syllables_only():
+    assert chosung("원티드랩") == "ㅇㅌㄷㄹ"
+    assert chosung("쌍용 C&C") == "ㅆㅇ c&c"
+    assert search_columns("원티드 Lab") == {"search_key": "원티드 lab", "search_chosung": "ㅇㅌㄷ lab"}
+
+
+def test_query_key_picks_column():
+    assert is_chosung_query("ㅇㅌ ㄷ")
+    assert not is_chosung_query("원ㅌ")
+    assert not is_chosung_query(" ")
+    assert query_key("ㅇㅌㄷ") == ("search_chosung", "ㅇㅌㄷ")
+    assert query_key("Ｌｉｎｋ") == ("search_key", "link")
@@ -1,4 +1,5 @@
 import pytest
+import base64
 import json
 from fastapi.testclient import TestClient
 
@@ -9,7 +10,21 @@ from app.main import app
 # json.loads(resp.data.decode("utf-8")) -> resp.json()으로 변경
 @pytest.fixture
 def api():
-    return TestClient(app)
+    with TestClient(app) as client:
+        wait_ready(client)
+        yield client
+
+
+def wait_ready(client, timeout=10.0):
+    # warm-up 은 백그라운드에서 실행되므로 끝날 때까지 /readyz 를 확인
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = client.get("/readyz")
+        if resp.status_code == 200 or time.monotonic() > deadline:
+            return resp
+        time.sleep(0.02)
 
 
 def test_company_name_autocomplete(api):
@@ -28,6 +43,28 @@ def test_company_name_autocomplete(api):
     ]
 
 
+def test_search_pagination(api):
+    resp = api.get("/search?query=링크&limit=1", headers=[("x-wanted-language", "ko")])
+    assert resp.json() == [{"company_name": "주식회사 링크드코리아"}]
+    cursor = resp.headers["x-next-cursor"]
+
+    resp = api.get(f"/search?query=링크&limit=1&cursor={cursor}", headers=[("x-wanted-language", "ko")])
+    assert resp.json() == [{"company_name": "스피링크"}]
+    assert "x-next-cursor" not in resp.headers
+
+    resp = api.get("/tags?tag_name=タグ_22&limit=3", headers=[("x-wanted-language", "ko")])
+    first = [company["company_name"] for company in resp.json()]
+    resp = api.get(
+        f"/tags?tag_name=タグ_22&limit=3&cursor={resp.headers['x-next-cursor']}",
+        headers=[("x-wanted-language", "ko")],
+    )
+    second = [company["company_name"] for company in resp.json()]
+    assert first + second == ["딤딤섬 대구점", "마이셀럽스", "Rejoice Pregnancy", "삼일제약", "투게더앱스"]
+
+    assert api.get("/search?query=링크&cursor=invalid").status_code == 400
+    assert api.get("/search?query=링크&limit=0").status_code == 422
+
+
 def test_company_search(api):
     """
     2. 회사 이름으로 회사 검색
@@ -186,3 +223,689 @@ def test_delete_tag(api):
             "tag_50",
         ],
     }
+
+
+def test_create_company_rejects_empty_names(api):
+    import pytest
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal
+
+    for body in (
+        {"company_name": {"ko": "빈태그회사"}, "tags": [{"tag_name": {}}]},
+        {"company_name": {"ko": "빈태그회사"}, "tags": [{"tag_name": {}}, {"tag_name": {"ko": "태그_1"}}]},
+        {"company_name": {"ko": " "}, "tags": []},
+    ):
+        resp = api.post("/companies", json=body)
+        assert resp.status_code == 400, body
+    assert api.get("/companies/빈태그회사").status_code == 404
+
+    with SessionLocal() as db, pytest.raises(ValueError):
+        crud_sync.get_or_create_tags(db, [{}, {"ko": "태그_1"}])
+
+
+def test_language_codes_stored_lowercase(api):
+    from sqlalchemy import select, text
+    from app.database import SessionLocal, engine
+    from app.models.company import CompanyName, TagName
+    from app.scripts.init_db import lowercase_languages
+
+    resp = api.post(
+        "/companies",
+        json={"company_name": {"ko": "번체회사", "zh-TW": "繁體公司"}, "tags": [{"tag_name": {"zh-TW": "標籤_1"}}]},
+        headers=[("x-wanted-language", "zh-TW")],
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"company_name": "繁體公司", "tags": ["標籤_1"]}
+    with SessionLocal() as db:
+        assert db.scalar(select(CompanyName.language).where(CompanyName.name == "繁體公司")) == "zh-tw"
+        assert db.scalar(select(TagName.language).where(TagName.name == "標籤_1")) == "zh-tw"
+    resp = api.get("/companies/번체회사", headers=[("accept-language", "zh-TW, ko;q=0.5")])
+    assert resp.json()["company_name"] == "繁體公司"
+
+    # 소문자로 겹치는 언어는 400
+    resp = api.post("/companies", json={"company_name": {"en": "dup", "EN": "dup2"}, "tags": []})
+    assert resp.status_code == 400
+    resp = api.post("/companies", json={"company_name": {"ko": "중복언어태그"}, "tags": [{"tag_name": {"ja": "a", "JA": "b"}}]})
+    assert resp.status_code == 400
+
+    # 이전 버전이 저장한 대소문자 섞인 언어 코드는 init_db 가 소문자로 바꿈 (겹치면 소문자 행을 남김)
+    with engine.connect() as conn, conn.begin() as transaction:
+        company_id = conn.scalar(text("SELECT company_id FROM company_names WHERE name = '번체회사'"))
+        conn.execute(text(
+            "INSERT INTO company_names (company_id, language, name) "
+            "VALUES (:id, 'zh-TW', '舊名'), (:id, 'JA', 'カイシャ')"
+        ), {"id": company_id})
+        assert lowercase_languages(conn) == 1
+        rows = conn.execute(text(
+            "SELECT language, name FROM company_names WHERE company_id = :id ORDER BY language"
+        ), {"id": company_id}).all()
+        assert [tuple(row) for row in rows] == [("ja", "カイシャ"), ("ko", "번체회사"), ("zh-tw", "繁體公司")]
+        transaction.rollback()
+
+
+def test_bulk_create_companies(api):
+    """
+    7.  회사 일괄 추가
+    항목별 결과가 입력 순서대로 반환되어야 합니다.
+    유효하지 않은 항목은 나머지 항목의 생성을 막지 않아야 합니다.
+    """
+    resp = api.post(
+        "/companies/bulk?include_company=true",
+        json=[
+            {
+                "company_name": {"ko": "벌크회사", "en": "BulkCompany"},
+                "tags": [
+                    {"tag_name": {"ko": "태그_1", "en": "tag_1", "ja": "タグ_1"}},
+                    {"tag_name": {"ko": "태그_90", "en": "tag_90", "ja": "タグ_90"}},
+                ],
+            },
+            {"company_name": {"ko": " "}, "tags": []},
+        ],
+        headers=[("x-wanted-language", "en")],
+    )
+
+    result = resp.json()
+    assert resp.status_code == 200
+    assert result["created"] == 1
+    assert [item["status"] for item in result["items"]] == ["created", "invalid"]
+    assert result["items"][0]["company"] == {
+        "company_name": "BulkCompany",
+        "tags": ["tag_1", "tag_90"],
+    }
+
+    resp = api.get("/companies/벌크회사", headers=[("x-wanted-language", "ko")])
+    assert resp.json() == {"company_name": "벌크회사", "tags": ["태그_90", "태그_1"]}
+
+
+def test_bulk_create_reads_created_companies_at_once(api):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    def create(count, prefix):
+        statements = []
+        count_statement = lambda *args: statements.append(args[2])
+        body = [
+            {
+                "company_name": {"ko": f"{prefix}_{i}"},
+                # 같은 태그를 언어 순서만 바꿔 보내도 한 태그
+                "tags": [{"tag_name": {"ko": "태그_91", "en": "tag_91"} if i % 2 else {"en": "tag_91", "ko": "태그_91"}}],
+            }
+            for i in range(count)
+        ]
+        event.listen(Engine, "before_cursor_execute", count_statement)
+        try:
+            resp = api.post("/companies/bulk?include_company=true", json=body)
+        finally:
+            event.remove(Engine, "before_cursor_execute", count_statement)
+        assert resp.status_code == 200
+        assert [item["company"] for item in resp.json()["items"]] == [
+            {"company_name": f"{prefix}_{i}", "tags": ["태그_91"]} for i in range(count)
+        ]
+        return len(statements)
+
+    # 태그를 먼저 만들어 두고, 응답에 넣을 회사 조회 횟수가 회사 수와 무관한지 비교
+    create(1, "벌크조회준비")
+    assert create(2, "벌크조회") == create(6, "벌크조회많이")
+
+
+def test_lookup_companies(api):
+    """
+    8.  회사명 목록으로 회사 일괄 조회
+    없는 회사는 전체 요청을 실패시키지 않고 항목별로 not_found 로 표시되어야 합니다.
+    """
+    # 다른 테스트가 만들거나 바꾼 회사에 기대지 않도록 조회할 회사를 직접 생성
+    for company in (
+        {
+            "company_name": {"ko": "조회회사", "en": "LookupCompany"},
+            "tags": [
+                {"tag_name": {"ko": "태그_1", "en": "tag_1", "ja": "タグ_1"}},
+                {"tag_name": {"ko": "태그_90", "en": "tag_90", "ja": "タグ_90"}},
+            ],
+        },
+        {"company_name": {"ko": "조회회사_영문", "en": "LookupCompanyEn"}, "tags": []},
+    ):
+        assert api.post("/companies", json=company).status_code == 200
+
+    resp = api.post(
+        "/companies/lookup",
+        json={"names": ["LookupCompanyEn", "없는회사", "조회회사"]},
+        headers=[("x-wanted-language", "en")],
+    )
+
+    result = resp.json()
+    assert resp.status_code == 200
+    assert result["items"] == [
+        {
+            "name": "LookupCompanyEn",
+            "status": "found",
+            "company": {"company_name": "LookupCompanyEn", "tags": []},
+        },
+        {"name": "없는회사", "status": "not_found", "company": None},
+        {
+            "name": "조회회사",
+            "status": "found",
+            "company": {"company_name": "LookupCompany", "tags": ["tag_90", "tag_1"]},
+        },
+    ]
+
+
+def test_export_companies(api):
+    resp = api.get("/export?tag_name=タグ_22&lang=ko")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [row["company_name"] for row in rows] == [
+        {"ko": "딤딤섬 대구점"},
+        {"ko": "마이셀럽스"},
+        {},
+        {"ko": "삼일제약"},
+        {"ko": "투게더앱스"},
+    ]
+    assert {"tag_name": {"ko": "태그_22"}} in rows[0]["tags"]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+
+def test_export_closes_cursor_when_stream_is_closed(api):
+    from sqlalchemy import text
+    from app.crud import company_async
+    from app.database import open_read_session
+
+    # 클라이언트가 첫 batch 만 받고 끊은 경우처럼 제너레이터를 중간에 닫음 (요청과 같은 이벤트 루프에서)
+    async def read_first_chunk():
+        db = await open_read_session()
+        try:
+            chunks = company_async.export_companies(db, batch_size=1)
+            assert (await chunks.__anext__()).endswith("\n")
+            await chunks.aclose()
+            # 이름 없는 portal 은 이 조회 자체
+            open_cursors = text("SELECT count(*) FROM pg_cursors WHERE name <> ''")
+            return await company_async.run(db, lambda session: session.scalar(open_cursors))
+        finally:
+            await company_async.close(db)
+
+    assert api.portal.call(read_first_chunk) == 0
+
+def test_server_timing_and_metrics(api):
+    resp = api.get("/companies/원티드랩", headers=[("x-wanted-language", "ko")])
+
+    assert resp.status_code == 200
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert "queries" in resp.headers["server-timing"]
+
+    metrics = api.get("/metrics").text
+    assert 'http_request_db_queries_count{method="GET",route="/companies/{company_name}"}' in metrics
+    assert "http_response_serialization_seconds_bucket" in metrics
+
+
+def test_search_by_tags(api):
+    resp = api.get(
+        "/tags/query?all=タグ_22&not=tag_29&any=태그_2&any=태그_7", headers=[("x-wanted-language", "ko")]
+    )
+
+    assert resp.status_code == 200
+    assert [company["company_name"] for company in resp.json()] == [
+        "마이셀럽스",
+        "Rejoice Pregnancy",
+        "삼일제약",
+    ]
+
+    resp = api.get("/tags/query?all=タグ_22&all=tag_4", headers=[("x-wanted-language", "ko")])
+    assert [company["company_name"] for company in resp.json()] == ["Rejoice Pregnancy", "투게더앱스"]
+
+    assert api.get("/tags/query?not=tag_2").status_code == 400
+
+    # 음수 company_id 커서는 400 (태그 인덱스 사용 시 500 이던 경우)
+    negative = base64.urlsafe_b64encode(b"c:-5").decode().rstrip("=")
+    assert api.get(f"/tags/query?all=タグ_22&cursor={negative}").status_code == 400
+    assert api.get(f"/search?query=링크&cursor={negative}").status_code == 400
+
+
+def test_fast_response_mode(api, monkeypatch):
+    from app.utils import responses
+
+    requests = [
+        ("GET", "/search?query=링크&limit=1", None),
+        ("GET", "/tags?tag_name=タグ_22&limit=3", None),
+        ("GET", "/companies/원티드랩", None),
+        ("POST", "/companies/lookup", {"names": ["Wantedlab", "없는회사"]}),
+    ]
+    headers = [("x-wanted-language", "ko")]
+    standard = [api.request(method, url, json=body, headers=headers) for method, url, body in requests]
+    monkeypatch.setattr(responses, "RESPONSE_MODE", "fast")
+    fast = [api.request(method, url, json=body, headers=headers) for method, url, body in requests]
+
+    for expected, resp in zip(standard, fast):
+        assert resp.status_code == expected.status_code == 200
+        assert resp.content == expected.content
+        assert resp.headers["content-type"] == expected.headers["content-type"]
+        assert resp.headers.get("x-next-cursor") == expected.headers.get("x-next-cursor")
+    assert fast[0].headers["x-next-cursor"]
+
+
+def test_conditional_get(api):
+    headers = [("x-wanted-language", "ko")]
+    resp = api.get("/companies/원티드랩", headers=headers)
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"].startswith("public")
+    # 공유 캐시가 X-Session-Token 요청에 토큰 없이 캐시된(쓰기 이전) 응답을 주지 않도록
+    assert resp.headers["vary"] == "x-wanted-language, accept-language, x-session-token"
+
+    resp = api.get("/companies/원티드랩", headers=headers + [("if-none-match", f"W/{etag}, \"other\"")])
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    # 언어가 다르면 다른 표현
+    assert api.get("/companies/원티드랩", headers=[("x-wanted-language", "en")]).headers["etag"] != etag
+
+    tags = api.get("/tags?tag_name=タグ_22&limit=3", headers=headers)
+    assert "x-session-token" in tags.headers["vary"]
+    assert api.get(
+        "/tags?tag_name=タグ_22&limit=3", headers=headers + [("if-none-match", tags.headers["etag"])]
+    ).status_code == 304
+
+    # 이미 있는 태그를 다시 붙이는 것은 변경이 아님
+    api.put("/companies/원티드랩/tags", json=[{"tag_name": {"ko": "태그_4"}}], headers=headers)
+    assert api.get("/companies/원티드랩", headers=headers + [("if-none-match", etag)]).status_code == 304
+
+    api.put("/companies/원티드랩/tags", json=[{"tag_name": {"ko": "태그_77"}}], headers=headers)
+    resp = api.get("/companies/원티드랩", headers=headers + [("if-none-match", etag)])
+    assert resp.status_code == 200
+    assert "태그_77" in resp.json()["tags"]
+    assert api.get(
+        "/tags?tag_name=タグ_22&limit=3", headers=headers + [("if-none-match", tags.headers["etag"])]
+    ).status_code == 200
+
+    api.delete("/companies/원티드랩/tags/태그_77", headers=headers)
+    assert "태그_77" not in api.get("/companies/원티드랩", headers=headers).json()["tags"]
+
+
+def test_language_negotiation(api):
+    # 원티드랩은 ja 이름이 없으므로 다음 선호 언어(en) 이름, 태그는 ja 이름
+    expected = {"company_name": "Wantedlab", "tags": ["タグ_4", "タグ_20", "tag_50"]}
+    resp = api.get("/companies/원티드랩", headers=[("x-wanted-language", "ja, en;q=0.5")])
+    assert resp.json() == expected
+    resp = api.get("/companies/원티드랩", headers=[("accept-language", "ja-JP,ja;q=0.9,en;q=0.8")])
+    assert resp.json() == expected
+
+    resp = api.get("/search?query=wanted", headers=[("x-wanted-language", "ja, en;q=0.5")])
+    assert resp.json() == [{"company_name": "Wantedlab"}]
+
+    resp = api.get("/companies/원티드랩?langs=all", headers=[("x-wanted-language", "ja")])
+    assert resp.json() == {
+        "company_name": {"ko": "원티드랩", "en": "Wantedlab"},
+        "tags": [
+            {"tag_name": {"ko": "태그_4", "en": "tag_4", "ja": "タグ_4", "tw": "tag_4"}},
+            {"tag_name": {"ko": "태그_20", "en": "tag_20", "ja": "タグ_20"}},
+            {"tag_name": {"ko": "태그_50", "jp": "タグ_50", "en": "tag_50"}},
+        ],
+    }
+    assert resp.headers["etag"] != api.get("/companies/원티드랩").headers["etag"]
+
+
+def test_ranked_search(api):
+    headers = [("x-wanted-language", "en")]
+    # 오타가 있어도 유사도로 찾음
+    resp = api.get("/search?query=wantdlab&ranked=true", headers=headers)
+    assert resp.json() == [{"company_name": "Wantedlab"}]
+    assert "x-next-cursor" not in resp.headers
+
+    resp = api.get("/search?query=링크&ranked=true&limit=1", headers=[("x-wanted-language", "ko")])
+    assert len(resp.json()) == 1
+    assert api.get("/search?query=링크&ranked=true&cursor=abc").status_code == 400
+
+
+def test_normalized_search(api):
+    # 한글 초성, 전각 영문, 반각 가타카나 / 히라가나 검색어도 정규화된 검색 키로 찾음
+    resp = api.get("/search?query=ㅇㅌㄷ", headers=[("x-wanted-language", "ko")])
+    assert resp.json() == [{"company_name": "원티드랩"}]
+    resp = api.get("/search?query=ＷＡＮＴＥＤ", headers=[("x-wanted-language", "en")])
+    assert resp.json() == [{"company_name": "Wantedlab"}]
+
+    resp = api.post("/companies", json={"company_name": {"ja": "ウォンテッドラボ", "ko": "원티드재팬"}, "tags": []})
+    assert resp.status_code == 200
+    for query in ("ｳｫﾝﾃｯﾄﾞ", "うぉんてっど", "ㅇㅌㄷㅈ"):
+        resp = api.get(f"/search?query={query}", headers=[("x-wanted-language", "ja")])
+        assert resp.json() == [{"company_name": "ウォンテッドラボ"}], query
+
+
+def test_patch_tags(api):
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    commits = []
+    count_commit = lambda session: commits.append(session)
+    event.listen(Session, "after_commit", count_commit)
+    try:
+        resp = api.patch(
+            "/companies/이상한마케팅/tags",
+            json={
+                "add": [{"tag_name": {"ko": "태그_1", "en": "tag_1"}}, {"tag_name": {"ko": "태그_9", "en": "tag_9"}}],
+                "remove": ["tag_25", "태그_6", "없는태그"],
+            },
+            headers=[("x-wanted-language", "en")],
+        )
+    finally:
+        event.remove(Session, "after_commit", count_commit)
+    assert resp.json() == {"company_name": "이상한마케팅", "tags": ["tag_1", "tag_9", "tag_14"]}
+    # 태그 조회/생성, 관계 추가/삭제가 commit 한 번
+    assert len(commits) == 1
+
+    # 잘못된 태그가 있으면 아무것도 바뀌지 않음
+    resp = api.patch("/companies/이상한마케팅/tags", json={"add": [{"tag_name": {"ko": " "}}], "remove": ["tag_1"]})
+    assert resp.status_code == 400
+    assert api.patch("/companies/없는회사/tags", json={"remove": ["tag_1"]}).status_code == 404
+    resp = api.get("/companies/이상한마케팅", headers=[("x-wanted-language", "en")])
+    assert resp.json()["tags"] == ["tag_9", "tag_14", "tag_1"]
+
+
+def test_read_model_refreshed_only_in_read_model_mode(api, monkeypatch):
+    from sqlalchemy import select
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal
+    from app.models.company import CompanyName, CompanyReadModel
+
+    def read_model_tags():
+        with SessionLocal() as db:
+            company_id = db.scalar(select(CompanyName.company_id).where(CompanyName.name == "원티드랩"))
+            row = db.get(CompanyReadModel, (company_id, "ko"))
+            return row.tags if row else []
+
+    # read model 을 읽지 않는 모드에서는 쓰기가 행을 갱신하지 않음
+    monkeypatch.setattr(crud_sync, "READ_MODE", "orm")
+    assert api.patch("/companies/원티드랩/tags", json={"add": [{"tag_name": {"ko": "태그_903"}}]}).status_code == 200
+    assert "태그_903" not in read_model_tags()
+
+    monkeypatch.setattr(crud_sync, "READ_MODE", "read_model")
+    assert api.patch("/companies/원티드랩/tags", json={"add": [{"tag_name": {"ko": "태그_904"}}]}).status_code == 200
+    assert "태그_904" in read_model_tags()
+    assert api.patch("/companies/원티드랩/tags", json={"remove": ["태그_903", "태그_904"]}).status_code == 200
+    assert "태그_904" not in read_model_tags()
+
+
+def test_change_feed_replay(api):
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal
+
+    # replay 를 직접 호출해서 확인하므로 CHANGE_LISTENER_ENABLED 로 떠 있는 listener 는 멈춤
+    if api.app.state.change_listener is not None:
+        api.app.state.change_listener.stop()
+    with SessionLocal() as db:
+        start = crud_sync.start_change_feed(db)
+    # 다른 replica 라면 아직 갖고 있을 응답 (이 프로세스는 commit 직후 지우므로 쓰기 후 다시 넣어 재현)
+    resp = api.patch("/companies/code post/tags", json={"add": [{"tag_name": {"ko": "태그_30"}}]})
+    assert resp.status_code == 200
+    with SessionLocal() as db:
+        company_id = crud_sync.get_company_id_by_name(db, "code post")
+    crud_sync.company_cache.set(("code post", ("ko",)), {"stale": True}, tags=[("company", company_id)])
+
+    with SessionLocal() as db:
+        assert crud_sync.replay_changes(db) == 1
+    assert crud_sync.change_feed_stats["applied_version"] == start + 1
+    assert api.get("/companies/code post").json()["tags"] == ["태그_4", "태그_30", "태그_20", "태그_16"]
+
+    # 로그 없이 버전만 올라가면 (bulk_load) 버전 공백으로 보고 캐시를 비움
+    crud_sync.company_cache.set(("code post", ("ko",)), {"stale": True}, tags=[("company", company_id)])
+    with SessionLocal() as db:
+        crud_sync.bump_catalog_version(db)
+        db.commit()
+        assert crud_sync.replay_changes(db) == 0
+    assert crud_sync.change_feed_stats["resets"] >= 1
+    assert len(crud_sync.company_cache) == 0
+
+
+def test_replay_raises_write_lsn_floor_before_invalidating(api, monkeypatch):
+    from sqlalchemy import text
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal, replicas
+    from app.utils.replica import ReplicaSet, parse_lsn
+
+    if api.app.state.change_listener is not None:
+        api.app.state.change_listener.stop()
+    with SessionLocal() as db:
+        crud_sync.start_change_feed(db)
+    assert api.patch("/companies/원티드랩/tags", json={"add": [{"tag_name": {"ko": "태그_902"}}]}).status_code == 200
+    with SessionLocal() as db:
+        write_lsn = parse_lsn(db.scalar(text("SELECT pg_current_wal_lsn()::text")))
+
+    # 캐시를 비우는 시점에 이미 replica 결과를 캐시해도 되는 기준이 쓰기 이후여야 함
+    floors = []
+    apply_changes = crud_sync.apply_changes
+    with monkeypatch.context() as m:
+        m.setattr(replicas, "last_write_lsn", 0)
+        m.setattr(ReplicaSet, "enabled", property(lambda self: True))
+        m.setattr(crud_sync, "apply_changes", lambda *args: (floors.append(replicas.last_write_lsn), apply_changes(*args)))
+        with SessionLocal() as db:
+            assert crud_sync.replay_changes(db) == 1
+    assert floors and floors[0] >= write_lsn
+    assert api.patch("/companies/원티드랩/tags", json={"remove": ["태그_902"]}).status_code == 200
+
+
+def test_catalog_etag_follows_in_process_index(api, monkeypatch):
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal
+    from app.utils.tag_index import company_tag_index
+
+    if api.app.state.change_listener is not None:
+        api.app.state.change_listener.stop()
+    # TAG_INDEX_ENABLED 가 아니어도 이 테스트 동안만 태그 인덱스가 /tags/query 를 처리
+    for attr in ("ready", "_postings", "_tag_ids_by_name"):
+        monkeypatch.setattr(company_tag_index, attr, getattr(company_tag_index, attr))
+    with SessionLocal() as db:
+        crud_sync.start_change_feed(db)
+        crud_sync.build_company_tag_index(db)
+    url = "/tags/query?all=태그_901"
+    before = api.get(url)
+    assert before.json() == []
+
+    # 다른 replica 의 쓰기처럼 이 프로세스의 인덱스에는 replay 전까지 반영되지 않음
+    with monkeypatch.context() as m:
+        m.setattr(crud_sync, "apply_changes", lambda *args, **kwargs: None)
+        assert api.patch("/companies/원티드랩/tags", json={"add": [{"tag_name": {"ko": "태그_901"}}]}).status_code == 200
+    stale = api.get(url)
+    assert stale.json() == []
+    assert stale.headers["etag"] != before.headers["etag"]
+
+    with SessionLocal() as db:
+        assert crud_sync.replay_changes(db) == 1
+    fresh = api.get(url, headers=[("if-none-match", stale.headers["etag"])])
+    assert fresh.status_code == 200
+    assert fresh.json() == [{"company_name": "원티드랩"}]
+    assert api.patch("/companies/원티드랩/tags", json={"remove": ["태그_901"]}).status_code == 200
+
+
+def test_read_replica_routing(api, monkeypatch):
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    from app import database
+    from app.crud import company as crud_sync
+    from app.utils.replica import format_lsn, parse_lsn
+
+    # 같은 DB 를 가리키는 replica 대역. replay 위치는 replica_lsn 값으로 흉내냄
+    if database.DB_ASYNC:
+        replica_engine = create_async_engine(database.ASYNC_DATABASE_URL, poolclass=NullPool)
+        factory = async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+        sync_engine = replica_engine.sync_engine
+    else:
+        replica_engine = sync_engine = create_engine(database.DATABASE_URL, poolclass=NullPool)
+        factory = sessionmaker(bind=replica_engine, autoflush=False, autocommit=False)
+    replica_lsn = {"value": 0}
+    monkeypatch.setattr(database, "_replay_lsn", lambda db: replica_lsn["value"])
+
+    async def async_replay_lsn(db):
+        return replica_lsn["value"]
+
+    monkeypatch.setattr(database, "_async_replay_lsn", async_replay_lsn)
+    statements = []
+    count = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(sync_engine, "before_cursor_execute", count)
+    monkeypatch.setattr(database.replicas, "probe_interval", 0)
+    database.replicas.configure([factory])
+    try:
+        # 토큰이 없는 읽기는 replica 에서
+        assert api.get("/search?query=링크").status_code == 200
+        assert statements
+
+        resp = api.post("/companies", json={"company_name": {"ko": "레플리카회사"}, "tags": []})
+        token = resp.headers["x-session-token"]
+        assert parse_lsn(token) == database.replicas.last_write_lsn
+
+        # replica 가 토큰 위치까지 replay 하지 못했으면 primary 에서 읽고, replica 결과는 캐시하지 않음
+        statements.clear()
+        resp = api.get("/companies/레플리카회사", headers=[("x-session-token", token)])
+        assert resp.json() == {"company_name": "레플리카회사", "tags": []}
+        assert not statements
+        crud_sync.company_cache.clear()
+        assert api.get("/companies/레플리카회사").status_code == 200
+        assert statements
+        assert len(crud_sync.company_cache) == 0
+
+        # 따라잡으면 토큰을 보낸 읽기도 replica 에서 (이제 캐시됨)
+        replica_lsn["value"] = parse_lsn(token)
+        statements.clear()
+        resp = api.get("/companies/레플리카회사", headers=[("x-session-token", token)])
+        assert resp.json() == {"company_name": "레플리카회사", "tags": []}
+        assert statements
+        assert len(crud_sync.company_cache) > 0
+
+        # 뒤처진 토큰 / 잘못된 토큰은 토큰 없음과 같음
+        assert api.get("/tags?tag_name=태그_4", headers=[("x-session-token", format_lsn(1))]).status_code == 200
+        assert api.get("/tags?tag_name=태그_4", headers=[("x-session-token", "invalid")]).status_code == 200
+    finally:
+        database.replicas.configure([])
+        event.remove(sync_engine, "before_cursor_execute", count)
+    assert "x-session-token" not in api.patch("/companies/레플리카회사/tags", json={"remove": ["없는태그"]}).headers
+
+
+def test_request_coalescing(api, monkeypatch):
+    import asyncio
+    import functools
+    import httpx
+    from sqlalchemy import text
+
+    from app.crud import company as crud_sync
+    from app.utils.single_flight import coalesced_requests, request_flights
+
+    monkeypatch.setattr(request_flights, "enabled", True)
+    # 동시에 들어온 요청이 겹치도록 조회를 DB 에서 느리게
+    original = crud_sync.get_company_by_name
+    calls = []
+
+    @functools.wraps(original)
+    def slow_get_company_by_name(db, name, lang):
+        calls.append(name)
+        db.execute(text("SELECT pg_sleep(0.5)"))
+        return original(db, name, lang)
+
+    monkeypatch.setattr(crud_sync, "get_company_by_name", slow_get_company_by_name)
+    crud_sync.company_cache.clear()
+    before = coalesced_requests.value(operation="get_company_by_name")
+
+    async def burst():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await asyncio.gather(*(
+                client.get("/companies/원티드랩", headers=[("x-wanted-language", "en")]) for _ in range(10)
+            ))
+
+    # 앱과 같은 이벤트 루프에서 (DB_ASYNC 의 asyncpg 커넥션이 루프에 묶여 있음)
+    responses = api.portal.call(burst)
+    assert {resp.status_code for resp in responses} == {200}
+    assert all(resp.json() == responses[0].json() for resp in responses)
+    assert calls == ["원티드랩"]
+    assert coalesced_requests.value(operation="get_company_by_name") == before + 9
+
+
+def test_health_and_readiness(api):
+    from app.config import STARTUP_WARMUP
+
+    assert api.get("/healthz").json() == {"status": "ok"}
+
+    resp = wait_ready(api)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ready"
+    phases = {"mappers", "pool", "statements"} if STARTUP_WARMUP else {"mappers"}
+    assert phases <= set(body["startup"]["phases"])
+    assert 'startup_phase_seconds{phase="mappers"}' in api.get("/metrics").text
+
+
+def test_readiness_waits_for_background_warm_up(monkeypatch):
+    import asyncio
+    from app import main
+
+    monkeypatch.setattr(main, "STARTUP_WARMUP", True)
+    release = []
+
+    async def slow_warm_pools():
+        # primary 에 연결할 수 없는 상황: 잠시 뒤 실패
+        while not release:
+            await asyncio.sleep(0.01)
+        raise ConnectionRefusedError("primary down")
+
+    monkeypatch.setattr(main, "warm_pools", slow_warm_pools)
+    with TestClient(app) as client:
+        # 기동은 warm-up 을 기다리지 않고, 끝나기 전에는 not_ready
+        assert client.get("/healthz").status_code == 200
+        resp = client.get("/readyz")
+        assert resp.status_code == 503
+        assert resp.json()["status"] == "not_ready"
+        assert client.get("/companies/원티드랩").status_code == 200
+
+        # warm-up 이 실패해도 로그만 남기고 ready (DB 는 /readyz 가 직접 확인)
+        release.append(True)
+        resp = wait_ready(client)
+        assert resp.status_code == 200
+        assert "pool" in resp.json()["startup"]["phases"]
+
+
+def test_warm_up_compiles_lookup_statements(api):
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal, engine
+    from app.utils.language import DEFAULT_LANGUAGES
+
+    # warm-up 뒤의 조회는 새로 컴파일하는 statement 가 없어야 함 (compiled cache 크기가 그대로)
+    engine._compiled_cache.clear()
+    crud_sync.company_cache.clear()
+    with SessionLocal() as db:
+        crud_sync.warm_up(db)
+        compiled = len(engine._compiled_cache)
+        assert compiled > 0
+        crud_sync.company_cache.clear()
+        assert crud_sync.get_company_version(db, "원티드랩")
+        assert crud_sync.get_company_by_name(db, "원티드랩", DEFAULT_LANGUAGES)
+        assert crud_sync.autocomplete_company_name(db, "링크", DEFAULT_LANGUAGES)[0]
+        assert crud_sync.search_companies_by_tag_name(db, "태그_4", DEFAULT_LANGUAGES)[0]
+    assert len(engine._compiled_cache) == compiled
+
+
+def test_cache_fill_skipped_after_concurrent_write(api):
+    from sqlalchemy import event
+    from app.crud import company as crud_sync
+    from app.database import SessionLocal, engine
+
+    crud_sync.company_cache.clear()
+    stale_sets = crud_sync.company_cache.stale_sets
+    writes = []
+
+    def write_after_read(conn, cursor, statement, parameters, context, executemany):
+        # 읽기 쿼리가 끝난 뒤 캐시에 넣기 전에 다른 세션의 쓰기가 commit 되고 캐시를 무효화
+        if not writes:
+            writes.append(statement)
+            with SessionLocal() as writer:
+                company_id = crud_sync.get_company_id_by_name(writer, "이상한마케팅")
+                crud_sync.update_company_tags(writer, company_id, add=[{"ko": "태그_31"}])
+
+    event.listen(engine, "after_cursor_execute", write_after_read)
+    try:
+        with SessionLocal() as db:
+            crud_sync.get_company_by_name(db, "이상한마케팅", ("ko",))
+    finally:
+        event.remove(engine, "after_cursor_execute", write_after_read)
+    assert writes
+    assert crud_sync.company_cache.stale_sets == stale_sets + 1
+    assert "태그_31" in api.get("/companies/이상한마케팅").json()["tags"]
+    api.delete("/companies/이상한마케팅/tags/태그_31")
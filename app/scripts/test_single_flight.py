@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight, coalesced_requests
+
+
+def test_concurrent_calls_share_one_flight():
+    flights = SingleFlight()
+    calls = []
+
+    async def lookup(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+
+    async def main():
+        before = coalesced_requests.value(operation="lookup")
+        results = await asyncio.gather(*(flights.do(("lookup", 1), lambda: lookup(1)) for _ in range(5)))
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert coalesced_requests.value(operation="lookup") == before + 4
+        assert len(flights) == 0
+
+        # 끝난 조회에는 합류하지 않음, 다른 key 는 따로
+        await asyncio.gather(flights.do(("lookup", 1), lambda: lookup(1)), flights.do(("lookup", 2), lambda: lookup(2)))
+        assert calls == [1, 1, 2]
+
+    asyncio.run(main())
+
+
+def test_invalidate_and_errors():
+    flights = SingleFlight()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("db error")
+
+    async def main():
+        first = asyncio.ensure_future(flights.do(("lookup",), lookup))
+        await asyncio.sleep(0)
+        # 쓰기 이후의 요청은 그 전에 시작된 조회에 합류하지 않음
+        flights.invalidate()
+        second = asyncio.ensure_future(flights.do(("lookup",), lookup))
+        third = asyncio.ensure_future(flights.do(("lookup",), lookup))
+        for task in (first, second, third):
+            with pytest.raises(ValueError):
+                await task
+        assert len(calls) == 2
+
+    asyncio.run(main())
+
+
+def test_disabled_runs_every_call():
+    flights = SingleFlight(enabled=False)
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(flights.do(("lookup",), lookup) for _ in range(3)))
+
+    asyncio.run(main())
+    assert len(calls) == 3
@@ -0,0 +1,25 @@
+import pytest
+
+from app.utils.metrics import registry
+from app.utils.startup import StartupProfile
+
+
+def test_phase_records_duration_even_on_error():
+    profile = StartupProfile()
+    with profile.phase("mappers"):
+        pass
+    with pytest.raises(RuntimeError):
+        with profile.phase("pool"):
+            raise RuntimeError("db down")
+    assert list(profile.phases) == ["mappers", "pool"]
+    stats = profile.stats()
+    assert stats["ready"] is False
+    assert stats["total_seconds"] == pytest.approx(sum(stats["phases"].values()), abs=1e-5)
+
+    profile.ready = True
+    profile.reset()
+    assert profile.stats() == {"ready": False, "phases": {}, "total_seconds": 0}
+
+
+def test_startup_phase_gauge_is_registered():
+    assert "# TYPE startup_phase_seconds gauge" in registry.render()
@@ -0,0 +1,72 @@
+from app.utils import tag_index
+from app.utils.tag_index import TagIndex
+
+
+def build_index():
+    index = TagIndex()
+    index.build(
+        [(1, 1), (1, 2), (1, 3), (2, 2), (2, 3), (2, 4), (3, 3), (3, 5)],
+        [(1, "태그_1"), (1, "tag_1"), (2, "태그_2"), (3, "태그_3"), (4, "tag_1")],
+    )
+    return index
+
+
+def test_boolean_queries():
+    index = build_index()
+
+    assert index.query(["태그_1", "태그_2"]) == [2, 3]
+    assert index.query(["tag_1"], none_of=["태그_3"]) == [1, 2]
+    assert index.query(any_of=["태그_1", "태그_3"]) == [1, 2, 3, 5]
+    assert index.query(["태그_2"], any_of=["태그_1", "태그_3"], none_of=["태그_3"]) == [2]
+    assert index.query(["없는태그"]) == []
+    assert index.query(none_of=["태그_1"]) is None
+    assert TagIndex().query(["태그_1"]) is None
+
+
+def test_query_pages_by_company_id():
+    index = build_index()
+
+    assert index.query(any_of=["태그_1", "태그_3"], limit=2) == [1, 2]
+    assert index.query(any_of=["태그_1", "태그_3"], limit=2, after=2) == [3, 5]
+    # 음수 after 는 처음부터
+    assert index.query(any_of=["태그_1", "태그_3"], limit=2, after=-5) == [1, 2]
+
+
+def test_add_and_remove_update_sparse_and_dense_postings(monkeypatch):
+    monkeypatch.setattr(tag_index, "_MIN_DENSE", 2)
+    index = build_index()
+    index.add_names([(5, "태그_5")])
+    index.add([(5, 7), (1, 9), (2, 9)])
+    index.remove([(1, 2), (3, 5)])
+
+    assert index.query(["태그_1"]) == [1, 3, 9]
+    assert index.query(["태그_5"]) == [7]
+    assert index.query(any_of=["태그_3"]) == [3]
+    assert index.query(["태그_1", "태그_2"]) == [3, 9]
+
+
+def test_mixed_postings_match_set_queries(monkeypatch):
+    # 조밀(비트맵) / 희소(array) posting 이 섞여도 집합 연산 결과와 같아야 함
+    monkeypatch.setattr(tag_index, "_MIN_DENSE", 4)
+    random = __import__("random").Random(7)
+    links = {(tag_id, company_id) for company_id in range(1, 400) for tag_id in range(1, 7)
+             if random.random() < 1 / tag_id ** 3}
+    index = TagIndex()
+    index.build(sorted(links), [(tag_id, f"태그_{tag_id}") for tag_id in range(1, 8)])
+    companies = {tag_id: {c for t, c in links if t == tag_id} for tag_id in range(1, 8)}
+
+    for all_of, any_of, none_of in [
+        ([1, 2], [], []), ([1], [], [3]), ([], [4, 5, 6], [1]), ([2, 6], [3, 4], [5]), ([1, 7], [], []),
+    ]:
+        expected = set(range(1, 400))
+        for tag_id in all_of:
+            expected &= companies[tag_id]
+        if any_of:
+            expected &= set().union(*(companies[tag_id] for tag_id in any_of))
+        for tag_id in none_of:
+            expected -= companies[tag_id]
+        names = lambda tag_ids: [f"태그_{tag_id}" for tag_id in tag_ids]
+
+        assert index.query(names(all_of), names(any_of), names(none_of)) == sorted(expected)
+        assert index.query(names(all_of), names(any_of), names(none_of), limit=5, after=100) == \
+            sorted(c for c in expected if c > 100)[:5]
@@ -0,0 +1,41 @@
+from app.utils.ngram_index import NgramIndex
+from app.utils.trigram import RankedQuery, similarity, top_k, trigrams
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('Wanted-Lab') 와 같은 집합
+    assert trigrams("Wanted-Lab") == {"  w", " wa", "wan", "ant", "nte", "ted", "ed ", "  l", " la", "lab", "ab "}
+    assert similarity(trigrams("wantedlab"), trigrams("wantedlab")) == 1.0
+    assert similarity(trigrams("abc"), set()) == 0.0
+
+
+def test_score_prefers_exact_then_prefix():
+    ranked = RankedQuery("wanted")
+    assert ranked.score("Wanted") > ranked.score("Wantedlab") > ranked.score("Linkwanted")
+    assert ranked.score("Wantdlab") is not None  # 오타
+    assert ranked.score("Link") is None
+
+
+def test_score_uses_search_key_folding():
+    # /search 의 search_key 와 같이 전각/반각, 가타카나/히라가나를 같은 글자로 비교
+    assert RankedQuery("ｗａｎｔｅｄ").score("Wanted") == RankedQuery("wanted").score("Wanted")
+    assert trigrams("ｳｫﾝﾃｯﾄﾞ") == trigrams("うぉんてっど")
+    assert RankedQuery("うぉんてっど").score("ウォンテッドラボ") is not None
+
+
+def test_top_k_keeps_best_name_per_company():
+    names = [(1, "원티드랩"), (1, "Wantedlab"), (2, "Wanted"), (3, "링크"), (4, "Wanted Lab Japan")]
+    ranked = top_k(names, "wanted", 2)
+
+    assert [company_id for company_id, _ in ranked] == [2, 1]
+    assert top_k(names, "없는회사", 5) == []
+
+
+def test_ngram_index_candidates():
+    index = NgramIndex()
+    assert index.candidates("want") is None
+    index.build([(1, 1, "ko", "원티드랩"), (2, 1, "en", "Wantedlab"), (3, 2, "en", "Linkedin")])
+
+    assert index.candidates("wantdlab") == [(1, "Wantedlab")]
+    assert top_k(index.candidates("wantdlab"), "wantdlab", 5)[0][0] == 1
+    assert index.display_names([1, 2], ("ko",)) == {1: "원티드랩", 2: "Linkedin"}
@@ -0,0 +1,131 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v) for v in value)
+    return size
+
+
+class LRUCache:
+    """
+    엔트리 수 / 추정 메모리(bytes) / TTL 로 제한되는 LRU 캐시.
+    엔트리마다 태그를 달아두고 invalidate() 로 해당 태그가 달린 엔트리만 정확히 지운다.
+    read-through 로 채울 때는 DB 를 읽기 전에 generation 을 읽어 set(generation=...) 에 넘긴다. 그 사이에 invalidate() /
+    clear() 가 있었으면 저장하지 않는다 (무효화보다 먼저 읽은 이전 값이 무효화 뒤에 다시 저장되지 않도록).
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at, tags)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float, Tuple[Hashable, ...]]]" = OrderedDict()
+        self._keys_by_tag: Dict[Hashable, Set[Hashable]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+        # invalidate() / clear() 때마다 증가
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = (), generation: Optional[int] = None):
+        if self.max_entries <= 0:
+            return
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_sets += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl, tags)
+            self.bytes += size
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[Hashable]) -> int:
+        removed = 0
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._keys_by_tag.get(tag, set()).copy():
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Hashable):
+        _, size, _, tags = self._entries.pop(key)
+        self.bytes -= size
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+            }
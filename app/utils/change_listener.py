@@ -0,0 +1,108 @@
+import logging
+import os
+import select
+import threading
+from typing import Callable, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeListener:
+    """
+    Postgres LISTEN 채널을 전용 커넥션 / 백그라운드 스레드에서 구독하고, 알림이 오면 on_change() 를 호출.
+    (재)연결 직후와 poll_interval 동안 알림이 없을 때도 on_change() 를 호출해서 끊겨 있던 동안이나 유실된 알림의
+    변경을 따라잡는다. 변경 내용은 on_change 가 DB 의 변경 로그에서 읽으므로 알림 페이로드에 의존하지 않는다.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_change: Callable[[], object],
+        poll_interval: float = 30.0,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._stopped = threading.Event()
+        # stop() 이 select 대기를 바로 깨우도록 쓰는 pipe
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: Optional[threading.Thread] = None
+        self.connected = threading.Event()
+        self.backend_pid: Optional[int] = None
+        self.notifications = 0
+        self.connects = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"listen-{self.channel}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self._stopped.is_set():
+            self._stopped.set()
+            os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive() and self._wake_r is not None:
+                os.close(self._wake_r)
+                os.close(self._wake_w)
+                self._wake_r = self._wake_w = None
+
+    def stats(self) -> dict:
+        return {
+            "channel": self.channel,
+            "connected": self.connected.is_set(),
+            "notifications": self.notifications,
+            "connects": self.connects,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    def _run(self):
+        delay = self.retry_interval
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                self.backend_pid = conn.get_backend_pid()
+                self.connects += 1
+                self.connected.set()
+                delay = self.retry_interval
+                # 연결 전에 놓친 변경
+                self.on_change()
+                self._listen(conn)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = repr(e)
+                logger.warning("change listener error, reconnecting in %.1fs: %r", delay, e)
+            finally:
+                self.connected.clear()
+                if conn is not None:
+                    conn.close()
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_retry_interval)
+
+    def _listen(self, conn):
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([conn, self._wake_r], [], [], self.poll_interval)
+            if self._stopped.is_set():
+                return
+            if readable:
+                conn.poll()
+                # 쌓인 알림은 한 번의 replay 로 처리
+                self.notifications += len(conn.notifies)
+                conn.notifies.clear()
+            self.on_change()
@@ -0,0 +1,38 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+from app.config import HTTP_CACHE_CONTROL
+
+# 응답 언어를 고르는 요청 헤더 (app/utils/language.py). 같은 URL 이라도 이 헤더별로 다른 응답이므로 CDN 캐시 키에 포함.
+# X-Session-Token 을 보낸 요청은 그 쓰기가 반영된 곳에서 읽어야 하므로 (read-your-writes) 토큰 없이 캐시된 응답을 받지 않도록 포함
+VARY = "x-wanted-language, accept-language, x-session-token"
+
+
+def make_etag(*parts) -> str:
+    """parts(버전, 언어 등) 로 만든 strong ETag. 헤더 값이 그대로 들어가지 않도록 해시"""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match 는 weak 비교 (W/ 접두어 무시), "*" 는 항상 일치
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def conditional_response(response: Response, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """
+    response 에 ETag / Cache-Control / Vary 를 설정하고, If-None-Match 가 일치하면 본문 없는 304 응답을 반환.
+    일치하지 않으면 None (엔드포인트가 이어서 본문을 만든다).
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = HTTP_CACHE_CONTROL
+    response.headers["Vary"] = VARY
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,121 @@
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils import metrics
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "pool_wait_seconds", "endpoint_done")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.endpoint_done: Optional[float] = None
+
+
+# 요청 하나의 SQL 통계. run_in_threadpool / AsyncSession.run_sync(greenlet) 모두 contextvars 를 넘겨주므로
+# 같은 객체가 보이고, 한 요청 안의 쿼리는 순차 실행이라 lock 없이 누적한다.
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    stats = _current.get()
+    context = exception_context.execution_context
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _mark_endpoint_done(endpoint: Callable) -> Callable:
+    # 엔드포인트가 반환된 시각을 기록해 이후(response_model 검증 + JSON 직렬화) 시간을 분리한다.
+    # functools.wraps 로 __wrapped__ 가 남으므로 FastAPI 는 원래 시그니처로 의존성을 해석한다.
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    return wrapper
+
+
+def _endpoint_done():
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    요청별 SQL 수 / DB 시간 / 커넥션 대기 / 직렬화 시간을 Server-Timing 헤더로 내려주고 라우트별 히스토그램(/metrics)에 기록.
+    StreamingResponse 는 핸들러가 반환된 뒤에 실행되는 쿼리를 포함하지 않는다.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        labels = {"route": self.path, "method": ",".join(sorted(self.methods or ()))}
+
+        async def instrumented_handler(request: Request) -> Response:
+            stats = RequestStats()
+            token = _current.set(stats)
+            started = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                _current.reset(token)
+                finished = time.perf_counter()
+                serialization = finished - stats.endpoint_done if stats.endpoint_done else 0.0
+                metrics.request_seconds.observe(finished - started, **labels)
+                metrics.db_queries.observe(stats.queries, **labels)
+                metrics.db_seconds.observe(stats.db_seconds, **labels)
+                metrics.serialization_seconds.observe(serialization, **labels)
+
+            response.headers["Server-Timing"] = (
+                f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", '
+                f"pool;dur={stats.pool_wait_seconds * 1000:.2f}, "
+                f"serialize;dur={serialization * 1000:.2f}, "
+                f"app;dur={(finished - started) * 1000:.2f}"
+            )
+            return response
+
+        return instrumented_handler
@@ -1,12 +1,65 @@
-from fastapi import Request
-
-def get_preferred_language(request: Request) -> str:
-    accept_language = request.headers.get("accept-language", "ko")
-    for lang in accept_language.split(","):
-        if lang.startswith("ko"):
-            return "ko"
-        elif lang.startswith("en"):
-            return "en"
-        elif lang.startswith("ja"):
-            return "ja"
-    return "ko"
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Union
+
+from fastapi import Header
+
+# 응답 언어 선호 순서. 앞의 언어에 (비어있지 않은) 이름이 없으면 다음 언어, 모두 없으면 id 가 가장 작은 이름
+Languages = Tuple[str, ...]
+
+DEFAULT_LANGUAGES: Languages = ("ko",)
+# 한 요청에서 고려하는 최대 언어 수 (fallback SQL 의 CASE 길이)
+MAX_LANGUAGES = 8
+
+
+def normalize_language(code: str) -> str:
+    # 저장 / 비교하는 언어 코드는 parse_languages 결과와 같은 소문자 형태 ("zh-TW" -> "zh-tw")
+    return code.strip().lower()
+
+
+@lru_cache(maxsize=1024)
+def parse_languages(header: str) -> Languages:
+    """
+    "ja, ko-KR;q=0.9, en;q=0.8, *;q=0.1" -> ("ja", "ko-kr", "ko", "en").
+    q 내림차순 (같으면 입력 순), 지역이 붙은 태그 뒤에는 기본 언어 코드를 이어서 넣고, 중복 / q=0 / "*" 는 제외.
+    클라이언트마다 같은 헤더를 반복해서 보내므로 헤더 문자열별 결과를 크기 제한 memo 에 둔다.
+    """
+    ranges = []
+    for position, item in enumerate(header.split(",")):
+        tag, _, params = item.partition(";")
+        tag = normalize_language(tag)
+        if not tag or tag == "*" or len(tag) > 35:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            ranges.append((-q, position, tag))
+
+    languages = []
+    for _, _, tag in sorted(ranges):
+        languages.append(tag)
+        primary = tag.split("-")[0]
+        if primary != tag:
+            languages.append(primary)
+    return tuple(dict.fromkeys(languages))[:MAX_LANGUAGES]
+
+
+def as_languages(lang: Union[str, Sequence[str]]) -> Languages:
+    # crud 함수는 언어 코드 하나("ko") 또는 preferred_languages 의 선호 순서를 받는다
+    return (normalize_language(lang),) if isinstance(lang, str) else tuple(lang)
+
+
+def preferred_languages(
+    x_wanted_language: Optional[str] = Header(
+        default=None, description="응답 언어 (Accept-Language 와 같은 형식, 예: ja, en;q=0.8). 없으면 Accept-Language"
+    ),
+    accept_language: Optional[str] = Header(default=None),
+) -> Languages:
+    """x-wanted-language, 없으면 Accept-Language 의 선호 순서. 둘 다 없거나 쓸 수 있는 언어가 없으면 ko"""
+    header = x_wanted_language or accept_language
+    return (parse_languages(header) if header else ()) or DEFAULT_LANGUAGES
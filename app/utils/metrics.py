@@ -0,0 +1,134 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# 라벨 값은 라우트 템플릿(/companies/{company_name}) 등 개수가 제한된 값만 사용
+Labels = Tuple[Tuple[str, str], ...]
+
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(key: Labels) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}" if key else ""
+
+
+class Histogram:
+    """Prometheus text format 으로 내보내는 누적 bucket 히스토그램 (라벨 조합별)"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> ([bucket 별 개수 (+Inf 포함)], sum)
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in sorted(self._series.items())]
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(key)} {value:g}" for key, value in values)
+        return lines
+
+
+class Gauge:
+    """render 시점에 collect() 로 현재 값을 읽는 gauge. collect 는 (labels dict, value) 목록을 반환"""
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        self.name = name
+        self.help_text = help_text
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(tuple(sorted(labels.items())))} {value:g}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float]) -> Histogram:
+        histogram = Histogram(name, help_text, buckets)
+        self._metrics.append(histogram)
+        return histogram
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        counter = Counter(name, help_text)
+        self._metrics.append(counter)
+        return counter
+
+    def gauge(self, name: str, help_text: str, collect) -> Gauge:
+        gauge = Gauge(name, help_text, collect)
+        self._metrics.append(gauge)
+        return gauge
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_seconds = registry.histogram(
+    "http_request_duration_seconds", "라우트 핸들러 전체 처리 시간", SECONDS_BUCKETS
+)
+db_queries = registry.histogram(
+    "http_request_db_queries", "요청 하나가 실행한 SQL 문 수", QUERY_BUCKETS
+)
+db_seconds = registry.histogram(
+    "http_request_db_seconds", "요청 하나의 DB 실행 시간 합계", SECONDS_BUCKETS
+)
+serialization_seconds = registry.histogram(
+    "http_response_serialization_seconds", "엔드포인트 반환 후 응답 검증/직렬화 (+ 요청 세션 정리) 시간", SECONDS_BUCKETS
+)
@@ -0,0 +1,162 @@
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from app.utils.language import Languages, as_languages
+from app.utils.search_key import fold, is_chosung_query
+from app.utils.trigram import min_shared_bigrams
+
+# LIKE 패턴 문자(%, _, \)가 들어간 검색어는 인덱스로 같은 결과를 보장할 수 없으므로 DB 로 넘김
+_LIKE_SPECIAL = ("%", "_", "\\")
+# 한 글자 이름/검색어도 bigram 을 갖도록 앞뒤에 붙이는 경계 문자
+_BEGIN = "\x02"
+_END = "\x03"
+
+
+def bigrams(text: str) -> List[str]:
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+class NgramIndex:
+    """
+    company_names 의 부분 문자열(search_key LIKE '%query%') 검색용 bigram 역색인. 이름은 DB 의 search_key 와 같이 정규화.
+    posting 은 company_names.id 의 array 로 보관하고, 후보는 실제 부분 문자열 비교로 한번 더 확인한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, array] = {}
+        self._char_grams: Dict[str, Set[str]] = {}
+        # company_names.id -> (company_id, language, name, folded name)
+        self._rows: Dict[int, Tuple[int, str, str, str]] = {}
+        # company_id -> company_names.id 목록 (id 순)
+        self._company_names: Dict[int, List[int]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def build(self, rows: Iterable[Tuple[int, int, str, str]]):
+        postings: Dict[str, array] = {}
+        char_grams: Dict[str, Set[str]] = {}
+        name_rows: Dict[int, Tuple[int, str, str, str]] = {}
+        company_names: Dict[int, List[int]] = {}
+        for name_id, company_id, language, name in rows:
+            self._insert(postings, char_grams, name_rows, company_names, name_id, company_id, language, name)
+
+        with self._lock:
+            self._postings = postings
+            self._char_grams = char_grams
+            self._rows = name_rows
+            self._company_names = company_names
+            self.ready = True
+
+    def add(self, rows: Iterable[Tuple[int, int, str, str]]):
+        with self._lock:
+            for name_id, company_id, language, name in rows:
+                self._insert(
+                    self._postings, self._char_grams, self._rows, self._company_names,
+                    name_id, company_id, language, name,
+                )
+
+    @staticmethod
+    def _insert(postings, char_grams, name_rows, company_names, name_id, company_id, language, name):
+        if name_id in name_rows:
+            return
+        folded = fold(name)
+        name_rows[name_id] = (company_id, language, name, folded)
+
+        ids = company_names.setdefault(company_id, [])
+        ids.append(name_id)
+        if len(ids) > 1 and ids[-2] > name_id:
+            ids.sort()
+
+        for gram in set(bigrams(_BEGIN + folded + _END)):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("l")
+                for ch in gram:
+                    char_grams.setdefault(ch, set()).add(gram)
+            posting.append(name_id)
+
+    def search(
+        self, query: str, lang: Union[str, Sequence[str]], limit: Optional[int] = None, after: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, str]]]:
+        """
+        DB 의 /search (search_key LIKE '%query%') 와 같은 회사 집합을 company_id 순 (company_id, 표시 이름) 으로 반환
+        (언어 fallback 포함). after 보다 큰 company_id 부터 최대 limit 개. 인덱스로 답할 수 없는 경우 None (초성 검색어 포함).
+        """
+        q = fold(query)
+        if not self.ready or is_chosung_query(query) or any(ch in q for ch in _LIKE_SPECIAL):
+            return None
+
+        with self._lock:
+            if len(q) == 1:
+                # 해당 글자를 포함하는 bigram 의 posting 은 검증 없이 모두 매칭
+                name_ids: Set[int] = set()
+                for gram in self._char_grams.get(q, ()):
+                    name_ids.update(self._postings[gram])
+            else:
+                postings = []
+                for gram in set(bigrams(q)):
+                    posting = self._postings.get(gram)
+                    if posting is None:
+                        return []
+                    postings.append(posting)
+                smallest = min(postings, key=len)
+                name_ids = {i for i in smallest if q in self._rows[i][3]}
+
+            company_ids = {self._rows[i][0] for i in name_ids}
+            if after is not None:
+                company_ids = {i for i in company_ids if i > after}
+            company_ids = sorted(company_ids)
+            if limit is not None:
+                company_ids = company_ids[:limit]
+            langs = as_languages(lang)
+            return [(company_id, self._display_name(company_id, langs)) for company_id in company_ids]
+
+    def candidates(self, query: str) -> Optional[List[Tuple[int, str]]]:
+        """
+        오타 허용 순위 검색의 후보 (company_id, name). 검색어 bigram 의 절반 이상을 가진 이름
+        (trigram.RankedQuery 와 같은 조건, 한 글자 검색어는 그 글자를 포함하는 이름). 인덱스가 준비되지 않았으면 None.
+        """
+        if not self.ready:
+            return None
+        q = fold(query)
+        with self._lock:
+            if len(q) == 1:
+                name_ids: Set[int] = set()
+                for gram in self._char_grams.get(q, ()):
+                    name_ids.update(self._postings[gram])
+            else:
+                grams = set(bigrams(q))
+                shared: Counter = Counter()
+                for gram in grams:
+                    shared.update(self._postings.get(gram, ()))
+                needed = min_shared_bigrams(len(grams))
+                name_ids = {name_id for name_id, count in shared.items() if count >= needed}
+            return [(self._rows[i][0], self._rows[i][2]) for i in name_ids]
+
+    def display_names(self, company_ids: Iterable[int], lang: Union[str, Sequence[str]]) -> Dict[int, str]:
+        langs = as_languages(lang)
+        with self._lock:
+            return {
+                company_id: self._display_name(company_id, langs)
+                for company_id in company_ids if company_id in self._company_names
+            }
+
+    def _display_name(self, company_id: int, langs: Languages) -> str:
+        name_ids = self._company_names[company_id]
+        names = {}
+        for name_id in name_ids:
+            _, language, name, _ = self._rows[name_id]
+            if name:
+                names.setdefault(language, name)
+        for lang in langs:
+            if lang in names:
+                return names[lang]
+        return self._rows[name_ids[0]][2]
+
+
+company_name_index = NgramIndex()
@@ -0,0 +1,29 @@
+import base64
+from typing import Optional
+
+from fastapi import HTTPException
+
+# keyset 페이지네이션 커서: 직전 페이지 마지막 company_id 를 감싼 불투명 문자열
+_PREFIX = "c:"
+
+
+def encode_cursor(company_id: Optional[int]) -> Optional[str]:
+    if company_id is None:
+        return None
+    return base64.urlsafe_b64encode(f"{_PREFIX}{company_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if not raw.startswith(_PREFIX):
+            raise ValueError(raw)
+        company_id = int(raw[len(_PREFIX):])
+        # company_id 는 1 부터 (음수는 태그 인덱스의 비트 이동 등에서 오류)
+        if company_id < 0:
+            raise ValueError(raw)
+        return company_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,85 @@
+import time
+import weakref
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.utils import metrics
+from app.utils.instrumentation import current_stats
+
+# 풀 이름(create_engine(pool_logging_name=...), "sync" / "async") -> 현재 풀.
+# engine.dispose() 가 만든 새 풀이 같은 이름으로 덮어쓰고, 버려진 엔진의 풀은 자동으로 빠짐
+_pools: "weakref.WeakValueDictionary[str, Pool]" = weakref.WeakValueDictionary()
+
+
+def _pool_name(pool: Pool) -> str:
+    return pool.logging_name or "default"
+
+
+class _CheckoutTiming:
+    """
+    커넥션 checkout 대기 시간(풀이 비어 기다린 시간 + 새 커넥션 연결 시간)과 timeout 횟수를 기록.
+    요청 처리 중이면 Server-Timing 의 pool 항목에도 더한다.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            checkout_timeouts.inc(pool=_pool_name(self))
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            checkout_wait_seconds.observe(waited, pool=_pool_name(self))
+            stats = current_stats()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+
+
+class InstrumentedQueuePool(_CheckoutTiming, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _pools[_pool_name(self)] = self
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _pools[_pool_name(self)] = self
+
+
+def pool_stats(pool: Pool) -> Dict[str, float]:
+    if not isinstance(pool, QueuePool):
+        return {}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": checked_out / capacity if capacity else 0.0,
+        "timeouts": checkout_timeouts.value(pool=_pool_name(pool)),
+    }
+
+
+def all_pool_stats() -> Dict[str, Dict[str, float]]:
+    return {name: pool_stats(pool) for name, pool in list(_pools.items())}
+
+
+def _collect(field: str):
+    return lambda: [({"pool": name}, pool_stats(pool)[field]) for name, pool in list(_pools.items())]
+
+
+checkout_wait_seconds = metrics.registry.histogram(
+    "db_pool_checkout_wait_seconds", "커넥션 checkout 대기 시간 (새 연결 포함)", metrics.WAIT_BUCKETS
+)
+checkout_timeouts = metrics.registry.counter(
+    "db_pool_checkout_timeouts_total", "pool_timeout 안에 커넥션을 얻지 못한 횟수"
+)
+metrics.registry.gauge("db_pool_checked_out", "사용 중인 커넥션 수", _collect("checked_out"))
+metrics.registry.gauge("db_pool_overflow", "pool_size 를 넘겨 연 커넥션 수", _collect("overflow"))
+metrics.registry.gauge("db_pool_saturation", "사용 중 / (pool_size + max_overflow)", _collect("saturation"))
@@ -0,0 +1,101 @@
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+from app.utils import metrics
+
+# 읽기 replica 선택과 read-your-writes 판단.
+# 쓰기 요청은 commit 후 primary 의 WAL 위치(LSN)를 X-Session-Token 으로 내려주고, 그 토큰을 보낸 읽기 요청은
+# 토큰 LSN 까지 replay 한 replica 에서만 읽는다 (아니면 primary).
+
+# standby 가 아닌 서버의 observed 값 (어떤 LSN 보다 큼)
+CAUGHT_UP = 1 << 64
+# 아직 확인하지 못했거나 연결이 끊긴 replica 의 observed 값 (다음 확인 전까지 사용하지 않음)
+UNKNOWN = -1
+
+
+def parse_lsn(text: Optional[str]) -> Optional[int]:
+    """'16/B374D848' -> int. 형식이 틀리면 None (토큰 없음으로 취급)"""
+    if not text:
+        return None
+    high, sep, low = text.strip().partition("/")
+    try:
+        return (int(high, 16) << 32) + int(low, 16) if sep else None
+    except ValueError:
+        return None
+
+
+def format_lsn(lsn: int) -> str:
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+class ReplicaSet:
+    """
+    replica 세션 팩토리를 round-robin 으로 고르고, replica 마다 마지막으로 확인한 replay LSN (단조 증가라 하한으로 사용) 을
+    기억한다. 필요한 LSN 보다 뒤처진 것으로 보일 때만 probe_interval 간격으로 다시 확인 (확인 쿼리는 호출하는 쪽이 실행).
+    확인 전이거나 연결이 끊긴 replica 는 다시 확인될 때까지 primary 로 보낸다.
+    last_write_lsn 은 이 프로세스가 캐시를 무효화한 쓰기(자신의 commit, 다른 replica 변경 replay)의 최대 LSN.
+    """
+
+    def __init__(self, probe_interval: float = 0.1):
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self.configure([])
+
+    def configure(self, session_factories: Sequence[Callable]):
+        with self._lock:
+            self.session_factories = list(session_factories)
+            self._next = itertools.count()
+            self.observed: Dict[int, int] = {index: UNKNOWN for index in range(len(self.session_factories))}
+            self._probed_at: Dict[int, float] = {}
+            self.last_write_lsn = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.session_factories)
+
+    def pick(self) -> int:
+        return next(self._next) % len(self.session_factories)
+
+    def session(self, index: int):
+        return self.session_factories[index]()
+
+    def needs_probe(self, index: int, needed: int) -> bool:
+        if self.observed[index] >= needed:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._probed_at.get(index, float("-inf")) < self.probe_interval:
+                return False
+            self._probed_at[index] = now
+            return True
+
+    def observe(self, index: int, lsn: Optional[int]):
+        # standby 가 아닌 서버(pg_last_wal_replay_lsn() 이 NULL)는 primary 와 같으므로 항상 최신
+        with self._lock:
+            self.observed[index] = max(self.observed[index], lsn if lsn is not None else CAUGHT_UP)
+
+    def mark_down(self, index: int):
+        with self._lock:
+            self.observed[index] = UNKNOWN
+
+    def note_write(self, lsn: int):
+        with self._lock:
+            self.last_write_lsn = max(self.last_write_lsn, lsn)
+
+    def route(self, index: int, token_lsn: Optional[int]) -> bool:
+        """replica index 로 읽어도 되는지 (연결이 확인되었고 토큰 LSN 까지 replay 했는지). 결과를 라우팅 metric 에 기록"""
+        if self.observed[index] == UNKNOWN:
+            read_routes.inc(target="primary", reason="unavailable")
+            return False
+        if token_lsn is not None and self.observed[index] < token_lsn:
+            read_routes.inc(target="primary", reason="lagging")
+            return False
+        read_routes.inc(target="replica", reason="token" if token_lsn is not None else "default")
+        return True
+
+
+read_routes = metrics.registry.counter(
+    "db_read_routes_total", "읽기 요청 세션이 연결된 곳 (replica / 토큰 LSN 을 따라오지 못했거나 연결할 수 없어 primary)"
+)
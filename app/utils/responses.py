@@ -0,0 +1,32 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.config import RESPONSE_MODE
+
+
+class FastJSONResponse(Response):
+    """
+    pydantic-core(Rust) 로 바로 인코딩하는 JSON 응답. BaseModel(model_construct 포함) / dict / list 를 그대로 받는다.
+    출력은 starlette JSONResponse 와 같은 compact UTF-8 JSON.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def respond(content: Any, response: Optional[Response] = None):
+    """
+    RESPONSE_MODE=fast 면 content 를 FastJSONResponse 로 감싸 반환 (FastAPI 의 response_model 검증/인코딩을 건너뜀).
+    content 는 이미 response_model 모양이어야 한다. Response 를 직접 반환하면 FastAPI 가 주입한 response 의 헤더를
+    합쳐주지 않으므로 여기서 옮긴다. standard 모드면 content 를 그대로 반환.
+    """
+    if RESPONSE_MODE != "fast":
+        return content
+    fast = FastJSONResponse(content)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
@@ -0,0 +1,57 @@
+import unicodedata
+from typing import Dict, Tuple
+
+# company_names 의 검색 키 (쓰기 시점에 계산해 저장, /search 는 LIKE 로 이 컬럼을 비교).
+#   search_key     : NFKC (전각/반각 통일) -> 소문자 -> 가타카나를 히라가나로
+#   search_chosung : search_key 의 한글 음절을 초성으로 ("원티드랩" -> "ㅇㅌㄷㄹ"), 나머지 글자는 그대로
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+# 한 초성에 딸린 음절 수 (중성 21 x 종성 28)
+_SYLLABLES_PER_CHOSUNG = 588
+# 조합형 초성 자모 (U+1100..U+1112). 호환 자모 "ㄱ" 은 NFKC 에서 이 글자로 바뀌며 CHOSUNG 과 순서가 같다
+_CHOSEONG_FIRST = 0x1100
+_CHOSEONG_LAST = 0x1112
+
+# 가타카나 (ァ..ヶ, ヽヾ) -> 히라가나. 반각 가타카나는 NFKC 에서 전각이 된다
+_KANA_FOLD = {code: code - 0x60 for code in (*range(0x30A1, 0x30F7), 0x30FD, 0x30FE)}
+
+
+def fold(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower().translate(_KANA_FOLD)
+
+
+def _initial(ch: str) -> str:
+    code = ord(ch)
+    if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+        return CHOSUNG[(code - _HANGUL_FIRST) // _SYLLABLES_PER_CHOSUNG]
+    if _CHOSEONG_FIRST <= code <= _CHOSEONG_LAST:
+        return CHOSUNG[code - _CHOSEONG_FIRST]
+    return ch
+
+
+def chosung(text: str) -> str:
+    return "".join(_initial(ch) for ch in fold(text))
+
+
+def search_columns(name: str) -> Dict[str, str]:
+    """CompanyName / TagName 행에 같이 넣는 검색 키 컬럼 값"""
+    return {"search_key": fold(name), "search_chosung": chosung(name)}
+
+
+def is_chosung_query(query: str) -> bool:
+    # 공백을 뺀 모든 글자가 한글 초성 자음인 검색어 ("ㅇㅌㄷ")
+    letters = [ch for ch in query if not ch.isspace()]
+    return bool(letters) and all(
+        ch in _CHOSUNG_SET or _CHOSEONG_FIRST <= ord(ch) <= _CHOSEONG_LAST for ch in letters
+    )
+
+
+def query_key(query: str) -> Tuple[str, str]:
+    """검색어를 비교할 컬럼 이름과 그 컬럼 형식으로 바꾼 검색어: ("search_chosung", "ㅇㅌㄷ") | ("search_key", ...)"""
+    if is_chosung_query(query):
+        return "search_chosung", chosung(query)
+    return "search_key", fold(query)
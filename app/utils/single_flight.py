@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.config import REQUEST_COALESCING
+from app.utils import metrics
+
+
+class SingleFlight:
+    """
+    같은 key 의 조회가 진행 중이면 새로 실행하지 않고 그 결과(또는 예외)를 같이 받는다 (이벤트 루프 안에서만 사용).
+    key 의 첫 원소는 조회 이름으로 metric label 에 쓴다.
+    invalidate() 이후에 들어온 요청은 그 전에 시작된 조회에 합류하지 않으므로 commit 된 쓰기 이후의 요청이
+    쓰기 전에 시작된 결과를 받지 않는다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.generation = 0
+        self._flights: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def invalidate(self):
+        # after_commit / replay 에서 호출 (threadpool 스레드일 수 있음). 값이 바뀌기만 하면 되므로 lock 없이 증가
+        self.generation += 1
+
+    async def do(self, key: Tuple[Hashable, ...], fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await fn()
+        flight_key = (self.generation, key)
+        future = self._flights.get(flight_key)
+        if future is not None:
+            coalesced_requests.inc(operation=key[0])
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 먼저 시작한 요청이 취소되면 직접 조회
+                return await fn()
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[flight_key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 남지 않도록
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._flights.get(flight_key) is future:
+                del self._flights[flight_key]
+
+
+coalesced_requests = metrics.registry.counter(
+    "coalesced_requests_total", "진행 중인 같은 조회의 결과를 같이 받아 DB 조회를 생략한 요청 수"
+)
+
+# 조회 라우트에서 공유 (crud/company_async.py)
+request_flights = SingleFlight(REQUEST_COALESCING)
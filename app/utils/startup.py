@@ -0,0 +1,44 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """lifespan startup 단계별 소요 시간과 준비 상태 (/readyz, startup_phase_seconds, 로그)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.phases: Dict[str, float] = {}
+        self.ready = False
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+            logger.info("startup %s: %.3fs", name, self.phases[name])
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "total_seconds": round(sum(self.phases.values()), 6),
+        }
+
+
+startup_profile = StartupProfile()
+
+metrics.registry.gauge(
+    "startup_phase_seconds",
+    "마지막 startup 의 단계별 소요 시간",
+    lambda: [({"phase": name}, seconds) for name, seconds in startup_profile.phases.items()],
+)
@@ -0,0 +1,190 @@
+import bisect
+import heapq
+import re
+import threading
+from array import array
+from functools import reduce
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# posting 이 전체 회사 수의 1/32 를 넘으면 정렬된 array 대신 bytearray 비트맵으로 보관 (bit i = company_id i)
+_DENSE_RATIO = 32
+_MIN_DENSE = 1024
+
+Posting = Union[array, bytearray]
+_EMPTY = array("l")
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def _to_bitmap(posting: array) -> bytearray:
+    bits = bytearray((posting[-1] >> 3) + 1 if posting else 0)
+    for company_id in posting:
+        bits[company_id >> 3] |= 1 << (company_id & 7)
+    return bits
+
+
+def _size(posting: Posting) -> int:
+    # 비트맵은 상한 (조건을 고를 때 희소한 posting 이 먼저)
+    return len(posting) * 8 if isinstance(posting, bytearray) else len(posting)
+
+
+def _contains(posting: Posting, company_id: int) -> bool:
+    if isinstance(posting, bytearray):
+        i = company_id >> 3
+        return i < len(posting) and bool(posting[i] >> (company_id & 7) & 1)
+    i = bisect.bisect_left(posting, company_id)
+    return i < len(posting) and posting[i] == company_id
+
+
+def _iter_from(posting: Posting, start: int) -> Iterator[int]:
+    """start 이상의 company_id 를 오름차순으로"""
+    if isinstance(posting, bytearray):
+        # 0 인 byte 는 정규식(C)으로 건너뜀
+        for match in _NONZERO.finditer(posting, start >> 3):
+            base = match.start() << 3
+            byte = posting[match.start()]
+            for bit in range(8):
+                if byte >> bit & 1 and base + bit >= start:
+                    yield base + bit
+        return
+    for i in range(bisect.bisect_left(posting, start), len(posting)):
+        yield posting[i]
+
+
+def _unique(company_ids: Iterator[int]) -> Iterator[int]:
+    last = None
+    for company_id in company_ids:
+        if company_id != last:
+            yield company_id
+            last = company_id
+
+
+class TagIndex:
+    """
+    tag_id -> company_id 집합 역색인. 희소한 태그는 정렬된 array("l"), 조밀한 태그는 bytearray 비트맵으로 보관한다.
+    질의는 가장 희소한 all_of posting (없으면 any_of posting 들의 병합)을 after 다음부터 훑으며 나머지 조건을
+    bisect / 비트 확인으로 거르고 limit 개에서 멈춘다. all_of 가 모두 조밀하면 int 비트 AND 로 먼저 줄인다.
+    태그명 -> tag_id 는 /tags 와 같이 같은 이름을 가진 태그 중 가장 작은 tag_id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[int, Posting] = {}
+        self._tag_ids_by_name: Dict[str, int] = {}
+        self._dense_threshold = _MIN_DENSE
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def build(self, links: Iterable[Tuple[int, int]], names: Iterable[Tuple[int, str]]):
+        """links: (tag_id, company_id) 를 tag_id, company_id 순으로. names: (tag_id, name)"""
+        postings: Dict[int, Posting] = {}
+        max_company_id = 0
+        for tag_id, company_id in links:
+            posting = postings.get(tag_id)
+            if posting is None:
+                posting = postings[tag_id] = array("l")
+            posting.append(company_id)
+            max_company_id = max(max_company_id, company_id)
+
+        dense_threshold = max(_MIN_DENSE, max_company_id // _DENSE_RATIO)
+        for tag_id, posting in postings.items():
+            if len(posting) > dense_threshold:
+                postings[tag_id] = _to_bitmap(posting)
+
+        tag_ids_by_name: Dict[str, int] = {}
+        for tag_id, name in names:
+            if tag_id < tag_ids_by_name.get(name, tag_id + 1):
+                tag_ids_by_name[name] = tag_id
+
+        with self._lock:
+            self._postings = postings
+            self._tag_ids_by_name = tag_ids_by_name
+            self._dense_threshold = dense_threshold
+            self.ready = True
+
+    def add_names(self, names: Iterable[Tuple[int, str]]):
+        with self._lock:
+            for tag_id, name in names:
+                if tag_id < self._tag_ids_by_name.get(name, tag_id + 1):
+                    self._tag_ids_by_name[name] = tag_id
+
+    def add(self, links: Iterable[Tuple[int, int]]):
+        with self._lock:
+            for tag_id, company_id in links:
+                posting = self._postings.get(tag_id)
+                if isinstance(posting, bytearray):
+                    i = company_id >> 3
+                    if i >= len(posting):
+                        posting.extend(bytes(i + 1 - len(posting)))
+                    posting[i] |= 1 << (company_id & 7)
+                    continue
+                if posting is None:
+                    posting = self._postings[tag_id] = array("l")
+                i = bisect.bisect_left(posting, company_id)
+                if i < len(posting) and posting[i] == company_id:
+                    continue
+                posting.insert(i, company_id)
+                if len(posting) > self._dense_threshold:
+                    self._postings[tag_id] = _to_bitmap(posting)
+
+    def remove(self, links: Iterable[Tuple[int, int]]):
+        with self._lock:
+            for tag_id, company_id in links:
+                posting = self._postings.get(tag_id)
+                if isinstance(posting, bytearray):
+                    i = company_id >> 3
+                    if i < len(posting):
+                        posting[i] &= ~(1 << (company_id & 7)) & 0xFF
+                elif posting is not None:
+                    i = bisect.bisect_left(posting, company_id)
+                    if i < len(posting) and posting[i] == company_id:
+                        del posting[i]
+
+    def query(
+        self, all_of: List[str] = (), any_of: List[str] = (), none_of: List[str] = (),
+        limit: Optional[int] = None, after: Optional[int] = None,
+    ) -> Optional[List[int]]:
+        """
+        all_of 를 모두 갖고, any_of 중 하나 이상을 갖고(비어있으면 조건 없음), none_of 는 하나도 없는 company_id 를
+        오름차순으로 after 다음부터 최대 limit 개. all_of / any_of 가 모두 비어 있으면 인덱스를 쓰지 않고 None.
+        """
+        if not self.ready or not (all_of or any_of):
+            return None
+        start = after + 1 if after is not None and after >= 0 else 0
+
+        with self._lock:
+            required = sorted((self._posting_for(name) for name in all_of), key=_size)
+            optional = [self._posting_for(name) for name in any_of]
+            excluded = [self._posting_for(name) for name in none_of]
+            if required and len(required) > 1 and all(isinstance(p, bytearray) for p in required):
+                # 조밀한 posting 끼리는 int 비트 AND (C) 로 먼저 계산
+                bits = reduce(lambda a, b: a & b, (int.from_bytes(p, "little") for p in required))
+                required = [bytearray(bits.to_bytes((bits.bit_length() + 7) // 8, "little"))]
+            if required:
+                candidates = _iter_from(required[0], start)
+                required = required[1:]
+            else:
+                candidates = _unique(heapq.merge(*(_iter_from(p, start) for p in optional)))
+                optional = []
+
+            company_ids = []
+            for company_id in candidates:
+                if limit is not None and len(company_ids) >= limit:
+                    break
+                if (
+                    all(_contains(p, company_id) for p in required)
+                    and (not optional or any(_contains(p, company_id) for p in optional))
+                    and not any(_contains(p, company_id) for p in excluded)
+                ):
+                    company_ids.append(company_id)
+            return company_ids
+
+    def _posting_for(self, name: str) -> Posting:
+        tag_id = self._tag_ids_by_name.get(name)
+        if tag_id is None:
+            return _EMPTY
+        return self._postings.get(tag_id, _EMPTY)
+
+
+company_tag_index = TagIndex()
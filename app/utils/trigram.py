@@ -0,0 +1,85 @@
+import heapq
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.utils.search_key import fold
+
+# pg_trgm 과 같은 방식의 trigram 유사도 (pg_trgm 이 없는 DB 에서 /search?ranked=true 의 fallback).
+# 검색 키와 같이 fold(NFKC, 소문자, 가타카나 -> 히라가나)한 뒤 단어(영숫자 연속) 단위로 앞에 공백 2개, 뒤에 1개를 붙여
+# 3글자씩 자른 집합의 Jaccard 유사도 (SQL 경로는 company_names.search_key 에 pg_trgm 을 적용하므로 같은 값)
+_WORD = re.compile(r"[^\W_]+")
+
+# pg_trgm.similarity_threshold 기본값. 이보다 낮으면 부분 문자열 일치일 때만 후보
+SIMILARITY_THRESHOLD = 0.3
+
+# 점수 = similarity + 보너스. SQL 경로(company_lean.ranked_company_names)와 같은 값
+EXACT_BONUS = 1.0
+PREFIX_BONUS = 0.5
+CONTAINS_BONUS = 0.25
+
+
+def trigrams(text: str) -> Set[str]:
+    return _trigrams(fold(text))
+
+
+def _trigrams(folded: str) -> Set[str]:
+    grams = set()
+    for word in _WORD.findall(folded):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def min_shared_bigrams(query_bigram_count: int) -> int:
+    # 후보가 가져야 하는 검색어 bigram 수 (절반 이상). 오타 한두 글자는 통과시키면서 trigram 계산 대상을 크게 줄인다
+    return (query_bigram_count + 1) // 2
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+class RankedQuery:
+    """검색어 하나에 대한 이름 점수 계산기 (검색어 trigram 은 한 번만 계산)"""
+
+    def __init__(self, query: str):
+        self.folded = fold(query)
+        self.grams = _trigrams(self.folded)
+        self.bigrams = {self.folded[i:i + 2] for i in range(len(self.folded) - 1)}
+        self.min_shared = min_shared_bigrams(len(self.bigrams))
+
+    def score(self, name: str):
+        """
+        후보가 아니면 None. 후보: 검색어 bigram 을 절반 이상 포함하고, 유사도 >= SIMILARITY_THRESHOLD 이거나 검색어를 포함.
+        bigram 조건은 trigram 계산 전에 거르는 근사 조건이라 pg_trgm 경로보다 후보가 약간 적을 수 있다.
+        """
+        folded = fold(name)
+        if sum(gram in folded for gram in self.bigrams) < self.min_shared:
+            return None
+        sim = similarity(_trigrams(folded), self.grams)
+        contains = self.folded in folded
+        if sim < SIMILARITY_THRESHOLD and not contains:
+            return None
+        return (
+            sim
+            + (EXACT_BONUS if folded == self.folded else 0.0)
+            + (PREFIX_BONUS if folded.startswith(self.folded) else 0.0)
+            + (CONTAINS_BONUS if contains else 0.0)
+        )
+
+
+def top_k(names: Iterable[Tuple[int, str]], query: str, k: int) -> List[Tuple[int, float]]:
+    """
+    (company_id, name) 후보 중 회사별 최고 점수 상위 k 개를 (company_id, score) 로. 점수 내림차순, 같으면 company_id 순.
+    전체를 정렬하지 않고 heapq.nlargest (크기 k 힙) 로 고른다.
+    """
+    ranked = RankedQuery(query)
+    best: Dict[int, float] = {}
+    for company_id, name in names:
+        score = ranked.score(name)
+        if score is not None and score > best.get(company_id, -1.0):
+            best[company_id] = score
+    return heapq.nlargest(k, best.items(), key=lambda item: (item[1], -item[0]))